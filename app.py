@@ -1,19 +1,47 @@
 # app.py
 
 # --- Standard Library Imports ---
+import csv
+import io
 import json
 import logging
+import math
 import os
 import sys
+import threading
+from concurrent.futures import as_completed
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timezone
 
 # --- Third-party Library Imports ---
-from flask import Flask, jsonify, render_template, request
+import numpy as np
+from flask import Flask, Response, jsonify, render_template, request, stream_with_context
 from werkzeug.exceptions import BadRequest
 
 # --- Application-specific Imports ---
-from src.maze_generator import Maze
-from src.maze_solver import MazeSolver
+from src import fast_json
+from src.compression import CONTENT_ENCODINGS, compress
+from src.maze_batch import create_executor, generate_maze_line
+from src.leaderboard_log import LeaderboardLog
+from src.leaderboard_store import LEADERBOARD_BACKENDS, SqliteLeaderboard, iter_scores
+from src.lru_cache import LRUCache
+from src.maze_format import MAZE_FORMATS, from_envelope, grid_from_rows, pack_grid, to_envelope
+from src.maze_generator import (
+    DEFAULT_ALGORITHM,
+    GENERATION_ALGORITHMS,
+    Maze,
+    generate_eller_rows,
+)
+from src.maze_pool import MazePool
+from src.maze_registry import MazeRegistry, content_id
+from src.maze_store import MazeStore
+from src.maze_solver import (
+    DEFAULT_STRATEGY,
+    SOLVER_STRATEGIES,
+    UNREACHABLE,
+    MazeSolver,
+    follow_distance_field,
+)
 
 # ==============================================================================
 # Application Setup & Configuration
@@ -32,6 +60,76 @@ data_dir = os.path.join(app.root_path, "data")
 app.config["LEADERBOARD_FILE"] = os.path.join(data_dir, "leaderboard.json")
 # Config for how many leaderboard entries to show per category in the frontend.
 app.config["MAX_LEADERBOARD_ENTRIES_DISPLAY"] = 10
+# Largest page /api/leaderboard returns (its default page size is MAX_LEADERBOARD_ENTRIES_DISPLAY).
+app.config["LEADERBOARD_PAGE_MAX_LIMIT"] = 100
+# /api/leaderboard/export reads the backend in pages of this many scores while streaming.
+app.config["LEADERBOARD_EXPORT_BATCH_SIZE"] = 1000
+# New scores are appended to a JSON-lines log next to the leaderboard file and folded
+# into it by a background compactor every LEADERBOARD_COMPACT_INTERVAL seconds.
+app.config["LEADERBOARD_LOG_FILE"] = os.path.join(data_dir, "leaderboard.log.jsonl")
+app.config["LEADERBOARD_FSYNC"] = False  # fsync the log after every batch of scores
+# Scores submitted within this many seconds of each other are appended (and fsynced) as one
+# batch; writes from several worker processes are serialized with a lock file.
+app.config["LEADERBOARD_GROUP_COMMIT_WINDOW"] = 0.002
+app.config["LEADERBOARD_COMPACT_INTERVAL"] = 60.0
+# Storage backend: "json" (leaderboard.json + log) or "sqlite" (indexed table in
+# LEADERBOARD_DB_FILE, migrated once from LEADERBOARD_FILE on first start).
+app.config["LEADERBOARD_BACKEND"] = "json"
+app.config["LEADERBOARD_DB_FILE"] = os.path.join(data_dir, "leaderboard.sqlite3")
+
+# Seeded Maze Cache Configuration
+# Serialized responses for seeded mazes are cached by (dimension, seed, format).
+app.config["MAZE_CACHE_MAX_ENTRIES"] = 256
+app.config["MAZE_CACHE_MAX_BYTES"] = 32 * 1024 * 1024  # 32 MB
+
+# Warm Maze Pool Configuration
+# A background worker keeps ready-made, serialized unseeded mazes for every valid
+# dimension and pooled format, so requests pop a response instead of running Kruskal's.
+app.config["MAZE_POOL_ENABLED"] = True
+app.config["MAZE_POOL_DEPTH"] = 8  # Ready mazes per (dimension, format)
+app.config["MAZE_POOL_REFILL_PER_SECOND"] = 0.0  # 0 = refill as fast as possible
+app.config["MAZE_POOL_FORMATS"] = ("json", "packed")
+
+# Batch Generation Configuration
+# Batches are generated in a process pool shared across requests (None = one worker per CPU).
+app.config["MAZE_BATCH_MAX_SIZE"] = 1000
+app.config["MAZE_BATCH_WORKERS"] = None
+
+# Streamed Maze Limits
+# Streamed mazes are generated row by row (Eller's algorithm) in O(width) memory,
+# so they are not restricted to VALID_DIMENSIONS; these caps bound request cost.
+app.config["MAZE_STREAM_MAX_WIDTH"] = 10_000
+app.config["MAZE_STREAM_MAX_ROWS"] = 100_000
+
+# Stored (Tiled) Maze Configuration
+# Very large mazes are generated straight to memory-mapped files and read back in tiles.
+app.config["MAZE_STORE_DIR"] = os.path.join(data_dir, "mazes")
+app.config["MAZE_STORE_MAX_DIMENSION"] = 2000  # 2000x2000 cells = ~16 MB on disk
+app.config["MAZE_STORE_MAX_BYTES"] = 1024 * 1024 * 1024  # Oldest mazes are deleted beyond this
+app.config["MAZE_TILE_MAX_SIZE"] = 256  # Max tile width/height in grid cells
+
+# Solve Result Cache Configuration
+# /api/solve_maze responses are cached by (maze content hash, start, goal, strategy).
+app.config["SOLVE_CACHE_MAX_ENTRIES"] = 4096
+app.config["SOLVE_CACHE_MAX_BYTES"] = 16 * 1024 * 1024  # 16 MB
+
+# Batch Solve Configuration
+app.config["SOLVE_BATCH_MAX_QUERIES"] = 1000
+
+# Maze Registry Configuration
+# Mazes served by /api/generate_maze are kept server-side under an id (X-Maze-Id header)
+# so /api/solve_maze can reference them instead of receiving the grid again.
+app.config["MAZE_REGISTRY_MAX_ENTRIES"] = 1024
+app.config["MAZE_REGISTRY_MAX_BYTES"] = 64 * 1024 * 1024  # 64 MB
+app.config["MAZE_REGISTRY_TTL_SECONDS"] = 3600
+
+# HTTP Caching & Compression
+# Leaderboard and maze responses carry strong ETags and get 304s for matching If-None-Match.
+# JSON bodies of at least COMPRESSION_MIN_BYTES are gzip/brotli-encoded as the client accepts;
+# encoded bodies of reusable responses are cached by (ETag, encoding).
+app.config["COMPRESSION_MIN_BYTES"] = 1024
+app.config["COMPRESSION_CACHE_MAX_ENTRIES"] = 1024
+app.config["COMPRESSION_CACHE_MAX_BYTES"] = 16 * 1024 * 1024  # 16 MB
 
 # --- Logging Configuration ---
 log_level = logging.DEBUG if app.config["DEBUG"] else logging.INFO
@@ -61,6 +159,35 @@ if not os.path.exists(data_dir):
 
 # --- Global Constants ---
 VALID_DIMENSIONS = {3, 5, 7, 10, 15, 20, 100}  # Allowed maze dimensions
+TILED_DIMENSIONS = {1000}  # Stored mazes offered by the game (played through the tile API)
+
+# --- Shared Caches ---
+maze_cache = LRUCache(
+    max_entries=app.config["MAZE_CACHE_MAX_ENTRIES"],
+    max_bytes=app.config["MAZE_CACHE_MAX_BYTES"],
+)
+solve_cache = LRUCache(
+    max_entries=app.config["SOLVE_CACHE_MAX_ENTRIES"],
+    max_bytes=app.config["SOLVE_CACHE_MAX_BYTES"],
+)
+maze_registry = MazeRegistry(
+    max_entries=app.config["MAZE_REGISTRY_MAX_ENTRIES"],
+    max_bytes=app.config["MAZE_REGISTRY_MAX_BYTES"],
+    ttl_seconds=app.config["MAZE_REGISTRY_TTL_SECONDS"],
+)
+compressed_cache = LRUCache(
+    max_entries=app.config["COMPRESSION_CACHE_MAX_ENTRIES"],
+    max_bytes=app.config["COMPRESSION_CACHE_MAX_BYTES"],
+)
+maze_pool = None  # Created and started on first use by get_maze_pool()
+maze_pool_lock = threading.Lock()
+maze_store = None  # Created on first use by get_maze_store()
+maze_store_lock = threading.Lock()
+batch_executor = None  # Process pool created on first batch request by get_batch_executor()
+batch_executor_lock = threading.Lock()
+leaderboard_store = None  # Backend chosen by LEADERBOARD_BACKEND, created by get_leaderboard_store()
+leaderboard_store_lock = threading.Lock()
+leaderboard_body = None  # (store, version, serialized JSON) of the last full leaderboard served
 
 
 # --- Permission Check ---
@@ -84,60 +211,286 @@ HAS_WRITE_PERMISSION_FOR_LEADERBOARD = check_leaderboard_permissions()
 # ==============================================================================
 
 
-def load_leaderboard() -> list:
-    """Loads all scores from the leaderboard JSON file."""
-    leaderboard_file = app.config["LEADERBOARD_FILE"]
-    if not os.path.exists(leaderboard_file):
-        return []  # Return empty list if file doesn't exist
+def get_leaderboard_store():
+    """
+    Returns the leaderboard storage backend selected by LEADERBOARD_BACKEND, creating it on
+    first use: the JSON log is loaded and its background compactor started; the SQLite
+    database is opened and, the first time, filled from the JSON leaderboard.
+    """
+    global leaderboard_store
+    with leaderboard_store_lock:
+        if leaderboard_store is None:
+            backend = app.config["LEADERBOARD_BACKEND"]
+            if backend not in LEADERBOARD_BACKENDS:
+                raise ValueError(f"Unknown leaderboard backend: {backend!r}")
+            if backend == "sqlite":
+                leaderboard_store = SqliteLeaderboard(
+                    app.config["LEADERBOARD_DB_FILE"], migrate_from=app.config["LEADERBOARD_FILE"]
+                )
+            else:
+                leaderboard_store = LeaderboardLog(
+                    app.config["LEADERBOARD_FILE"],
+                    log_path=app.config["LEADERBOARD_LOG_FILE"],
+                    fsync=app.config["LEADERBOARD_FSYNC"],
+                    group_commit_window=app.config["LEADERBOARD_GROUP_COMMIT_WINDOW"],
+                )
+                leaderboard_store.load()
+                if HAS_WRITE_PERMISSION_FOR_LEADERBOARD:
+                    leaderboard_store.start(app.config["LEADERBOARD_COMPACT_INTERVAL"])
+        return leaderboard_store
 
-    try:
-        with open(leaderboard_file, "r") as f:
-            content = f.read()
-            # Handle empty file case
-            if not content.strip():
-                return []
-            scores = json.loads(content)
-            # Ensure loaded data is a list
-            return scores if isinstance(scores, list) else []
-    except (json.JSONDecodeError, OSError) as e:
-        # Log errors during file reading or JSON parsing
-        logger.error(f"Error loading leaderboard from '{leaderboard_file}': {e}")
-        return []  # Return empty list on error
-
-
-def save_leaderboard(scores: list) -> bool:
-    """Saves the complete list of scores to the leaderboard JSON file atomically."""
+
+def leaderboard_json() -> tuple:
+    """
+    Returns (backend version, full leaderboard serialized as JSON). The bytes are cached and
+    reused until the version changes, so repeated reads cost a version check (a stat call
+    or an index lookup) instead of a full load and serialization.
+    """
+    global leaderboard_body
+    store = get_leaderboard_store()
+    version = store.version()
+    cached = leaderboard_body
+    if cached is None or cached[0] is not store or cached[1] != version:
+        cached = (store, version, app.json.response(store.scores()).get_data())
+        leaderboard_body = cached
+    return cached[1], cached[2]
+
+
+def encode_leaderboard_cursor(key: tuple) -> str:
+    """Encodes a backend's (time, tiebreak) page key as an opaque cursor string."""
+    time_key, tiebreak = key
+    return f"{time_key!r}:{tiebreak}"
+
+
+def decode_leaderboard_cursor(cursor: str) -> tuple:
+    """
+    Reverses 'encode_leaderboard_cursor'.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    time_key, _, tiebreak = cursor.partition(":")
+    return float(time_key), int(tiebreak)
+
+
+def add_leaderboard_score(entry: dict):
+    """
+    Stores one score in the leaderboard backend and returns its (overall, per-dimension)
+    rank, or None if it could not be saved.
+    """
     if not HAS_WRITE_PERMISSION_FOR_LEADERBOARD:
         logger.error("Cannot save leaderboard: Write permission denied for directory.")
-        return False
-
-    leaderboard_file = app.config["LEADERBOARD_FILE"]
-    temp_file = leaderboard_file + ".tmp"  # Temporary file for atomic write
+        return None
 
     try:
-        # Sort all scores by time for consistent file ordering
-        scores.sort(key=lambda item: item.get("time", float("inf")))
+        return get_leaderboard_store().add(entry)
+    except OSError:
+        logger.exception("Error saving score to the leaderboard", exc_info=True)
+        return None
 
-        # Write the complete list of scores to the temporary file
-        with open(temp_file, "w") as f:
-            json.dump(scores, f, indent=4)
 
-        # Atomically replace the old leaderboard with the new one
-        os.replace(temp_file, leaderboard_file)
-        logger.info(
-            f"Leaderboard with {len(scores)} scores saved successfully to {leaderboard_file}"
-        )
-        return True
-    except (OSError, Exception) as e:
-        # Catch file operation errors or any other unexpected issues
-        logger.exception(f"Error saving leaderboard to '{leaderboard_file}'", exc_info=True)
-        # Attempt to clean up the temporary file if it still exists after an error
-        if os.path.exists(temp_file):
+# ==============================================================================
+# Maze Response Helpers
+# ==============================================================================
+
+
+def requested_maze_format() -> str:
+    """
+    Determines the maze wire format for the current request.
+    An explicit '?format=' wins; otherwise an Accept header preferring
+    'application/octet-stream' selects the binary format. Defaults to 'json'.
+    """
+    fmt = request.args.get("format")
+    if fmt:
+        return fmt.lower()
+    best = request.accept_mimetypes.best_match(["application/json", "application/octet-stream"])
+    return "binary" if best == "application/octet-stream" else "json"
+
+
+def maze_response(grid, fmt: str) -> Response:
+    """Serializes a maze grid (NumPy array) into a Flask response in the given wire format."""
+    if fmt == "packed":
+        return jsonify(to_envelope(grid))
+    if fmt == "binary":
+        rows, cols = grid.shape
+        response = Response(pack_grid(grid), mimetype="application/octet-stream")
+        response.headers["X-Maze-Rows"] = str(rows)
+        response.headers["X-Maze-Cols"] = str(cols)
+        return response
+    return jsonify(grid.tolist())
+
+
+def freeze_response(response: Response) -> tuple:
+    """Captures a response's body, mimetype and headers so it can be cached and replayed."""
+    return response.get_data(), response.mimetype, list(response.headers.items())
+
+
+def thaw_response(frozen: tuple) -> Response:
+    """Rebuilds a Flask response from the tuple produced by 'freeze_response'."""
+    body, mimetype, headers = frozen
+    return Response(body, mimetype=mimetype, headers=headers)
+
+
+def build_pooled_maze(key: tuple) -> tuple:
+    """Pool factory: generates one unseeded maze and returns (grid, frozen response)."""
+    dimension, fmt = key
+    with app.app_context():
+        maze_obj = Maze(dimension=dimension)
+        maze_obj.generate()
+        return maze_obj.grid, freeze_response(maze_response(maze_obj.grid, fmt))
+
+
+def etag_matches(etag: str) -> bool:
+    """Whether the request's If-None-Match holds 'etag' in any of its content codings."""
+    variants = (etag, *(f"{etag}-{coding}" for coding in CONTENT_ENCODINGS))
+    return any(request.if_none_match.contains(variant) for variant in variants)
+
+
+def cacheable_response(response: Response, etag: str, cache_compressed: bool = True) -> Response:
+    """
+    Makes a 200 response conditional and compressed. It is tagged with the strong ETag
+    'etag' (suffixed with the content coding when encoded) and turned into an empty 304 if
+    the client's If-None-Match already holds any variant of it. JSON bodies of at least
+    COMPRESSION_MIN_BYTES are encoded with the best coding the client accepts; with
+    'cache_compressed' the encoded bytes are kept for the next request with the same ETag.
+    """
+    encoding = None
+    if response.mimetype == "application/json":
+        response.vary.add("Accept-Encoding")
+        if (response.content_length or 0) >= app.config["COMPRESSION_MIN_BYTES"]:
+            encoding = request.accept_encodings.best_match(CONTENT_ENCODINGS)
+    tag = f"{etag}-{encoding}" if encoding else etag
+    response.set_etag(tag)
+
+    if etag_matches(etag):
+        response.status_code = 304
+        response.set_data(b"")
+        del response.headers["Content-Length"]
+        return response
+
+    if encoding:
+        body = compressed_cache.get(tag) if cache_compressed else None
+        if body is None:
+            body = compress(response.get_data(), encoding)
+            if cache_compressed:
+                compressed_cache.put(tag, body, len(body))
+        response.set_data(body)
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def registered_maze_response(
+    grid, response: Response, fmt: str, cache_compressed: bool = False
+) -> Response:
+    """
+    Registers the served grid, tags the response with its id in 'X-Maze-Id' and makes it
+    cacheable: the id is a content hash, so (id, format) is a strong ETag for the body.
+    """
+    maze_id = maze_registry.register(grid)
+    response.headers["X-Maze-Id"] = maze_id
+    return cacheable_response(response, f"maze-{maze_id}-{fmt}", cache_compressed)
+
+
+def get_maze_pool():
+    """Returns the warm maze pool, creating and starting it on first use. None if disabled."""
+    global maze_pool
+    if not app.config["MAZE_POOL_ENABLED"]:
+        return None
+    with maze_pool_lock:
+        if maze_pool is None:
+            keys = [
+                (dimension, fmt)
+                for dimension in sorted(VALID_DIMENSIONS)
+                for fmt in app.config["MAZE_POOL_FORMATS"]
+            ]
+            maze_pool = MazePool(
+                keys,
+                build_pooled_maze,
+                depth=app.config["MAZE_POOL_DEPTH"],
+                refill_per_second=app.config["MAZE_POOL_REFILL_PER_SECOND"],
+            )
+            maze_pool.start()
+        return maze_pool
+
+
+def get_maze_store() -> MazeStore:
+    """Returns the memory-mapped maze store, creating its directory on first use."""
+    global maze_store
+    with maze_store_lock:
+        if maze_store is None:
+            maze_store = MazeStore(
+                app.config["MAZE_STORE_DIR"], max_bytes=app.config["MAZE_STORE_MAX_BYTES"]
+            )
+        return maze_store
+
+
+def get_batch_executor(replace_broken=None):
+    """
+    Returns the shared batch generation process pool, creating it on first use.
+    Passing the current executor as 'replace_broken' shuts it down and builds a fresh one
+    (a worker that dies abruptly leaves a ProcessPoolExecutor permanently unusable).
+    """
+    global batch_executor
+    with batch_executor_lock:
+        if replace_broken is not None and batch_executor is replace_broken:
+            batch_executor.shutdown(wait=False, cancel_futures=True)
+            batch_executor = None
+        if batch_executor is None:
+            batch_executor = create_executor(app.config["MAZE_BATCH_WORKERS"])
+        return batch_executor
+
+
+def request_json():
+    """
+    Returns the request's JSON body like request.get_json(), but parsed with the fast
+    decoder (orjson when installed). Bodies it cannot parse are handed to Flask, so
+    malformed or non-JSON requests produce the same errors as before.
+    """
+    if request.is_json:
+        body = request.get_data(cache=True)
+        if body:
             try:
-                os.remove(temp_file)
-            except OSError as remove_err:
-                logger.error(f"Error removing temp file '{temp_file}': {remove_err}")
-        return False
+                return fast_json.loads(body)
+            except ValueError:
+                pass
+    return request.get_json()
+
+
+def request_maze_array(maze) -> np.ndarray:
+    """
+    Converts a maze from a request body (a list-of-lists grid or a 'packed' envelope) into
+    a contiguous uint8 array in one step, so it can be hashed and solved directly.
+
+    Raises:
+        ValueError: If the grid is ragged, empty, or holds cells other than 0 and 1.
+    """
+    if isinstance(maze, dict):
+        return from_envelope(maze)
+    return grid_from_rows(maze)
+
+
+def parse_batch_spec(spec) -> tuple:
+    """
+    Validates one batch entry ({"dimension", "seed"?, "algorithm"?}) and returns
+    (dimension, seed, algorithm).
+
+    Raises:
+        ValueError: If the entry is malformed or uses invalid values.
+    """
+    if not isinstance(spec, dict) or "dimension" not in spec:
+        raise ValueError("each spec must be an object with a 'dimension'")
+    dimension = int(spec["dimension"])
+    if dimension not in VALID_DIMENSIONS:
+        raise ValueError(f"invalid dimension {dimension}")
+    seed = spec.get("seed")
+    if seed is not None:
+        seed = int(seed)
+        if seed < 0:
+            raise ValueError("seed cannot be negative")
+    algorithm = str(spec.get("algorithm", DEFAULT_ALGORITHM)).lower()
+    if algorithm not in GENERATION_ALGORITHMS:
+        raise ValueError(f"unknown algorithm {algorithm}")
+    return dimension, seed, algorithm
 
 
 # ==============================================================================
@@ -162,8 +515,31 @@ def maze():
 # --- API Routes ---
 @app.route("/api/generate_maze/<int:dimension>")
 def generate_maze_api(dimension: int):
-    """Generates a new maze of the specified dimension."""
+    """
+    Generates a new maze of the specified dimension.
+    The response format is chosen by '?format=json|packed|binary' or the Accept header.
+    '?algorithm=' selects a generation algorithm from GENERATION_ALGORITHMS (default Kruskal's).
+    With '?seed=<int>' the maze is deterministic and its serialized response is cached.
+    Unseeded mazes from the default algorithm are served from the warm pool when one is ready.
+    Every served maze is registered server-side; its id is returned in the 'X-Maze-Id' header.
+    """
     logger.info(f"Request to generate maze with dimension: {dimension}")
+    fmt = requested_maze_format()
+    if fmt not in MAZE_FORMATS:
+        return jsonify({"error": f"Unsupported maze format: {fmt}"}), 400
+    algorithm = request.args.get("algorithm", DEFAULT_ALGORITHM).lower()
+    if algorithm not in GENERATION_ALGORITHMS:
+        return jsonify({"error": f"Unknown generation algorithm: {algorithm}"}), 400
+
+    seed = None
+    if "seed" in request.args:
+        try:
+            seed = int(request.args["seed"])
+        except ValueError:
+            return jsonify({"error": "Seed must be an integer"}), 400
+        if seed < 0:
+            return jsonify({"error": "Seed cannot be negative"}), 400
+
     effective_dimension = dimension
     # Default to a standard size if the requested dimension is not in the allowed set
     if dimension not in VALID_DIMENSIONS:
@@ -172,12 +548,30 @@ def generate_maze_api(dimension: int):
             f"Dimension {dimension} invalid, defaulting to {effective_dimension}."
         )
 
+    # Seeded mazes are reproducible, so their serialized responses can be reused
+    cache_key = (effective_dimension, seed, fmt, algorithm)
+    if seed is not None:
+        cached = maze_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Maze cache hit (dim: {effective_dimension}, seed: {seed}, format: {fmt})")
+            grid, frozen = cached
+            return registered_maze_response(grid, thaw_response(frozen), fmt, True)
+    elif algorithm == DEFAULT_ALGORITHM and fmt in app.config["MAZE_POOL_FORMATS"]:
+        pool = get_maze_pool()
+        pooled = pool.take((effective_dimension, fmt)) if pool is not None else None
+        if pooled is not None:
+            logger.info(f"Maze served from pool ({effective_dimension}x{effective_dimension})")
+            grid, frozen = pooled
+            return registered_maze_response(grid, thaw_response(frozen), fmt)
+
     try:
-        maze_obj = Maze(dimension=effective_dimension)
-        maze_obj.generate()
-        logger.info(f"Maze generated successfully ({effective_dimension}x{effective_dimension})")
-        # Return the maze grid as a JSON list
-        return jsonify(maze_obj.to_list())
+        maze_obj = Maze(dimension=effective_dimension, seed=seed)
+        maze_obj.generate(algorithm)
+        logger.info(
+            f"Maze generated successfully ({effective_dimension}x{effective_dimension}, {algorithm})"
+        )
+        # Return the maze grid in the requested wire format
+        response = maze_response(maze_obj.grid, fmt)
     except Exception:
         # Log unexpected errors during maze generation
         logger.exception(
@@ -185,27 +579,279 @@ def generate_maze_api(dimension: int):
         )
         return jsonify({"error": "Failed to generate maze"}), 500
 
+    if seed is not None:
+        response.headers["X-Maze-Seed"] = str(seed)
+        frozen = freeze_response(response)
+        maze_cache.put(cache_key, (maze_obj.grid, frozen), len(frozen[0]) + maze_obj.grid.nbytes)
+    return registered_maze_response(maze_obj.grid, response, fmt, seed is not None)
+
+
+@app.route("/api/generate_mazes", methods=["POST"])
+def generate_mazes_api():
+    """
+    Generates a batch of mazes in parallel worker processes.
+    Body: {"mazes": [{"dimension": 10, "seed": 1, "algorithm": "kruskal"}, ...], "format": "json"|"packed"}.
+    Results stream back as NDJSON in completion order; each line carries its 'index' in the request.
+    """
+    logger.info("Request to generate maze batch.")
+    try:
+        data = request.get_json()
+        if not isinstance(data, dict) or not isinstance(data.get("mazes"), list):
+            return jsonify({"error": "Expected a JSON object with a 'mazes' list"}), 400
+        specs = data["mazes"]
+        if not 0 < len(specs) <= app.config["MAZE_BATCH_MAX_SIZE"]:
+            return jsonify({"error": f"Batch must contain 1 to {app.config['MAZE_BATCH_MAX_SIZE']} mazes"}), 400
+        fmt = str(data.get("format", "json")).lower()
+        if fmt not in ("json", "packed"):
+            return jsonify({"error": f"Unsupported format for batches: {fmt}"}), 400
+        parsed = []
+        for index, spec in enumerate(specs):
+            try:
+                parsed.append(parse_batch_spec(spec))
+            except (ValueError, TypeError) as e:
+                return jsonify({"error": f"Invalid spec at index {index}: {e}"}), 400
+    except BadRequest as e:
+        logger.warning(f"Bad request for generate_mazes: {e.description}")
+        return jsonify({"error": getattr(e, "description", "Malformed JSON or bad request")}), 400
+
+    executor = get_batch_executor()
+    try:
+        futures = {
+            executor.submit(generate_maze_line, index, dimension, seed, algorithm, fmt): index
+            for index, (dimension, seed, algorithm) in enumerate(parsed)
+        }
+    except BrokenProcessPool:
+        logger.warning("Batch process pool was broken; recreating it.")
+        executor = get_batch_executor(replace_broken=executor)
+        futures = {
+            executor.submit(generate_maze_line, index, dimension, seed, algorithm, fmt): index
+            for index, (dimension, seed, algorithm) in enumerate(parsed)
+        }
+
+    def stream_results():
+        """Yields each maze as soon as its worker finishes; cancels the rest on disconnect."""
+        try:
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    logger.exception(f"Batch maze {futures[future]} failed", exc_info=True)
+                    yield json.dumps({"index": futures[future], "error": str(e)}) + "\n"
+        finally:
+            for future in futures:
+                future.cancel()
+
+    logger.info(f"Generating batch of {len(parsed)} mazes (format: {fmt})")
+    return Response(stream_results(), mimetype="application/x-ndjson")
+
+
+def stream_maze_rows(rows, fmt: str):
+    """
+    Serializes streamed maze rows chunk by chunk.
+    'json' emits one JSON array with a row per line; 'binary' emits each row bit-packed
+    on its own (padded to a whole number of bytes).
+    """
+    if fmt == "binary":
+        for row in rows:
+            yield np.packbits(row).tobytes()
+        return
+    separator = "["
+    for row in rows:
+        yield separator + json.dumps(row.tolist(), separators=(",", ":"))
+        separator = ",\n"
+    yield "]\n"
+
+
+@app.route("/api/generate_maze/<int:dimension>/stream")
+def stream_maze_api(dimension: int):
+    """
+    Streams a maze of any size row by row, never holding the whole grid in memory.
+    Query parameters: 'rows' (cell rows, defaults to 'dimension'), 'seed', and
+    'format' ('json' or 'binary').
+    """
+    fmt = requested_maze_format()
+    if fmt not in ("json", "binary"):
+        return jsonify({"error": f"Unsupported format for streamed mazes: {fmt}"}), 400
+    try:
+        rows = int(request.args.get("rows", dimension))
+        seed = int(request.args["seed"]) if "seed" in request.args else None
+    except ValueError:
+        return jsonify({"error": "'rows' and 'seed' must be integers"}), 400
+
+    if not 0 < dimension <= app.config["MAZE_STREAM_MAX_WIDTH"]:
+        return jsonify({"error": f"Width must be between 1 and {app.config['MAZE_STREAM_MAX_WIDTH']}"}), 400
+    if not 0 < rows <= app.config["MAZE_STREAM_MAX_ROWS"]:
+        return jsonify({"error": f"Rows must be between 1 and {app.config['MAZE_STREAM_MAX_ROWS']}"}), 400
+    if seed is not None and seed < 0:
+        return jsonify({"error": "Seed cannot be negative"}), 400
+
+    logger.info(f"Request to stream maze ({dimension} wide x {rows} rows, format: {fmt})")
+    maze_rows = generate_eller_rows(dimension, rows=rows, seed=seed)
+    mimetype = "application/octet-stream" if fmt == "binary" else "application/json"
+    response = Response(stream_maze_rows(maze_rows, fmt), mimetype=mimetype)
+    response.headers["X-Maze-Rows"] = str(2 * rows + 1)
+    response.headers["X-Maze-Cols"] = str(2 * dimension + 1)
+    return response
+
+
+@app.route("/api/maze", methods=["POST"])
+def create_stored_maze_api():
+    """
+    Generates a maze directly into the memory-mapped store and returns its id.
+    Body: {"dimension": int, "rows"?: int, "seed"?: int}. The grid itself is fetched
+    afterwards in windows via /api/maze/<id>/tile.
+    """
+    logger.info("Request to create stored maze.")
+    data = None
+    try:
+        data = request.get_json()
+        if not isinstance(data, dict) or "dimension" not in data:
+            return jsonify({"error": "Missing required key(s): dimension"}), 400
+        dimension = int(data["dimension"])
+        rows = int(data.get("rows", dimension))
+        seed = data.get("seed")
+        seed = int(seed) if seed is not None else None
+    except BadRequest as e:
+        logger.warning(f"Bad request for create maze: {e.description}")
+        return jsonify({"error": getattr(e, "description", "Malformed JSON or bad request")}), 400
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Invalid data types in create maze request: {e} (Data: {str(data)[:200]})")
+        return jsonify({"error": "Invalid data types for dimension, rows, or seed"}), 400
+
+    max_dimension = app.config["MAZE_STORE_MAX_DIMENSION"]
+    if not (0 < dimension <= max_dimension and 0 < rows <= max_dimension):
+        return jsonify({"error": f"Dimensions must be between 1 and {max_dimension}"}), 400
+    if seed is not None and seed < 0:
+        return jsonify({"error": "Seed cannot be negative"}), 400
+
+    try:
+        maze_id = get_maze_store().generate(dimension, rows=rows, seed=seed)
+    except OSError:
+        logger.exception("Error writing stored maze", exc_info=True)
+        return jsonify({"error": "Failed to store maze"}), 500
+    grid_rows, grid_cols = 2 * rows + 1, 2 * dimension + 1
+    logger.info(f"Stored maze {maze_id} ({dimension}x{rows})")
+    return jsonify(
+        {
+            "maze_id": maze_id,
+            "rows": grid_rows,
+            "cols": grid_cols,
+            "start": {"x": 1, "y": 1},
+            "goal": {"x": grid_cols - 2, "y": grid_rows - 2},
+        }
+    ), 201
+
+
+@app.route("/api/maze/<maze_id>", methods=["GET"])
+def stored_maze_metadata_api(maze_id: str):
+    """Returns the metadata (dimension, seed, grid rows/cols) of a stored maze."""
+    try:
+        return jsonify(get_maze_store().metadata(maze_id))
+    except KeyError:
+        return jsonify({"error": "Maze not found"}), 404
+
+
+@app.route("/api/maze/<maze_id>/tile", methods=["GET"])
+def stored_maze_tile_api(maze_id: str):
+    """
+    Returns the window of a stored maze with top-left grid corner (x, y) and size (w, h),
+    clipped at the maze edges. Uses the same wire formats as /api/generate_maze.
+    """
+    fmt = requested_maze_format()
+    if fmt not in MAZE_FORMATS:
+        return jsonify({"error": f"Unsupported maze format: {fmt}"}), 400
+    try:
+        x, y = int(request.args.get("x", 0)), int(request.args.get("y", 0))
+        w, h = int(request.args.get("w", 64)), int(request.args.get("h", 64))
+    except ValueError:
+        return jsonify({"error": "Tile coordinates and size must be integers"}), 400
+    max_size = app.config["MAZE_TILE_MAX_SIZE"]
+    if x < 0 or y < 0 or not (0 < w <= max_size and 0 < h <= max_size):
+        return jsonify({"error": f"Tile origin must be non-negative and size 1 to {max_size}"}), 400
+
+    try:
+        tile = get_maze_store().tile(maze_id, x, y, w, h)
+    except KeyError:
+        return jsonify({"error": "Maze not found"}), 404
+    if tile.size == 0:
+        return jsonify({"error": "Tile is outside the maze"}), 400
+    # Stored mazes never change, so the id and window identify the body
+    etag = f"tile-{maze_id}-{x}-{y}-{w}-{h}-{fmt}"
+    return cacheable_response(maze_response(tile, fmt), etag, cache_compressed=False)
+
+
+@app.route("/api/maze/<maze_id>/hint", methods=["GET"])
+def maze_hint_api(maze_id: str):
+    """
+    Returns the distance to the goal (the bottom-right cell) from cell (x, y) and the next
+    move towards it; with '?full=1' also the full remaining path. Works for registered mazes
+    (X-Maze-Id) and stored mazes. Each maze's distance field is computed once and reused.
+    """
+    try:
+        x, y = int(request.args["x"]), int(request.args["y"])
+    except (KeyError, ValueError):
+        return jsonify({"error": "Query parameters 'x' and 'y' must be integers"}), 400
+    full = request.args.get("full", "0").lower() in ("1", "true")
+
+    try:
+        grid = maze_registry.get(maze_id)
+        if grid is not None:
+            rows, cols = grid.shape
+            field = maze_registry.distance_field(maze_id, (cols - 2, rows - 2))
+        else:
+            store = get_maze_store()
+            grid = store.open(maze_id)
+            rows, cols = grid.shape
+            field = store.distance_field(maze_id, (cols - 2, rows - 2))
+    except KeyError:
+        return jsonify({"error": "Maze not found"}), 404
+    if field is None:
+        return jsonify({"error": "Maze not found"}), 404  # Expired between lookups
+    if not (0 <= x < cols and 0 <= y < rows) or grid[y, x] != 0:
+        return jsonify({"error": "Cell is outside the maze or on a wall"}), 400
+
+    path = follow_distance_field(field, (x, y), max_steps=None if full else 1)
+    distance = None if field[y, x] == UNREACHABLE else int(field[y, x])
+    result = {
+        "x": x,
+        "y": y,
+        "distance": distance,
+        "next": {"x": path[0][0], "y": path[0][1]} if path else None,
+    }
+    if full:
+        result["path"] = path
+    return jsonify(result)
+
+
+def cached_solve_response(cache_key: tuple, result: dict) -> Response:
+    """Stores a solve result in the result cache and returns it as a JSON response."""
+    # Each (x, y) step serializes to roughly a dozen bytes
+    size = 64 + 12 * len(result["path"] or ())
+    solve_cache.put(cache_key, result, size)
+    return jsonify(result)
+
 
 @app.route("/api/solve_maze", methods=["POST"])
 def solve_maze_api():
-    """Solves the provided maze from start to goal using BFS."""
+    """Solves the provided maze from start to goal with the requested search strategy."""
     logger.info("Request to solve maze.")
     data = None
     try:
-        # Parse JSON data from the request body
-        data = request.get_json()
+        # Parse JSON data from the request body (fast decoder for large grids)
+        data = request_json()
         if data is None:
             return jsonify({"error": "Missing or empty JSON data"}), 400
 
-        # Validate required keys
-        required_keys = ("maze", "start", "goal")
+        # Validate required keys; a registered maze is referenced by 'maze_id' instead of 'maze'
+        by_id = "maze_id" in data
+        required_keys = ("start", "goal") if by_id else ("maze", "start", "goal")
         if not all(k in data for k in required_keys):
             missing_keys = ", ".join(k for k in required_keys if k not in data)
             return jsonify({"error": f"Missing required key(s): {missing_keys}"}), 400
 
-        # Validate data types
+        # Validate data types; the maze may be a grid or a 'packed' envelope
         if (
-            not isinstance(data.get("maze"), list)
+            (not by_id and not isinstance(data.get("maze"), (list, dict)))
             or not isinstance(data.get("start"), dict)
             or not isinstance(data.get("goal"), dict)
         ):
@@ -223,11 +869,53 @@ def solve_maze_api():
         start_tuple = (int(start_x), int(start_y))
         goal_tuple = (int(goal_x), int(goal_y))
 
-        # Solve the maze
-        solver = MazeSolver(data["maze"])
-        path = solver.solve(start_tuple, goal_tuple)
-        logger.info(f"Solver finished. Path found: {'Yes' if path else 'No'}")
-        return jsonify({"path": path})
+        strategy = data.get("strategy")
+        if strategy is not None and strategy not in SOLVER_STRATEGIES:
+            return jsonify({
+                "error": f"Unknown strategy: {strategy}. Choose from {', '.join(SOLVER_STRATEGIES)}"
+            }), 400
+
+        # Identical requests are answered from the result cache, keyed by the maze's content
+        # hash (registered maze ids already are one)
+        grid = None
+        if not by_id:
+            try:
+                grid = request_maze_array(data["maze"])
+            except ValueError as e:
+                return jsonify({"error": f"Invalid maze: {e}"}), 400
+        maze_key = str(data["maze_id"]) if by_id else content_id(grid)
+        cache_key = (by_id, maze_key, start_tuple, goal_tuple, strategy)
+        cached = solve_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Solve served from result cache.")
+            return jsonify(cached)
+
+        # A registered perfect maze answers from its tree index unless a search is requested
+        if by_id and strategy is None:
+            index = maze_registry.tree_index(maze_key)
+            if index is not None:
+                path = index.path(start_tuple, goal_tuple)
+                logger.info(f"Solved from tree index. Path found: {'Yes' if path else 'No'}")
+                return cached_solve_response(
+                    cache_key, {"path": path, "strategy": "tree", "expanded": 0}
+                )
+        strategy = strategy or DEFAULT_STRATEGY
+
+        # Solve the maze, reusing the registered maze's prebuilt solver when referenced by id
+        if by_id:
+            solver = maze_registry.solver(maze_key)
+            if solver is None:
+                return jsonify({"error": "Unknown or expired maze_id"}), 404
+        else:
+            solver = MazeSolver(grid)
+        result = solver.search(start_tuple, goal_tuple, strategy)
+        logger.info(
+            f"Solver finished ({strategy}, {result.expanded} nodes expanded). "
+            f"Path found: {'Yes' if result.path else 'No'}"
+        )
+        return cached_solve_response(
+            cache_key, {"path": result.path, "strategy": strategy, "expanded": result.expanded}
+        )
 
     except BadRequest as e:
         # Handle malformed JSON or other request issues detected by Flask/Werkzeug
@@ -243,6 +931,69 @@ def solve_maze_api():
         return jsonify({"error": "Failed to solve maze due to an internal error"}), 500
 
 
+@app.route("/api/solve_maze/batch", methods=["POST"])
+def solve_maze_batch_api():
+    """
+    Solves many (start, goal) queries on one maze.
+    Body: {"maze": grid | packed envelope, or "maze_id": id,
+           "queries": [{"start": {"x", "y"}, "goal": {"x", "y"}}, ...]}.
+    Queries sharing a start are answered from one BFS tree; paths are returned in query order.
+    """
+    logger.info("Request to batch solve maze.")
+    data = None
+    try:
+        data = request_json()
+        if data is None:
+            return jsonify({"error": "Missing or empty JSON data"}), 400
+
+        by_id = "maze_id" in data
+        required_keys = ("queries",) if by_id else ("maze", "queries")
+        if not all(k in data for k in required_keys):
+            missing_keys = ", ".join(k for k in required_keys if k not in data)
+            return jsonify({"error": f"Missing required key(s): {missing_keys}"}), 400
+
+        queries = data["queries"]
+        max_queries = app.config["SOLVE_BATCH_MAX_QUERIES"]
+        if not isinstance(queries, list) or not 1 <= len(queries) <= max_queries:
+            return jsonify({"error": f"'queries' must be a list of 1 to {max_queries} queries"}), 400
+        pairs = []
+        for position, query in enumerate(queries):
+            try:
+                start, goal = query["start"], query["goal"]
+                pairs.append(((int(start["x"]), int(start["y"])), (int(goal["x"]), int(goal["y"]))))
+            except (KeyError, TypeError, ValueError):
+                return jsonify({"error": f"Invalid query at index {position}"}), 400
+
+        if by_id:
+            maze_id = str(data["maze_id"])
+            index = maze_registry.tree_index(maze_id)
+            if index is not None:
+                # A perfect maze's tree index answers each query without searching
+                return jsonify({"paths": [index.path(start, goal) for start, goal in pairs]})
+            solver = maze_registry.solver(maze_id)
+            if solver is None:
+                return jsonify({"error": "Unknown or expired maze_id"}), 404
+        else:
+            try:
+                solver = MazeSolver(request_maze_array(data["maze"]))
+            except ValueError as e:
+                return jsonify({"error": f"Invalid maze: {e}"}), 400
+
+        paths = solver.solve_many(pairs)
+        logger.info(f"Batch solve finished: {len(pairs)} queries.")
+        return jsonify({"paths": paths})
+
+    except BadRequest as e:
+        logger.warning(f"Bad request for solve_maze/batch: {e.description}")
+        return jsonify({"error": getattr(e, "description", "Malformed JSON or bad request")}), 400
+    except (ValueError, TypeError, KeyError, IndexError) as e:
+        logger.warning(f"Input Data Error for batch solver: {e} (Data: {str(data)[:200]})")
+        return jsonify({"error": "Invalid input data format for solver"}), 400
+    except Exception:
+        logger.exception(f"Unexpected batch solver error (Data: {str(data)[:200]})", exc_info=True)
+        return jsonify({"error": "Failed to solve maze due to an internal error"}), 500
+
+
 @app.route("/api/add_score", methods=["POST"])
 def add_score_api():
     """Adds a new score to the leaderboard."""
@@ -267,9 +1018,9 @@ def add_score_api():
         # Business logic validation
         if not name:
             return jsonify({"error": "Name cannot be empty"}), 400
-        if time < 0:
+        if not math.isfinite(time) or time < 0:  # NaN would break the leaderboard's ordering
             return jsonify({"error": "Invalid time value"}), 400
-        if dimension not in VALID_DIMENSIONS:
+        if dimension not in VALID_DIMENSIONS | TILED_DIMENSIONS:
             return jsonify({"error": f"Invalid dimension value: {dimension}"}), 400
         logger.info(f"Processing score: Name='{name}', Time={time}, Dimension={dimension}")
 
@@ -289,21 +1040,22 @@ def add_score_api():
         )
         return jsonify({"error": "Internal server error processing request"}), 500
 
-    # Load existing scores, append new score, and save
-    scores = load_leaderboard()
-    scores.append(
-        {
-            "name": name,
-            "time": time,
-            "dimension": dimension,
-            "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
-        }
-    )
+    # Store the new score in the configured backend (see add_leaderboard_score)
+    entry = {
+        "name": name,
+        "time": time,
+        "dimension": dimension,
+        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
 
-    if save_leaderboard(scores):
-        return jsonify({"success": True, "message": "Score added"}), 201  # 201 Created
+    ranks = add_leaderboard_score(entry)
+    if ranks is not None:
+        overall, size = ranks
+        return jsonify(
+            {"success": True, "message": "Score added", "rank": {"overall": overall, "size": size}}
+        ), 201  # 201 Created
     else:
-        # Error should have been logged by save_leaderboard
+        # Error should have been logged by add_leaderboard_score
         return jsonify({"error": "Failed to save leaderboard"}), 500
 
 
@@ -311,8 +1063,147 @@ def add_score_api():
 def get_leaderboard_api():
     """Retrieves the complete leaderboard."""
     logger.info("Request to get leaderboard.")
-    scores = load_leaderboard()  # Returns the full list
-    return jsonify(scores)
+    version, body = leaderboard_json()
+    return cacheable_response(Response(body, mimetype="application/json"), f"leaderboard-{version}")
+
+
+@app.route("/api/leaderboard", methods=["GET"])
+def leaderboard_page_api():
+    """
+    Returns one page of the leaderboard, fastest first: '?dimension=' limits it to one maze
+    size (all sizes if omitted), '?limit=' sets the page size and '?cursor=' continues from
+    the 'next_cursor' of the previous page. Cost depends on the page size only.
+    """
+    try:
+        dimension = int(request.args["dimension"]) if "dimension" in request.args else None
+        limit = int(request.args.get("limit", app.config["MAX_LEADERBOARD_ENTRIES_DISPLAY"]))
+        cursor = request.args.get("cursor")
+        after = decode_leaderboard_cursor(cursor) if cursor else None
+    except ValueError:
+        return jsonify({"error": "Invalid dimension, limit or cursor"}), 400
+    if not 1 <= limit <= app.config["LEADERBOARD_PAGE_MAX_LIMIT"]:
+        return jsonify(
+            {"error": f"Limit must be between 1 and {app.config['LEADERBOARD_PAGE_MAX_LIMIT']}"}
+        ), 400
+
+    store = get_leaderboard_store()
+    etag = f"leaderboard-{store.version()}-{dimension}-{limit}-{cursor or ''}"
+    if etag_matches(etag):  # Unchanged board: skip the page lookup
+        return cacheable_response(Response(mimetype="application/json"), etag)
+    scores, next_after = store.page(dimension, limit, after)
+    response = jsonify(
+        {
+            "dimension": dimension,
+            "scores": scores,
+            "next_cursor": encode_leaderboard_cursor(next_after) if next_after else None,
+        }
+    )
+    return cacheable_response(response, etag, cache_compressed=False)
+
+
+# Formats for /api/leaderboard/export: format name -> mimetype
+LEADERBOARD_EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+LEADERBOARD_COLUMNS = ("name", "time", "dimension", "timestamp")
+
+
+def export_leaderboard_rows(scores, fmt: str):
+    """Serializes scores one batch of lines at a time: NDJSON objects or CSV rows with a header."""
+    batch_size = app.config["LEADERBOARD_EXPORT_BATCH_SIZE"]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if fmt == "csv":
+        writer.writerow(LEADERBOARD_COLUMNS)
+    for count, entry in enumerate(scores, start=1):
+        if fmt == "csv":
+            writer.writerow([entry.get(column, "") for column in LEADERBOARD_COLUMNS])
+        else:
+            buffer.write(json.dumps(entry) + "\n")
+        if count % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+@app.route("/api/leaderboard/export", methods=["GET"])
+def export_leaderboard_api():
+    """
+    Streams the whole leaderboard, fastest first, as '?format=ndjson' (default) or 'csv'.
+    '?dimension=' limits it to one maze size and '?since=' (ISO date or date-time, UTC) to
+    scores submitted from then on. Scores are read from the backend page by page as the
+    response is sent, so memory use does not grow with the leaderboard.
+    """
+    fmt = request.args.get("format", "ndjson").lower()
+    if fmt not in LEADERBOARD_EXPORT_FORMATS:
+        return jsonify({"error": f"Unsupported export format: {fmt}"}), 400
+    try:
+        dimension = int(request.args["dimension"]) if "dimension" in request.args else None
+        since = None
+        if "since" in request.args:
+            since_time = datetime.fromisoformat(request.args["since"])
+            if since_time.tzinfo is not None:
+                since_time = since_time.astimezone(timezone.utc)
+            since = since_time.strftime("%Y-%m-%dT%H:%M:%SZ")  # Stored timestamp format
+    except ValueError:
+        return jsonify({"error": "Invalid dimension or 'since' timestamp"}), 400
+
+    logger.info(f"Request to export leaderboard (format: {fmt}, dimension: {dimension})")
+    scores = iter_scores(
+        get_leaderboard_store(),
+        dimension=dimension,
+        since=since,
+        batch_size=app.config["LEADERBOARD_EXPORT_BATCH_SIZE"],
+    )
+    response = Response(
+        stream_with_context(export_leaderboard_rows(scores, fmt)),
+        mimetype=LEADERBOARD_EXPORT_FORMATS[fmt],
+    )
+    response.headers["Content-Disposition"] = f"attachment; filename=leaderboard.{fmt}"
+    return response
+
+
+@app.route("/api/rank", methods=["GET"])
+def rank_api():
+    """
+    Previews the rank a score with '?time=' would get, overall and (with '?dimension=')
+    among scores for that maze size, without saving it.
+    """
+    try:
+        time = float(request.args["time"])
+        dimension = int(request.args["dimension"]) if "dimension" in request.args else None
+    except (KeyError, ValueError):
+        return jsonify({"error": "'time' must be a number and 'dimension' an integer"}), 400
+    if not math.isfinite(time) or time < 0:
+        return jsonify({"error": "Invalid time value"}), 400
+
+    store = get_leaderboard_store()
+    size = store.rank(time, dimension) if dimension is not None else None
+    return jsonify(
+        {
+            "time": time,
+            "dimension": dimension,
+            "rank": {"overall": store.rank(time), "size": size},
+        }
+    )
+
+
+@app.route("/api/stats", methods=["GET"])
+def stats_api():
+    """
+    Reports cache, registry and pool statistics for monitoring. The maze pool is reported
+    as None until a maze request has started it; probing never starts it.
+    """
+    pool = maze_pool
+    return jsonify(
+        {
+            "maze_cache": maze_cache.stats(),
+            "solve_cache": solve_cache.stats(),
+            "compressed_cache": compressed_cache.stats(),
+            "maze_registry": maze_registry.stats(),
+            "maze_pool": pool.stats() if pool is not None else None,
+            "leaderboard": get_leaderboard_store().stats(),
+        }
+    )
 
 
 # ==============================================================================
@@ -0,0 +1,84 @@
+# benchmarks/benchmark_generation.py
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from typing import List, Tuple
+
+# Allow running as 'python benchmarks/benchmark_generation.py' from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.maze_generator import GENERATION_ALGORITHMS, Maze  # noqa: E402
+
+
+# ==============================================================================
+# Configuration
+# ==============================================================================
+
+DEFAULT_DIMENSIONS = [10, 100, 300, 1000]
+DEFAULT_REPEATS = 3
+
+
+# ==============================================================================
+# Benchmark Helpers
+# ==============================================================================
+
+
+def time_generation(algorithm: str, dimension: int, repeats: int) -> float:
+    """Returns the best wall-clock time (seconds) of 'repeats' generations."""
+    best = float("inf")
+    for seed in range(repeats):
+        maze = Maze(dimension, seed=seed)
+        start = time.perf_counter()
+        maze.generate(algorithm)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(algorithm: str, dimension: int) -> int:
+    """Returns the peak traced allocation (bytes) of one generation, excluding the grid itself."""
+    maze = Maze(dimension, seed=0)
+    tracemalloc.start()
+    try:
+        maze.generate(algorithm)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run(algorithms: List[str], dimensions: List[int], repeats: int, max_seconds: float) -> None:
+    """Prints a time / peak-memory table for every algorithm and dimension."""
+    print(f"{'algorithm':<12} {'dimension':>9} {'best time (s)':>14} {'peak mem (MiB)':>15}")
+    print("-" * 53)
+    for algorithm in algorithms:
+        for dimension in dimensions:
+            elapsed = time_generation(algorithm, dimension, 1)
+            if elapsed > max_seconds:
+                # Too slow to repeat; report the single run
+                row: Tuple[str, ...] = (f"{elapsed:.4f}*", "-")
+            else:
+                elapsed = min(elapsed, time_generation(algorithm, dimension, repeats))
+                row = (f"{elapsed:.4f}", f"{peak_memory(algorithm, dimension) / 2**20:.2f}")
+            print(f"{algorithm:<12} {dimension:>9} {row[0]:>14} {row[1]:>15}")
+            if elapsed > max_seconds:
+                break  # Larger dimensions would only be slower
+    print("\n* single run; larger dimensions skipped for this algorithm")
+
+
+# ==============================================================================
+# Script Execution
+# ==============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark maze generation algorithms.")
+    parser.add_argument("--algorithms", nargs="+", default=sorted(GENERATION_ALGORITHMS),
+                        choices=sorted(GENERATION_ALGORITHMS))
+    parser.add_argument("--dimensions", nargs="+", type=int, default=DEFAULT_DIMENSIONS)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--max-seconds", type=float, default=10.0,
+                        help="Skip larger dimensions once one run exceeds this.")
+    args = parser.parse_args()
+    run(args.algorithms, args.dimensions, args.repeats, args.max_seconds)
@@ -0,0 +1,92 @@
+# benchmarks/benchmark_solver.py
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+
+# Allow running as 'python benchmarks/benchmark_solver.py' from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.maze_generator import Maze  # noqa: E402
+from src.maze_solver import VECTORIZED_BFS_MIN_CELLS, MazeSolver  # noqa: E402
+
+
+# ==============================================================================
+# Configuration
+# ==============================================================================
+
+# Grid side lengths (cells, walls included); perfect mazes use dimension = (side - 1) // 2
+DEFAULT_SIDES = [41, 101, 201, 301, 601, 1201, 2001]
+DEFAULT_REPEATS = 3
+GRID_KINDS = ("perfect", "open", "random")
+
+
+# ==============================================================================
+# Benchmark Helpers
+# ==============================================================================
+
+
+def make_grid(kind: str, side: int) -> np.ndarray:
+    """Builds a benchmark grid: a perfect maze, an empty walled room, or 20% random walls."""
+    if kind == "perfect":
+        maze = Maze((side - 1) // 2, seed=0)
+        maze.generate()
+        return maze.grid
+    if kind == "open":
+        grid = np.zeros((side, side), dtype=np.uint8)
+    else:
+        grid = (np.random.default_rng(0).random((side, side)) < 0.2).astype(np.uint8)
+    grid[0, :] = grid[-1, :] = grid[:, 0] = grid[:, -1] = 1
+    grid[1, 1] = grid[-2, -2] = 0
+    return grid
+
+
+def time_solve(grid: np.ndarray, backend: str, repeats: int) -> float:
+    """Returns the best wall-clock time (seconds) of a corner-to-corner solve."""
+    solver = MazeSolver(grid, backend=backend)
+    goal = (grid.shape[1] - 2, grid.shape[0] - 2)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        solver.solve((1, 1), goal)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(kinds: List[str], sides: List[int], repeats: int) -> None:
+    """Prints Python vs NumPy BFS times per grid and the first size where NumPy wins."""
+    print(f"{'grid':<8} {'side':>5} {'cells':>9} {'python (s)':>11} {'numpy (s)':>10} {'speedup':>8}")
+    print("-" * 56)
+    crossovers: Dict[str, str] = {}
+    for kind in kinds:
+        for side in sides:
+            grid = make_grid(kind, side)
+            python_time = time_solve(grid, "python", repeats)
+            numpy_time = time_solve(grid, "numpy", repeats)
+            if numpy_time < python_time:
+                crossovers.setdefault(kind, f"{side}x{side} ({grid.size:,} cells)")
+            print(
+                f"{kind:<8} {side:>5} {grid.size:>9,} {python_time:>11.4f} {numpy_time:>10.4f} "
+                f"{python_time / numpy_time:>7.2f}x"
+            )
+    print()
+    for kind in kinds:
+        print(f"NumPy first faster on '{kind}' grids at: {crossovers.get(kind, 'never')}")
+    print(f"Current auto-selection threshold: {VECTORIZED_BFS_MIN_CELLS:,} cells")
+
+
+# ==============================================================================
+# Script Execution
+# ==============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Python and NumPy BFS backends.")
+    parser.add_argument("--kinds", nargs="+", default=list(GRID_KINDS), choices=GRID_KINDS)
+    parser.add_argument("--sides", nargs="+", type=int, default=DEFAULT_SIDES)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    args = parser.parse_args()
+    run(args.kinds, args.sides, args.repeats)
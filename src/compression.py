@@ -0,0 +1,26 @@
+# src/compression.py
+
+import gzip
+
+try:  # Optional dependency: smaller than gzip for the repetitive JSON the API serves
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+# Content codings the server can produce, most preferred first
+CONTENT_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Encodes a response body with the given content coding ('br' or 'gzip').
+    The output is deterministic (gzip's timestamp is zeroed), so it can be cached by ETag.
+
+    Raises:
+        ValueError: If the coding is not available.
+    """
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(body, quality=5)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
@@ -0,0 +1,24 @@
+# src/fast_json.py
+
+import json
+from typing import Any, Union
+
+try:  # Optional dependency: several times faster than the stdlib on large grids
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Name of the decoder in use, reported for diagnostics
+JSON_DECODER = "orjson" if orjson is not None else "json"
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Parses a JSON document with orjson when it is installed, else with the stdlib decoder.
+
+    Raises:
+        ValueError: If the document is malformed (both decoders' errors subclass it).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,520 @@
+# src/leaderboard_log.py
+
+import bisect
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from operator import itemgetter
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, a single process is assumed
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def score_time(entry: Dict[str, Any]) -> float:
+    """Sort key for leaderboard entries: fastest time first, entries without a time last."""
+    return entry.get("time", float("inf"))
+
+
+def entry_tiebreak(entry: Dict[str, Any]) -> int:
+    """
+    Tiebreak for entries with equal times: a 64-bit hash of the entry's content, so it is
+    the same in every process and survives reloads and compactions.
+    """
+    content = json.dumps(entry, sort_keys=True).encode()
+    return int.from_bytes(hashlib.blake2b(content, digest_size=8).digest(), "big")
+
+
+# In memory every score is a (time, tiebreak, entry) row; (time, tiebreak) gives the rows
+# a total order (up to exact duplicates) usable as a pagination key.
+_row_key = itemgetter(0, 1)
+
+
+class _PendingScore:
+    """A score waiting for the group-commit writer, and the outcome it reports back."""
+
+    __slots__ = ("entry", "done", "ranks", "error")
+
+    def __init__(self, entry: Dict[str, Any]):
+        self.entry = entry
+        self.done = threading.Event()
+        self.ranks: Optional[Tuple[int, int]] = None
+        self.error: Optional[Exception] = None
+
+
+class LeaderboardLog:
+    """
+    Leaderboard storage as a snapshot plus an append-only log.
+
+    The snapshot ('leaderboard.json') is the same JSON list, sorted by time with indent=4,
+    that archive_leaderboard.py copies. Scores submitted since the last compaction are
+    appended to a JSON-lines log next to it, so adding a score is one small write instead
+    of rewriting the whole file. All scores are kept in memory in time order, overall and
+    per dimension, so a page of the leaderboard is a bisect and a slice; 'compact' folds
+    the log into a new snapshot, either on demand or from a background thread.
+
+    The first log line records how many entries the snapshot held when the log was
+    started, so a crash between replacing the snapshot and resetting the log never
+    replays already-folded scores.
+
+    Several processes may share the files (e.g. gunicorn workers). Appends and compactions
+    hold an exclusive flock on '<snapshot>.lock', and reads stat both files: lines other
+    processes appended are read from the byte offset this instance has applied up to, and
+    only a new snapshot or log file (after a compaction) triggers a full reload, so every
+    process sees every score without re-reading the whole leaderboard per submission.
+
+    With a group-commit window, 'start' also runs a writer thread: scores arriving within
+    the window are appended with one write, one lock round trip and one fsync, and each
+    'add' call returns once its batch is on disk.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str,
+        log_path: Optional[str] = None,
+        fsync: bool = False,
+        group_commit_window: float = 0.0,
+    ):
+        """
+        Initializes the log; nothing is read until 'load' (or the first access).
+
+        Args:
+            snapshot_path: Path of the JSON snapshot (e.g. data/leaderboard.json).
+            log_path: Path of the JSON-lines log (defaults to the snapshot path with a
+                '.log.jsonl' extension).
+            fsync: Whether to fsync the log after every appended batch of scores.
+            group_commit_window: Seconds the writer thread waits for more scores before
+                appending a batch (0 = no writer thread, every 'add' writes directly).
+        """
+        self.snapshot_path = snapshot_path
+        self.log_path = log_path or os.path.splitext(snapshot_path)[0] + ".log.jsonl"
+        self.lock_path = snapshot_path + ".lock"
+        self.fsync = fsync
+        self.group_commit_window = group_commit_window
+        self._lock = threading.Lock()  # Guards the in-memory state
+        self._write_lock = threading.Lock()  # In-process half of '_exclusive'
+        self._queue: Deque[_PendingScore] = deque()
+        self._queue_condition = threading.Condition()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_running = False
+        self._scores: List[tuple] = []  # (time, tiebreak, entry) rows sorted by (time, tiebreak)
+        self._by_dimension: Dict[Any, List[tuple]] = {}
+        self._pending: List[str] = []  # Serialized log lines not yet in the snapshot
+        self._log_file = None
+        self._loaded = False
+        self._files = None  # (snapshot, log) stat signature matching the in-memory state
+        self._log_offset = 0  # Bytes of the log already applied to the in-memory state
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.compactions: int = 0
+        self.batches: int = 0
+        self.reloads: int = 0
+
+    # --- Loading ---
+
+    @staticmethod
+    def _stat(path: str):
+        """Returns (inode, size, mtime) of a file, or None if it does not exist."""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def _file_signature(self):
+        return self._stat(self.snapshot_path), self._stat(self.log_path)
+
+    def _read_snapshot(self) -> List[Dict[str, Any]]:
+        """Reads the snapshot list; a missing, empty or invalid file counts as empty."""
+        try:
+            with open(self.snapshot_path, "r") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return []
+        except OSError as e:
+            logger.error(f"Error loading leaderboard from '{self.snapshot_path}': {e}")
+            return []
+        if not content.strip():
+            return []
+        try:
+            scores = json.loads(content)
+        except json.JSONDecodeError as e:
+            logger.error(f"Error loading leaderboard from '{self.snapshot_path}': {e}")
+            return []
+        return scores if isinstance(scores, list) else []
+
+    def _read_log(self, offset: int = 0):
+        """
+        Reads the log from byte 'offset' and returns (snapshot entry count from the header or
+        None, logged entries, raw lines, offset after the last complete line). A trailing
+        line without a newline is still being written (or was torn by a crash) and is left
+        for a later read.
+        """
+        base, entries, lines = None, [], []
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(offset)
+                content = f.read()
+        except FileNotFoundError:
+            return base, entries, lines, 0
+        complete = content.rfind(b"\n") + 1
+        for number, raw_line in enumerate(content[:complete].splitlines(), start=1):
+            line = raw_line.decode("utf-8", errors="replace")
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping unreadable line in '{self.log_path}'")
+                continue
+            if not isinstance(record, dict):
+                continue
+            if offset == 0 and number == 1 and "snapshot_entries" in record:
+                base = record["snapshot_entries"]
+                continue
+            entries.append(record)
+            lines.append(line)
+        return base, entries, lines, offset + complete
+
+    def load(self) -> None:
+        """Rebuilds the in-memory leaderboard from the snapshot and the log."""
+        with self._lock:
+            self._load_locked()
+
+    def _load_locked(self) -> None:
+        files = self._file_signature()  # Taken first: a change during the read forces a reload
+        snapshot = self._read_snapshot()
+        base, entries, lines, self._log_offset = self._read_log()
+        # Skip log entries a crashed compaction already folded into the snapshot. If the
+        # snapshot was changed by someone else (e.g. an archive reset), replay everything.
+        folded = len(snapshot) - base if base is not None else 0
+        if not 0 <= folded <= len(entries):
+            folded = 0
+        self._scores = []
+        self._by_dimension = {}
+        for entry in snapshot + entries[folded:]:
+            self._scores.append((score_time(entry), entry_tiebreak(entry), entry))
+        self._scores.sort(key=_row_key)
+        for row in self._scores:
+            self._by_dimension.setdefault(row[2].get("dimension"), []).append(row)
+        self._pending = lines[folded:]
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        self._loaded = True
+        self._files = files
+        self.reloads += 1
+        logger.info(
+            f"Leaderboard loaded: {len(snapshot)} snapshot and {len(self._pending)} logged scores."
+        )
+
+    def _ensure_loaded(self) -> None:
+        """
+        Loads on first use and catches up if the files changed behind our back (lock held).
+        Lines other processes appended to the same log are read from where this instance
+        left off; only a new snapshot or log file (a compaction or reset) forces a reload.
+        """
+        if not self._loaded:
+            self._load_locked()
+            return
+        files = self._file_signature()
+        if files == self._files:
+            return
+        snapshot, log = files
+        known_snapshot, known_log = self._files
+        if (
+            snapshot != known_snapshot
+            or log is None
+            or known_log is None
+            or log[0] != known_log[0]
+            or log[1] < self._log_offset
+        ):
+            self._load_locked()
+            return
+        _, entries, lines, self._log_offset = self._read_log(self._log_offset)
+        for entry in entries:
+            self._insert(entry)
+        self._pending.extend(lines)
+        self._files = files
+
+    def _insert(self, entry: Dict[str, Any]) -> Tuple[int, int]:
+        """
+        Adds an entry to the overall and per-dimension sorted lists and returns its 1-based
+        (overall, per-dimension) rank, counting it after existing equal times (lock held).
+        """
+        row = (score_time(entry), entry_tiebreak(entry), entry)
+        by_dimension = self._by_dimension.setdefault(entry.get("dimension"), [])
+        for rows in (self._scores, by_dimension):
+            rows.insert(bisect.bisect_right(rows, row[:2], key=_row_key), row)
+        time_key = itemgetter(0)
+        return (
+            bisect.bisect_right(self._scores, row[0], key=time_key),
+            bisect.bisect_right(by_dimension, row[0], key=time_key),
+        )
+
+    # --- Reading & Writing ---
+
+    def scores(self) -> List[Dict[str, Any]]:
+        """Returns a copy of all scores, sorted by time."""
+        with self._lock:
+            self._ensure_loaded()
+            return [entry for _, _, entry in self._scores]
+
+    def page(
+        self, dimension: Optional[int], limit: int, after: Optional[Tuple[float, int]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[float, int]]]:
+        """
+        Returns up to 'limit' scores sorted by time, for one dimension or all (None),
+        starting after the (time, tiebreak) key 'after', plus the key to continue from (None
+        on the last page). Exact duplicates share a key, so a page never ends between them
+        and may then hold more than 'limit' scores.
+        """
+        if limit <= 0:
+            raise ValueError("Page limit must be positive")
+        with self._lock:
+            self._ensure_loaded()
+            rows = self._scores if dimension is None else self._by_dimension.get(dimension, [])
+            start = 0 if after is None else bisect.bisect_right(rows, after, key=_row_key)
+            end = min(start + limit, len(rows))
+            while end < len(rows) and _row_key(rows[end]) == _row_key(rows[end - 1]):
+                end += 1
+            next_after = _row_key(rows[end - 1]) if end < len(rows) else None
+            return [entry for _, _, entry in rows[start:end]], next_after
+
+    def rank(self, time: float, dimension: Optional[int] = None) -> int:
+        """
+        Returns the 1-based rank a new score with 'time' would get, overall or within
+        'dimension' (it would rank after existing scores with the same time).
+        """
+        with self._lock:
+            self._ensure_loaded()
+            rows = self._scores if dimension is None else self._by_dimension.get(dimension, [])
+            return bisect.bisect_right(rows, time, key=itemgetter(0)) + 1
+
+    def version(self) -> str:
+        """
+        Returns a token that changes whenever the scores change (reloading if needed). It is
+        derived from the files' inode, size and mtime, so every process sharing the files
+        reports the same token for the same leaderboard.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            return hashlib.blake2b(repr(self._files).encode(), digest_size=8).hexdigest()
+
+    def pending(self) -> int:
+        """Returns how many scores are in the log but not yet in the snapshot."""
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._pending)
+
+    @contextmanager
+    def _exclusive(self):
+        """Holds the in-process write lock and the cross-process lock file."""
+        with self._write_lock:
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(fd)  # Also releases the flock
+
+    def add(self, entry: Dict[str, Any]) -> Tuple[int, int]:
+        """
+        Appends one score to the log and the in-memory leaderboard and returns its 1-based
+        (overall, per-dimension) rank. With the group-commit writer running, the score is
+        handed to it and this waits until its batch has been written.
+
+        Raises:
+            OSError: If the log cannot be written; the score is then not added.
+        """
+        pending = _PendingScore(entry)
+        with self._queue_condition:
+            if not self._writer_running:
+                return self._commit([entry])[0]
+            self._queue.append(pending)
+            self._queue_condition.notify()
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.ranks
+
+    def _commit(self, entries: List[Dict[str, Any]]) -> List[Tuple[int, int]]:
+        """Appends a batch of scores with one write (and fsync) under the exclusive lock."""
+        lines = [json.dumps(entry) for entry in entries]
+        with self._exclusive():
+            with self._lock:
+                self._ensure_loaded()  # Pick up whatever other processes wrote first
+                if self._log_file is None:
+                    self._open_log()
+                data = "".join(line + "\n" for line in lines)
+                if os.fstat(self._log_file.fileno()).st_size > self._log_offset:
+                    # Nobody else can be appending, so that is a line torn by a crash:
+                    # terminate it so it cannot swallow this batch's first line
+                    data = "\n" + data
+                self._log_file.write(data)
+                self._log_file.flush()
+                if self.fsync:
+                    os.fsync(self._log_file.fileno())
+                self._pending.extend(lines)
+                ranks = [self._insert(entry) for entry in entries]
+                self._log_offset = os.fstat(self._log_file.fileno()).st_size
+                self._files = self._file_signature()
+                self.batches += 1
+        return ranks
+
+    def _open_log(self) -> None:
+        """Opens the log for appending, rewriting it with a header if it is new (lock held)."""
+        if not os.path.exists(self.log_path):
+            self._write_log(len(self._scores) - len(self._pending), self._pending)
+            self._log_offset = os.path.getsize(self.log_path)
+            self._files = self._file_signature()
+        self._log_file = open(self.log_path, "a")
+
+    def _write_log(self, snapshot_entries: int, lines: List[str]) -> None:
+        """Atomically replaces the log with a header and the given lines."""
+        temp_file = f"{self.log_path}.{os.getpid()}.tmp"
+        with open(temp_file, "w") as f:
+            f.write(json.dumps({"snapshot_entries": snapshot_entries}) + "\n")
+            for line in lines:
+                f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.log_path)
+
+    # --- Compaction ---
+
+    def compact(self) -> bool:
+        """
+        Folds the log into a new snapshot. Returns False if there was nothing to fold.
+        Appends (from any process) wait for the exclusive lock until it is done.
+
+        Raises:
+            OSError: If the snapshot or the log cannot be rewritten.
+        """
+        with self._exclusive():
+            with self._lock:
+                self._ensure_loaded()
+                if not self._pending and os.path.exists(self.snapshot_path):
+                    return False
+                scores = [entry for _, _, entry in self._scores]
+
+            temp_file = f"{self.snapshot_path}.{os.getpid()}.tmp"
+            try:
+                with open(temp_file, "w") as f:
+                    json.dump(scores, f, indent=4)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_file, self.snapshot_path)
+            finally:
+                if os.path.exists(temp_file):
+                    os.remove(temp_file)
+
+            with self._lock:
+                if self._log_file is not None:
+                    self._log_file.close()
+                    self._log_file = None
+                self._write_log(len(scores), [])
+                self._log_offset = os.path.getsize(self.log_path)
+                self._pending = []
+                self._files = self._file_signature()
+                self.compactions += 1
+        logger.info(f"Leaderboard compacted: {len(scores)} scores in snapshot.")
+        return True
+
+    def start(self, interval: float) -> None:
+        """
+        Starts a background thread compacting every 'interval' seconds and, with a
+        group-commit window, the writer thread (no-op if already running).
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(interval,), name="leaderboard-compactor", daemon=True
+            )
+            self._thread.start()
+            if self.group_commit_window > 0:
+                with self._queue_condition:
+                    self._writer_running = True
+                self._writer = threading.Thread(
+                    target=self._run_writer, name="leaderboard-writer", daemon=True
+                )
+                self._writer.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the background threads and waits up to 'timeout' seconds for each to exit.
+        Scores already queued for the writer are still written.
+        """
+        self._stop_event.set()
+        with self._queue_condition:
+            self._writer_running = False
+            self._queue_condition.notify_all()
+        for thread in (self._thread, self._writer):
+            if thread is not None:
+                thread.join(timeout)
+
+    def _run(self, interval: float) -> None:
+        """Compactor loop; stop() interrupts the wait between compactions."""
+        while not self._stop_event.wait(interval):
+            try:
+                if self.pending():
+                    self.compact()
+            except Exception:
+                logger.exception("Leaderboard compaction failed", exc_info=True)
+
+    def _run_writer(self) -> None:
+        """Group-commit loop: waits for a score, lets the window fill, commits the batch."""
+        while True:
+            with self._queue_condition:
+                while not self._queue and self._writer_running:
+                    self._queue_condition.wait()
+                if not self._queue:
+                    return  # Stopped and drained
+            # Let concurrent submissions join the batch; stop() cuts the wait short
+            self._stop_event.wait(self.group_commit_window)
+            with self._queue_condition:
+                batch = list(self._queue)
+                self._queue.clear()
+            try:
+                ranks = self._commit([pending.entry for pending in batch])
+                for pending, entry_ranks in zip(batch, ranks):
+                    pending.ranks = entry_ranks
+            except Exception as e:
+                logger.exception(f"Failed to write {len(batch)} leaderboard scores", exc_info=True)
+                for pending in batch:
+                    pending.error = e
+            finally:
+                for pending in batch:
+                    pending.done.set()
+
+    def close(self) -> None:
+        """Stops the background threads and closes the log file."""
+        self.stop()
+        with self._lock:
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the backend name, entry counts and compaction statistics."""
+        with self._lock:
+            return {
+                "backend": "json",
+                "entries": len(self._scores),
+                "pending": len(self._pending),
+                "compactions": self.compactions,
+                "write_batches": self.batches,
+                "reloads": self.reloads,
+                "compactor_running": self._thread is not None and self._thread.is_alive(),
+            }
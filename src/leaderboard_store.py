@@ -0,0 +1,243 @@
+# src/leaderboard_store.py
+
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.leaderboard_log import LeaderboardLog
+
+logger = logging.getLogger(__name__)
+
+# Leaderboard storage backends selectable with app.config["LEADERBOARD_BACKEND"]:
+#   "json"   - LeaderboardLog: data/leaderboard.json snapshot plus an append-only log
+#   "sqlite" - SqliteLeaderboard: an indexed SQLite table (WAL mode)
+# Every backend provides the same methods:
+#   scores()                -> all entries sorted by time
+#   page(dimension, limit, after)
+#                           -> up to 'limit' entries by time for one dimension (None = all)
+#                              after the (time, tiebreak) key 'after', and the key of the
+#                              last entry if more follow (keyset pagination)
+#   add(entry)              -> stores one {name, time, dimension, timestamp} entry and returns
+#                              its (overall, per-dimension) rank (OSError if not writable)
+#   rank(time, dimension)   -> the rank a new score with 'time' would get (ties rank after
+#                              existing scores), overall or within one dimension
+#   version()               -> a token that changes whenever the scores change and is the
+#                              same in every process for the same scores
+#   stats(), close()
+LEADERBOARD_BACKENDS = ("json", "sqlite")
+
+
+def iter_scores(
+    store, dimension: Optional[int] = None, since: Optional[str] = None, batch_size: int = 1000
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yields a backend's scores by time, for one dimension or all, fetching them page by page
+    with keyset cursors so memory stays bounded by 'batch_size' whatever the leaderboard's
+    size. Scores added while iterating are picked up if they sort after the current page.
+    'since' keeps only scores whose "YYYY-MM-DDTHH:MM:SSZ" timestamp is not earlier.
+    """
+    after = None
+    while True:
+        entries, after = store.page(dimension, batch_size, after)
+        for entry in entries:
+            if since is None or str(entry.get("timestamp", "")) >= since:
+                yield entry
+        if after is None:
+            return
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    time REAL NOT NULL,
+    dimension INTEGER NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_time ON scores (time, id);
+CREATE INDEX IF NOT EXISTS scores_dimension_time ON scores (dimension, time, id);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+_COLUMNS = ("name", "time", "dimension", "timestamp")
+
+
+class SqliteLeaderboard:
+    """
+    Leaderboard stored in a SQLite table with an index on (dimension, time), so the top
+    entries for a dimension are an index range scan regardless of table size.
+
+    Every operation borrows a connection from a small pool, so no two threads use one at
+    the same time and threads that come and go (one per request under the development
+    server) do not each leave a connection open. WAL mode lets readers run while a score
+    is being written. On first use an existing JSON leaderboard can be imported once
+    ('migrate_from').
+    """
+
+    def __init__(self, db_path: str, migrate_from: Optional[str] = None, pool_size: int = 8):
+        """
+        Opens (creating if needed) the database and runs the one-shot migration.
+
+        Args:
+            db_path: Path of the SQLite database file.
+            migrate_from: Path of a JSON leaderboard snapshot (its append-only log is
+                replayed too) to import if the database has never been migrated.
+            pool_size: How many idle connections are kept open for reuse; connections
+                opened beyond that by concurrent operations are closed after use.
+        """
+        self.db_path = db_path
+        self.pool_size = pool_size
+        self._idle: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        with self._connection() as connection:
+            connection.executescript(_SCHEMA)
+        if migrate_from is not None:
+            self._migrate(migrate_from)
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Lends an idle pooled connection (or a new one) for the duration of the block."""
+        with self._pool_lock:
+            connection = self._idle.pop() if self._idle else None
+        if connection is None:
+            # Pooled connections move between threads, but only one uses each at a time
+            connection = sqlite3.connect(self.db_path, timeout=10.0, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+        try:
+            yield connection
+        finally:
+            with self._pool_lock:
+                if len(self._idle) < self.pool_size:
+                    self._idle.append(connection)
+                    connection = None
+            if connection is not None:
+                connection.close()
+
+    def _migrate(self, snapshot_path: str) -> None:
+        """Imports the JSON leaderboard once; later opens skip it via the 'meta' table."""
+        with self._connection() as connection, connection:
+            if connection.execute("SELECT 1 FROM meta WHERE key = 'migrated_from'").fetchone():
+                return
+            rows = []
+            if os.path.exists(snapshot_path):
+                for entry in LeaderboardLog(snapshot_path).scores():
+                    try:
+                        rows.append(
+                            (
+                                str(entry["name"]),
+                                float(entry["time"]),
+                                int(entry["dimension"]),
+                                str(entry.get("timestamp", "")),
+                            )
+                        )
+                    except (KeyError, TypeError, ValueError):
+                        logger.warning(f"Skipping malformed leaderboard entry: {entry!r}")
+            connection.executemany(
+                "INSERT INTO scores (name, time, dimension, timestamp) VALUES (?, ?, ?, ?)", rows
+            )
+            connection.execute(
+                "INSERT INTO meta (key, value) VALUES ('migrated_from', ?)", (snapshot_path,)
+            )
+        logger.info(f"Migrated {len(rows)} leaderboard scores from '{snapshot_path}'.")
+
+    def _select(self, sql: str, params=()) -> List[Dict[str, Any]]:
+        with self._connection() as connection:
+            return [dict(zip(_COLUMNS, row)) for row in connection.execute(sql, params)]
+
+    def scores(self) -> List[Dict[str, Any]]:
+        """Returns all scores, sorted by time."""
+        return self._select("SELECT name, time, dimension, timestamp FROM scores ORDER BY time, id")
+
+    def page(
+        self, dimension: Optional[int], limit: int, after: Optional[Tuple[float, int]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[float, int]]]:
+        """
+        Returns up to 'limit' scores sorted by time, for one dimension or all (None),
+        starting after the (time, id) key 'after', plus the key to continue from (None on
+        the last page). Either way this is a range scan of the (dimension, time, id) or
+        (time, id) index.
+        """
+        if limit <= 0:
+            raise ValueError("Page limit must be positive")
+        conditions, params = [], []
+        if dimension is not None:
+            conditions.append("dimension = ?")
+            params.append(dimension)
+        if after is not None:
+            conditions.append("(time, id) > (?, ?)")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        with self._connection() as connection:
+            rows = connection.execute(
+                f"SELECT time, id, name, dimension, timestamp FROM scores {where}"
+                "ORDER BY time, id LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+        entries = [
+            {"name": name, "time": time, "dimension": dim, "timestamp": timestamp}
+            for time, _, name, dim, timestamp in rows[:limit]
+        ]
+        next_after = tuple(rows[limit - 1][:2]) if len(rows) > limit else None
+        return entries, next_after
+
+    def version(self) -> int:
+        """Returns the newest row id; scores are only ever inserted, so it tracks every change."""
+        with self._connection() as connection:
+            (latest,) = connection.execute("SELECT MAX(id) FROM scores").fetchone()
+        return latest or 0
+
+    @staticmethod
+    def _count_up_to(
+        connection: sqlite3.Connection, time: float, dimension: Optional[int]
+    ) -> int:
+        """Counts scores with a time <= 'time' (a count over an index range)."""
+        if dimension is None:
+            sql, params = "SELECT COUNT(*) FROM scores WHERE time <= ?", (time,)
+        else:
+            sql = "SELECT COUNT(*) FROM scores WHERE dimension = ? AND time <= ?"
+            params = (dimension, time)
+        (count,) = connection.execute(sql, params).fetchone()
+        return count
+
+    def rank(self, time: float, dimension: Optional[int] = None) -> int:
+        """Returns the 1-based rank a new score with 'time' would get."""
+        with self._connection() as connection:
+            return self._count_up_to(connection, time, dimension) + 1
+
+    def add(self, entry: Dict[str, Any]) -> Tuple[int, int]:
+        """
+        Inserts one score and returns its 1-based (overall, per-dimension) rank. The ranks
+        are counted in the inserting transaction, so concurrent writers cannot skew them.
+
+        Raises:
+            OSError: If the database cannot be written.
+        """
+        try:
+            with self._connection() as connection, connection:
+                connection.execute(
+                    "INSERT INTO scores (name, time, dimension, timestamp) VALUES (?, ?, ?, ?)",
+                    tuple(entry[column] for column in _COLUMNS),
+                )
+                # The new row has the largest id, so it sorts after every equal time
+                return (
+                    self._count_up_to(connection, entry["time"], None),
+                    self._count_up_to(connection, entry["time"], entry["dimension"]),
+                )
+        except sqlite3.Error as e:
+            raise OSError(f"Could not write score to '{self.db_path}': {e}") from e
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the backend name and entry count."""
+        with self._connection() as connection:
+            (count,) = connection.execute("SELECT COUNT(*) FROM scores").fetchone()
+        return {"backend": "sqlite", "entries": count}
+
+    def close(self) -> None:
+        """Closes the idle pooled connections (ones in use are closed or pooled when returned)."""
+        with self._pool_lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
@@ -0,0 +1,112 @@
+# src/lru_cache.py
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class LRUCache:
+    """
+    A thread-safe Least-Recently-Used cache bounded by entry count and total byte size.
+    Callers report each value's size on insertion; the cache evicts the least recently
+    used entries until both limits hold again. Hit/miss/eviction counters are kept for stats.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_entries: Maximum number of entries held at once.
+            max_bytes: Maximum sum of the reported sizes of all entries.
+        """
+        if max_entries < 0 or max_bytes < 0:
+            raise ValueError("Cache limits cannot be negative")
+        self.max_entries: int = max_entries
+        self.max_bytes: int = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Returns the cached value for 'key' (marking it most recently used), or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, key: Hashable, refresh: bool = False) -> Optional[Any]:
+        """
+        Returns the cached value for 'key', or None, without updating the hit/miss
+        counters; with 'refresh' the entry is also marked most recently used.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if refresh:
+                self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int) -> bool:
+        """
+        Stores 'value' under 'key', evicting old entries as needed.
+        Returns False (and stores nothing) if the value alone exceeds the byte limit.
+        """
+        if size > self.max_bytes or self.max_entries == 0:
+            return False
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            # Evict from the least recently used end until both limits hold
+            while len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+            return True
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Removes and returns the value for 'key' (None if absent) without touching counters."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self.current_bytes -= entry[1]
+            return entry[0]
+
+    def clear(self) -> None:
+        """Removes all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def keys(self) -> List[Hashable]:
+        """Returns a snapshot of the cached keys, least recently used first."""
+        with self._lock:
+            return list(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns a snapshot of the cache size and hit/miss/eviction counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,41 @@
+# src/maze_batch.py
+
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from src.maze_format import to_envelope
+from src.maze_generator import DEFAULT_ALGORITHM, Maze
+
+
+def generate_maze_line(
+    index: int,
+    dimension: int,
+    seed: Optional[int],
+    algorithm: str = DEFAULT_ALGORITHM,
+    fmt: str = "json",
+) -> str:
+    """
+    Generates one maze and serializes it as a single NDJSON line.
+    Runs inside a worker process, so both generation and JSON encoding happen off the
+    web server's GIL. 'fmt' is 'json' (list of lists) or 'packed' (base64 envelope).
+    """
+    maze = Maze(dimension, seed=seed)
+    maze.generate(algorithm)
+    payload = to_envelope(maze.grid) if fmt == "packed" else maze.grid.tolist()
+    record = {"index": index, "dimension": dimension, "seed": seed, "algorithm": algorithm, "maze": payload}
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def create_executor(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Creates the process pool used for batch generation, sized to the CPU count by default.
+    Workers are spawned rather than forked so they never inherit locks held by the
+    server's background threads.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers or os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
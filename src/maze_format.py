@@ -0,0 +1,84 @@
+# src/maze_format.py
+
+import base64
+from typing import Any, Dict, List, Union
+
+import numpy as np
+
+# Wire formats understood by the maze API:
+#   "json"   - list of lists of 0/1 (the original representation)
+#   "packed" - small JSON envelope with the bit-packed grid as base64
+#   "binary" - raw bit-packed bytes (application/octet-stream)
+MAZE_FORMATS = ("json", "packed", "binary")
+
+
+def pack_grid(grid: Union[np.ndarray, List[List[int]]]) -> bytes:
+    """
+    Bit-packs a 0/1 maze grid into bytes, one bit per grid cell.
+    Cells are stored row-major with the most significant bit first; the last byte is zero-padded.
+    """
+    return np.packbits(np.asarray(grid, dtype=np.uint8), axis=None).tobytes()
+
+
+def unpack_grid(data: bytes, rows: int, cols: int) -> np.ndarray:
+    """
+    Reverses 'pack_grid', returning a (rows, cols) uint8 grid.
+
+    Raises:
+        ValueError: If the byte length does not match the requested shape.
+    """
+    if rows <= 0 or cols <= 0:
+        raise ValueError("Packed grid dimensions must be positive.")
+    if len(data) != (rows * cols + 7) // 8:
+        raise ValueError("Packed grid length does not match its dimensions.")
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=rows * cols)
+    return bits.reshape(rows, cols)
+
+
+def to_envelope(grid: np.ndarray) -> Dict[str, Any]:
+    """Builds the JSON envelope for the 'packed' format."""
+    rows, cols = grid.shape
+    return {
+        "format": "packed",
+        "rows": int(rows),
+        "cols": int(cols),
+        "data": base64.b64encode(pack_grid(grid)).decode("ascii"),
+    }
+
+
+def from_envelope(envelope: Dict[str, Any]) -> np.ndarray:
+    """
+    Decodes a 'packed' JSON envelope back into a uint8 grid.
+
+    Raises:
+        ValueError: If the envelope is missing fields or its data is malformed.
+    """
+    try:
+        rows = int(envelope["rows"])
+        cols = int(envelope["cols"])
+        data = base64.b64decode(envelope["data"], validate=True)
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid packed maze envelope: {e}") from e
+    return unpack_grid(data, rows, cols)
+
+
+def grid_from_rows(rows: Any) -> np.ndarray:
+    """
+    Converts a "json"-format grid (list of lists of 0/1) into a contiguous uint8 array.
+    The work happens inside NumPy: one conversion builds the array (rejecting ragged rows
+    and non-numeric cells), and a min/max scan of it checks the 0/1 value domain.
+
+    Raises:
+        ValueError: If the grid is not a non-empty rectangular list of 0/1 integer rows.
+    """
+    if not isinstance(rows, list) or not rows:
+        raise ValueError("Maze must be a non-empty list of rows.")
+    try:
+        grid = np.array(rows)
+    except (ValueError, OverflowError):
+        raise ValueError("Maze rows must be lists of equal length.") from None
+    if grid.ndim != 2 or grid.shape[1] == 0:
+        raise ValueError("Maze rows must be non-empty lists of cells.")
+    if grid.dtype.kind not in "biu" or (grid.min() < 0 or grid.max() > 1):
+        raise ValueError("Maze cells must be 0 (passage) or 1 (wall).")
+    return np.ascontiguousarray(grid, dtype=np.uint8)
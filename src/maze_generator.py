@@ -1,30 +1,46 @@
 # src/maze_generator.py 
 
 import random
-from typing import List, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import numpy as np
 
 class DisjointSet:
     """
     A data structure implementing the Disjoint Set Union (DSU) or Union-Find algorithm.
     Used to track connectivity of cells during maze generation.
-    Optimized with Path Compression and Union by Rank.
+    Backed by int32 NumPy arrays, optimized with iterative Path Halving and Union by Rank.
     """
 
     def __init__(self, count: int):
         """Initializes 'count' disjoint sets."""
         if count < 0:
             raise ValueError("Number of elements cannot be negative")
-        self.parent: List[int] = list(range(count))
-        self.rank: List[int] = [0] * count
+        self.parent: np.ndarray = np.arange(count, dtype=np.int32)
+        self.rank: np.ndarray = np.zeros(count, dtype=np.int32)
 
     def find(self, x: int) -> int:
-        """Finds the representative (root) of the set containing element 'x' with path compression."""
-        if self.parent[x] == x:
-            return x
-        # Path compression: Point node directly to the root
-        self.parent[x] = self.find(self.parent[x])
-        return self.parent[x]
+        """Finds the representative (root) of the set containing element 'x' with path halving."""
+        parent = self.parent
+        while parent[x] != x:
+            # Path halving: Point every other node on the path to its grandparent
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return int(x)
+
+    def find_many(self, xs: np.ndarray) -> np.ndarray:
+        """
+        Vectorized 'find' for an array of elements.
+        Applies path halving to every element of 'xs' at once until all reach their roots.
+        """
+        parent = self.parent
+        xs = np.asarray(xs, dtype=np.int32)
+        while True:
+            px = parent[xs]
+            if np.array_equal(px, xs):
+                return xs
+            # Path halving for the whole batch in one step
+            parent[xs] = parent[px]
+            xs = parent[xs]
 
     def union(self, x: int, y: int) -> bool:
         """
@@ -49,88 +65,418 @@ class DisjointSet:
         return True
 
 
+# ==============================================================================
+# Generation Algorithm Registry
+# ==============================================================================
+
+# An algorithm takes (dimension, rng) and returns the walls to remove as two arrays of
+# cell indices (y * dimension + x). The removed walls must form a spanning tree.
+GenerationAlgorithm = Callable[[int, np.random.Generator], Tuple[np.ndarray, np.ndarray]]
+
+GENERATION_ALGORITHMS: Dict[str, GenerationAlgorithm] = {}
+DEFAULT_ALGORITHM = "kruskal"
+
+
+def register_algorithm(name: str) -> Callable[[GenerationAlgorithm], GenerationAlgorithm]:
+    """Decorator that adds a generation algorithm to GENERATION_ALGORITHMS under 'name'."""
+
+    def decorator(func: GenerationAlgorithm) -> GenerationAlgorithm:
+        if name in GENERATION_ALGORITHMS:
+            raise ValueError(f"Generation algorithm '{name}' is already registered.")
+        GENERATION_ALGORITHMS[name] = func
+        return func
+
+    return decorator
+
+
+def shuffled_walls(dimension: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Generates all potential interior walls between adjacent cells.
+    Each wall is represented by the indices (y * dimension + x) of the two cells it separates.
+    Returns two int32 arrays (first cells, second cells) in a random order.
+    """
+    d = dimension
+    cells = np.arange(d * d, dtype=np.int32).reshape(d, d)
+    # Horizontal walls (separating cells (y, x) and (y, x+1)),
+    # then vertical walls (separating cells (y, x) and (y+1, x))
+    first = np.concatenate((cells[:, :-1].ravel(), cells[:-1, :].ravel()))
+    second = np.concatenate((cells[:, 1:].ravel(), cells[1:, :].ravel()))
+
+    order = rng.permutation(first.size)  # Crucial for generating random mazes with Kruskal's
+    return first[order], second[order]
+
+
+def _python_random(rng: np.random.Generator) -> random.Random:
+    """
+    Derives a stdlib Random from 'rng' for algorithms that draw one number per step,
+    where Python's generator is much cheaper per call than NumPy's.
+    """
+    return random.Random(int(rng.integers(2**63)))
+
+
+@register_algorithm("kruskal")
+def kruskal(dimension: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Kruskal's algorithm with Disjoint Set Union.
+    A wall's position in the shuffled list acts as its weight, so the maze is the unique
+    minimum spanning tree of the cell grid. Instead of visiting walls one at a time, the
+    tree is built in Boruvka rounds: every connected region removes its lowest-weight wall
+    to a different region at once, which selects exactly the walls Kruskal's would.
+    """
+    num_cells = dimension * dimension
+    ds = DisjointSet(num_cells)
+    first, second = shuffled_walls(dimension, rng)
+    removed = np.zeros(first.size, dtype=bool)
+    # Candidate walls in weight order, with the current region root on each side
+    wall_ids = np.arange(first.size, dtype=np.int32)
+    root_a, root_b = first, second
+
+    while True:
+        # Drop walls whose cells are already connected; they can never be removed
+        crossing = root_a != root_b
+        wall_ids, root_a, root_b = wall_ids[crossing], root_a[crossing], root_b[crossing]
+        if not wall_ids.size:
+            break
+
+        # Lowest-weight (earliest shuffled) wall leaving each region
+        positions = np.arange(wall_ids.size, dtype=np.int32)
+        best = np.full(num_cells, wall_ids.size, dtype=np.int32)
+        np.minimum.at(best, root_a, positions)
+        np.minimum.at(best, root_b, positions)
+        roots = np.flatnonzero(best < wall_ids.size).astype(np.int32)
+        chosen = best[roots]
+        removed[wall_ids[chosen]] = True
+
+        # Link each region to the region across its chosen wall. Two regions that chose
+        # the same wall point at each other; the smaller index stays the root.
+        other = np.where(root_a[chosen] == roots, root_b[chosen], root_a[chosen])
+        mutual = (best[other] == chosen) & (roots < other)
+        ds.parent[roots] = np.where(mutual, roots, other)
+        ds.parent[roots] = ds.find_many(roots)
+
+        # Every wall endpoint is one of this round's roots, so one lookup relabels it
+        root_a, root_b = ds.parent[root_a], ds.parent[root_b]
+
+    return first[removed], second[removed]
+
+
+@register_algorithm("backtracker")
+def recursive_backtracker(
+    dimension: int, rng: np.random.Generator
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Recursive backtracker (randomized depth-first search), run iteratively with an explicit
+    stack. Produces long, winding corridors with few dead ends.
+    """
+    d = dimension
+    rand = _python_random(rng)
+    visited = bytearray(d * d)
+    first: List[int] = []
+    second: List[int] = []
+    start = rand.randrange(d * d)
+    visited[start] = 1
+    stack = [start]
+
+    while stack:
+        cell = stack[-1]
+        y, x = divmod(cell, d)
+        neighbors = []
+        if y > 0 and not visited[cell - d]:
+            neighbors.append(cell - d)
+        if y < d - 1 and not visited[cell + d]:
+            neighbors.append(cell + d)
+        if x > 0 and not visited[cell - 1]:
+            neighbors.append(cell - 1)
+        if x < d - 1 and not visited[cell + 1]:
+            neighbors.append(cell + 1)
+        if not neighbors:
+            stack.pop()  # Dead end: backtrack
+            continue
+        nxt = neighbors[rand.randrange(len(neighbors))]
+        visited[nxt] = 1
+        first.append(cell)
+        second.append(nxt)
+        stack.append(nxt)
+
+    return np.array(first, dtype=np.int32), np.array(second, dtype=np.int32)
+
+
+@register_algorithm("prim")
+def prim(dimension: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Randomized Prim's algorithm: grows the maze from one cell by repeatedly connecting a
+    random frontier cell to a random already-visited neighbour. Gives short, branchy passages.
+    """
+    d = dimension
+    rand = _python_random(rng)
+    IN_MAZE, FRONTIER = 1, 2
+    state = bytearray(d * d)
+    first: List[int] = []
+    second: List[int] = []
+    frontier: List[int] = []
+
+    def mark(cell: int) -> None:
+        """Adds 'cell' to the maze and its unvisited neighbours to the frontier."""
+        state[cell] = IN_MAZE
+        y, x = divmod(cell, d)
+        for nxt, ok in ((cell - d, y > 0), (cell + d, y < d - 1), (cell - 1, x > 0), (cell + 1, x < d - 1)):
+            if ok and state[nxt] == 0:
+                state[nxt] = FRONTIER
+                frontier.append(nxt)
+
+    mark(rand.randrange(d * d))
+    while frontier:
+        # Swap-remove a random frontier cell in O(1)
+        i = rand.randrange(len(frontier))
+        frontier[i], frontier[-1] = frontier[-1], frontier[i]
+        cell = frontier.pop()
+        y, x = divmod(cell, d)
+        neighbors = [
+            nxt
+            for nxt, ok in ((cell - d, y > 0), (cell + d, y < d - 1), (cell - 1, x > 0), (cell + 1, x < d - 1))
+            if ok and state[nxt] == IN_MAZE
+        ]
+        first.append(neighbors[rand.randrange(len(neighbors))])
+        second.append(cell)
+        mark(cell)
+
+    return np.array(first, dtype=np.int32), np.array(second, dtype=np.int32)
+
+
+@register_algorithm("wilson")
+def wilson(dimension: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Wilson's algorithm: loop-erased random walks from unvisited cells until they hit the maze.
+    Samples uniformly among all spanning trees (no directional bias), at the cost of slow
+    early walks on large grids.
+    """
+    d = dimension
+    n = d * d
+    rand = _python_random(rng)
+    in_maze = bytearray(n)
+    # next_step[cell] remembers the last exit taken from 'cell' during the current walk;
+    # following it from the walk's start gives the loop-erased path.
+    next_step = [0] * n
+    first: List[int] = []
+    second: List[int] = []
+    in_maze[rand.randrange(n)] = 1
+
+    for start in range(n):
+        if in_maze[start]:
+            continue
+        cell = start
+        while not in_maze[cell]:
+            y, x = divmod(cell, d)
+            while True:
+                direction = rand.randrange(4)
+                if direction == 0 and y > 0:
+                    nxt = cell - d
+                elif direction == 1 and y < d - 1:
+                    nxt = cell + d
+                elif direction == 2 and x > 0:
+                    nxt = cell - 1
+                elif direction == 3 and x < d - 1:
+                    nxt = cell + 1
+                else:
+                    continue
+                break
+            next_step[cell] = nxt
+            cell = nxt
+        # Carve the loop-erased walk into the maze
+        cell = start
+        while not in_maze[cell]:
+            in_maze[cell] = 1
+            first.append(cell)
+            second.append(next_step[cell])
+            cell = next_step[cell]
+
+    return np.array(first, dtype=np.int32), np.array(second, dtype=np.int32)
+
+
+@register_algorithm("binary_tree")
+def binary_tree(dimension: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Binary tree algorithm, fully vectorized: every cell opens its north or west wall at
+    random (top row always west, left column always north). Very fast, but has a strong
+    diagonal bias and open top row and left column.
+    """
+    d = dimension
+    cells = np.arange(d * d, dtype=np.int32).reshape(d, d)
+    go_north = rng.random((d, d)) < 0.5
+    go_north[0, :] = False  # Top row can only go west
+    go_north[:, 0] = True  # Left column can only go north
+    go_north = go_north.ravel()[1:]  # Cell (0, 0) opens nothing
+    targets = cells.ravel()[1:]
+    return np.where(go_north, targets - d, targets - 1), targets
+
+
+@register_algorithm("sidewinder")
+def sidewinder(dimension: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sidewinder algorithm, vectorized over the whole grid: each row is split into random
+    horizontal runs, and each run opens north from one random member. The top row is one
+    open corridor.
+    """
+    d = dimension
+    cells = np.arange(d * d, dtype=np.int32).reshape(d, d)
+    # Top row: a single corridor running east
+    first = [cells[0, :-1]]
+    second = [cells[0, 1:]]
+    if d > 1:
+        lower = cells[1:].ravel()
+        close_run = rng.random((d - 1, d)) < 0.5
+        close_run[:, -1] = True  # Runs always end at the east edge
+        close_run = close_run.ravel()
+        # Cells that continue their run open east
+        first.append(lower[~close_run])
+        second.append(lower[~close_run] + 1)
+        # Label runs, then pick one random member per run to open north
+        run_ids = np.cumsum(close_run) - close_run
+        order = np.lexsort((rng.random(lower.size), run_ids))
+        _, first_in_run = np.unique(run_ids[order], return_index=True)
+        openers = lower[order[first_in_run]]
+        first.append(openers - d)
+        second.append(openers)
+    return np.concatenate(first), np.concatenate(second)
+
+
+# ==============================================================================
+# Maze
+# ==============================================================================
+
+
 class Maze:
     """
-    Generates a perfect maze using a grid graph and Kruskal's algorithm with Disjoint Set Union.
+    Generates a perfect maze using a grid graph and a registered generation algorithm
+    (Kruskal's algorithm with Disjoint Set Union by default).
     A perfect maze has no loops and all cells are reachable from any other cell.
     Grid representation: 1=Wall, 0=Passage.
     """
 
-    def __init__(self, dimension: int):
+    def __init__(self, dimension: int, seed: Optional[int] = None):
         """
         Initializes the maze grid structure based on the desired cell dimension.
         The grid size will be (2*dimension + 1) to accommodate walls between cells.
 
         Args:
             dimension (int): The number of cells along one side of the maze (e.g., 5 for a 5x5 cell maze).
+            seed (Optional[int]): Seed for this maze's random generator. The same dimension and
+                seed always produce the same maze; None draws fresh entropy.
         """
         if dimension <= 0:
             raise ValueError("Maze dimension must be positive.")
+        if seed is not None and seed < 0:
+            raise ValueError("Maze seed cannot be negative.")
         self.dimension: int = dimension
+        self.seed: Optional[int] = seed
         self.grid_size: int = 2 * dimension + 1
+        self.rng: np.random.Generator = np.random.default_rng(seed)
         # Initialize grid with all walls (1)
-        self.grid: np.ndarray = np.ones((self.grid_size, self.grid_size), dtype=int)
+        self.grid: np.ndarray = np.ones((self.grid_size, self.grid_size), dtype=np.uint8)
         self._initialize_passages()
 
     def _initialize_passages(self) -> None:
         """Marks the internal grid locations corresponding to cell centers as passages (0)."""
         # Cell centers are at odd grid coordinates (e.g., (1,1), (1,3), (3,1))
-        for y in range(self.dimension):
-            for x in range(self.dimension):
-                self.grid[2 * y + 1, 2 * x + 1] = 0
+        self.grid[1::2, 1::2] = 0
 
-    def _get_walls(self) -> List[Tuple[int, int, int, int]]:
-        """
-        Generates a list of all potential interior walls between adjacent cells.
-        Each wall is represented by the coordinates of the two cells it separates.
-        Returns the list of walls shuffled randomly.
-        """
-        walls: List[Tuple[int, int, int, int]] = []
-        # Horizontal walls (separating cells (y, x) and (y, x+1))
-        for y in range(self.dimension):
-            for x in range(self.dimension - 1):
-                walls.append((y, x, y, x + 1))
-        # Vertical walls (separating cells (y, x) and (y+1, x))
-        for y in range(self.dimension - 1):
-            for x in range(self.dimension):
-                walls.append((y, x, y + 1, x))
-
-        random.shuffle(walls)  # Crucial for generating random mazes with Kruskal's
-        return walls
-
-    def generate(self) -> None:
+    def _get_walls(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns all interior walls as shuffled cell-index arrays (see 'shuffled_walls')."""
+        return shuffled_walls(self.dimension, self.rng)
+
+    def generate(self, algorithm: str = DEFAULT_ALGORITHM) -> None:
         """
-        Generates the maze structure using Kruskal's algorithm.
-        Iterates through shuffled walls, removing a wall (making it a passage)
-        if the cells it separates are not already connected, until all cells are connected.
+        Generates the maze structure with the named algorithm from GENERATION_ALGORITHMS.
+
+        Raises:
+            ValueError: If 'algorithm' is not registered.
         """
-        # Map each cell (y, x) to a unique index for DSU: index = y * dimension + x
-        num_cells = self.dimension * self.dimension
-        if num_cells == 0:  # Handle edge case of 0 dimension (though prevented by init)
+        if algorithm not in GENERATION_ALGORITHMS:
+            raise ValueError(f"Unknown generation algorithm: {algorithm}")
+        # Map each cell (y, x) to a unique index: index = y * dimension + x
+        if self.dimension * self.dimension <= 1:  # A single cell has no interior walls to remove
             return
-        ds = DisjointSet(num_cells)
-        walls = self._get_walls()
+        first, second = GENERATION_ALGORITHMS[algorithm](self.dimension, self.rng)
 
-        num_edges_added = 0
-        # A spanning tree on V vertices needs exactly V-1 edges.
-        target_edges = num_cells - 1
+        # Convert cell indices to grid coordinates of the walls between them
+        y1, x1 = np.divmod(first, self.dimension)
+        y2, x2 = np.divmod(second, self.dimension)
+        self.grid[y1 + y2 + 1, x1 + x2 + 1] = 0  # Mark walls as passages (remove walls)
 
-        for y1, x1, y2, x2 in walls:
-            # Stop early if the maze is fully connected
-            if num_edges_added >= target_edges:
-                break
+    def to_list(self) -> List[List[int]]:
+        """Converts the internal numpy grid to a standard Python list of lists."""
+        return self.grid.tolist()
 
-            cell1_idx = y1 * self.dimension + x1
-            cell2_idx = y2 * self.dimension + x2
 
-            # If uniting the sets is successful (i.e., cells were disconnected)
-            if ds.union(cell1_idx, cell2_idx):
-                # Convert cell coordinates to grid coordinates of the wall between them
-                wall_y = y1 + y2 + 1
-                wall_x = x1 + x2 + 1
-                self.grid[wall_y, wall_x] = 0  # Mark wall as passage (remove wall)
-                num_edges_added += 1
+def generate_eller_rows(
+    dimension: int, rows: Optional[int] = None, seed: Optional[int] = None
+) -> Iterator[np.ndarray]:
+    """
+    Streams a perfect maze one grid row at a time using Eller's algorithm.
+    Only the current row of cells is held in memory, so memory is O(dimension) no matter
+    how many rows are produced. Yields (2*rows + 1) uint8 arrays of length (2*dimension + 1),
+    top to bottom, using the same 1=Wall, 0=Passage representation as Maze.grid.
 
-    def to_list(self) -> List[List[int]]:
-        """Converts the internal numpy grid to a standard Python list of lists."""
-        return self.grid.tolist()
\ No newline at end of file
+    Args:
+        dimension (int): Number of cells per row (maze width).
+        rows (Optional[int]): Number of cell rows (maze height); defaults to 'dimension'.
+        seed (Optional[int]): Seed for the random generator, for reproducible streams.
+    """
+    height = dimension if rows is None else rows
+    if dimension <= 0 or height <= 0:
+        raise ValueError("Maze dimensions must be positive.")
+    if seed is not None and seed < 0:
+        raise ValueError("Maze seed cannot be negative.")
+    rng = np.random.default_rng(seed)
+    width = dimension
+    grid_width = 2 * width + 1
+
+    yield np.ones(grid_width, dtype=np.uint8)  # Top boundary wall
+
+    # Set label of every cell in the current row, normalized to 0..width-1
+    sets = np.arange(width)
+    for y in range(height):
+        is_last_row = y == height - 1
+        cell_row = np.ones(grid_width, dtype=np.uint8)
+        cell_row[1::2] = 0
+
+        # Join horizontally adjacent cells from different sets (all of them on the last row)
+        parent = list(range(width))
+        labels = sets.tolist()
+        joins = np.ones(width - 1, dtype=bool) if is_last_row else rng.random(width - 1) < 0.5
+        for x in np.flatnonzero(joins).tolist():
+            a, b = labels[x], labels[x + 1]
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            while parent[b] != b:
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+            if a != b:
+                parent[b] = a
+                cell_row[2 * x + 2] = 0
+        for x in range(width):
+            label = labels[x]
+            while parent[label] != label:
+                label = parent[label]
+            labels[x] = label
+        yield cell_row
+
+        if is_last_row:
+            break
+
+        # Carry every set down at least once: one random member per set plus random extras
+        sets = np.asarray(labels)
+        order = rng.permutation(width)
+        _, first_seen = np.unique(sets[order], return_index=True)
+        carry = rng.random(width) < 0.5
+        carry[order[first_seen]] = True
+        wall_row = np.ones(grid_width, dtype=np.uint8)
+        wall_row[2 * np.flatnonzero(carry) + 1] = 0
+        yield wall_row
+
+        # Carried cells keep their set; the rest start fresh sets, then relabel compactly
+        sets = np.where(carry, sets, width + np.arange(width))
+        _, sets = np.unique(sets, return_inverse=True)
+
+    yield np.ones(grid_width, dtype=np.uint8)  # Bottom boundary wall
@@ -0,0 +1,140 @@
+# src/maze_pool.py
+
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class MazePool:
+    """
+    Keeps a warm pool of ready-made items (e.g. serialized maze responses) per key.
+    A single background worker tops every key up to 'depth' items, refilling as items are
+    taken. 'take' never blocks: it returns None when a key's pool is empty so the caller
+    can fall back to building the item inline.
+    """
+
+    def __init__(
+        self,
+        keys: Iterable[Hashable],
+        factory: Callable[[Hashable], Any],
+        depth: int,
+        refill_per_second: float = 0.0,
+        error_backoff: float = 1.0,
+    ):
+        """
+        Initializes an empty, stopped pool.
+
+        Args:
+            keys: The keys to keep warm (e.g. (dimension, format) pairs).
+            factory: Builds one new item for a key; called on the worker thread.
+            depth: Target number of ready items per key.
+            refill_per_second: Maximum items built per second (0 = as fast as possible).
+            error_backoff: Seconds to pause after the factory raises.
+        """
+        if depth < 0:
+            raise ValueError("Pool depth cannot be negative")
+        if refill_per_second < 0:
+            raise ValueError("Refill rate cannot be negative")
+        self.factory = factory
+        self.depth: int = depth
+        self.refill_per_second: float = refill_per_second
+        self.error_backoff: float = error_backoff
+        self._pools: Dict[Hashable, Deque[Any]] = {key: deque() for key in keys}
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.hits: int = 0
+        self.misses: int = 0
+        self.generated: int = 0
+        self.errors: int = 0
+
+    def start(self) -> None:
+        """Starts the background refill worker (no-op if already running)."""
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="maze-pool", daemon=True)
+            self._thread.start()
+        logger.info(f"Maze pool started (depth {self.depth} for {len(self._pools)} keys).")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Signals the worker to stop and waits up to 'timeout' seconds for it to exit."""
+        with self._condition:
+            self._stop_event.set()
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def take(self, key: Hashable) -> Optional[Any]:
+        """
+        Pops a ready item for 'key', or returns None if the pool is empty (a miss) or the
+        key is not pooled at all (not counted).
+        """
+        with self._condition:
+            pool = self._pools.get(key)
+            if pool is None:
+                return None
+            if not pool:
+                self.misses += 1
+                self._condition.notify_all()  # Make sure the worker is refilling
+                return None
+            self.hits += 1
+            item = pool.popleft()
+            self._condition.notify_all()
+            return item
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns per-key pool depths and hit/miss/refill counters."""
+        with self._condition:
+            return {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "target_depth": self.depth,
+                "refill_per_second": self.refill_per_second,
+                "depths": {str(key): len(pool) for key, pool in self._pools.items()},
+                "hits": self.hits,
+                "misses": self.misses,
+                "generated": self.generated,
+                "errors": self.errors,
+            }
+
+    def _next_key_to_fill(self) -> Optional[Hashable]:
+        """Returns the key with the fewest ready items below target depth (lock held)."""
+        key, pool = min(self._pools.items(), key=lambda kv: len(kv[1]), default=(None, None))
+        if pool is None or len(pool) >= self.depth:
+            return None
+        return key
+
+    def _run(self) -> None:
+        """Worker loop: build items for the emptiest key until every pool is full, then wait."""
+        interval = 1.0 / self.refill_per_second if self.refill_per_second else 0.0
+        while True:
+            with self._condition:
+                key = self._next_key_to_fill()
+                while key is None and not self._stop_event.is_set():
+                    self._condition.wait()
+                    key = self._next_key_to_fill()
+                if self._stop_event.is_set():
+                    return
+
+            try:
+                item = self.factory(key)
+            except Exception:
+                logger.exception(f"Maze pool failed to build item for {key}", exc_info=True)
+                with self._condition:
+                    self.errors += 1
+                # Back off briefly so a persistent failure does not spin the CPU
+                if self._stop_event.wait(self.error_backoff):
+                    return
+                continue
+
+            with self._condition:
+                self._pools[key].append(item)
+                self.generated += 1
+            # Rate limit refills; stop() interrupts the pause
+            if interval and self._stop_event.wait(interval):
+                return
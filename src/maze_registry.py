@@ -0,0 +1,159 @@
+# src/maze_registry.py
+
+import hashlib
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.lru_cache import LRUCache
+from src.maze_solver import MazeSolver
+from src.maze_tree_index import MazeTreeIndex
+
+
+def content_id(grid: np.ndarray) -> str:
+    """
+    Returns a stable id for a maze grid: a BLAKE2b digest of its dtype, shape and raw cell
+    bytes. The bytes are hashed straight from the array's buffer (no per-cell Python work),
+    so hashing costs far less than solving.
+    """
+    grid = np.ascontiguousarray(grid)
+    digest = hashlib.blake2b(grid.dtype.str.encode(), digest_size=16)
+    digest.update(np.asarray(grid.shape, dtype=np.int64).tobytes())
+    digest.update(grid.data)
+    return digest.hexdigest()
+
+
+class _Entry:
+    """A registered maze: its grid, lazily built query structures, and when it expires."""
+
+    __slots__ = ("grid", "solver", "tree_index", "fields", "size", "expires_at")
+
+    def __init__(self, grid: np.ndarray, size: int, expires_at: float):
+        self.grid: np.ndarray = grid
+        self.solver: Optional[MazeSolver] = None
+        # None = not built yet; False = the maze is not perfect, so there is no index
+        self.tree_index = None
+        self.fields: Dict[Tuple[int, int], np.ndarray] = {}  # Distance fields by goal
+        self.size: int = size
+        self.expires_at: float = expires_at
+
+
+class MazeRegistry:
+    """
+    Keeps recently generated mazes in memory so clients can refer to them by id instead of
+    uploading the grid again. Ids are content hashes, so the same grid (e.g. a seeded maze)
+    always gets the same id. Entries expire 'ttl_seconds' after they were last registered
+    and are also evicted LRU once the entry or byte limit is reached.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes an empty registry.
+
+        Args:
+            max_entries: Maximum number of mazes held at once.
+            max_bytes: Maximum memory charged to held mazes (grid plus solver).
+            ttl_seconds: Lifetime of an entry after its most recent registration.
+            clock: Monotonic time source (injectable for tests).
+        """
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be positive")
+        self.ttl_seconds: float = ttl_seconds
+        self._clock = clock
+        self._entries = LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+
+    def register(self, grid: np.ndarray) -> str:
+        """Stores 'grid' (or refreshes its expiry if already present) and returns its id."""
+        maze_id = content_id(grid)
+        expires_at = self._clock() + self.ttl_seconds
+        entry = self._lookup(maze_id, count=False)  # Registering is not a cache lookup
+        if entry is not None:
+            entry.expires_at = expires_at
+            return maze_id
+        # The solver's padded search template is about the size of the grid itself
+        size = 2 * grid.nbytes
+        self._entries.put(maze_id, _Entry(grid, size, expires_at), size)
+        return maze_id
+
+    def _lookup(self, maze_id: str, count: bool = True) -> Optional[_Entry]:
+        """
+        Returns the live entry for 'maze_id', dropping it if it has expired. Without
+        'count' the lookup is left out of the hit/miss statistics.
+        """
+        entry = self._entries.get(maze_id) if count else self._entries.peek(maze_id, refresh=True)
+        if entry is not None and entry.expires_at <= self._clock():
+            self._entries.pop(maze_id)
+            return None
+        return entry
+
+    def get(self, maze_id: str) -> Optional[np.ndarray]:
+        """Returns the grid registered under 'maze_id', or None if unknown or expired."""
+        entry = self._lookup(maze_id)
+        return entry.grid if entry is not None else None
+
+    def solver(self, maze_id: str) -> Optional[MazeSolver]:
+        """
+        Returns a MazeSolver for the registered maze, building it on first use and reusing
+        it afterwards. None if the id is unknown or expired.
+        """
+        entry = self._lookup(maze_id)
+        if entry is None:
+            return None
+        if entry.solver is None:
+            # Concurrent first solves may both build one; either result is equivalent
+            entry.solver = MazeSolver(entry.grid)
+        return entry.solver
+
+    def tree_index(self, maze_id: str) -> Optional[MazeTreeIndex]:
+        """
+        Returns the MazeTreeIndex of the registered maze, building it on first use.
+        None if the id is unknown or expired, or if the maze is not perfect.
+        """
+        entry = self._lookup(maze_id)
+        if entry is None:
+            return None
+        if entry.tree_index is None:
+            try:
+                entry.tree_index = MazeTreeIndex(entry.grid)
+            except ValueError:
+                entry.tree_index = False
+            else:
+                # Re-charge the entry so the byte limit accounts for the index
+                entry.size += entry.tree_index.nbytes
+                self._entries.put(maze_id, entry, entry.size)
+        return entry.tree_index or None
+
+    def distance_field(self, maze_id: str, goal: Tuple[int, int]) -> Optional[np.ndarray]:
+        """
+        Returns the uint32 distance-to-'goal' field of the registered maze, computing it on
+        first use and keeping it with the entry. None if the id is unknown or expired.
+
+        Raises:
+            ValueError: If the goal is outside the maze or on a wall.
+        """
+        solver = self.solver(maze_id)
+        entry = self._lookup(maze_id)
+        if solver is None or entry is None:
+            return None
+        field = entry.fields.get(goal)
+        if field is None:
+            field = solver.distance_field(goal)
+            entry.fields[goal] = field
+            entry.size += field.nbytes
+            self._entries.put(maze_id, entry, entry.size)
+        return field
+
+    def clear(self) -> None:
+        """Removes every registered maze."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns entry/byte usage and hit/miss counters of the underlying cache."""
+        return self._entries.stats()
@@ -1,34 +1,94 @@
 # src/maze_solver.py
 
+import heapq
 from collections import deque
-from typing import List, Optional, Set, Tuple
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+from src.vectorized_bfs import backtrack_path, bfs_distances
+
+# Cell states in the solver's flat search array. A passage cell is FREE until BFS reaches it;
+# it then stores the code (1-4) of the move that reached it, which doubles as the
+# predecessor pointer. START marks the search origin and WALL anything impassable.
+FREE, START, WALL = 0, 5, 255
+
+# Distance-field value for walls and cells that cannot reach the goal
+UNREACHABLE = np.iinfo(np.uint32).max
+
+SOLVER_STRATEGIES = ("bfs", "astar", "bidirectional")
+DEFAULT_STRATEGY = "bfs"
+
+# BFS backends: a per-cell Python loop, or level-synchronous NumPy frontier expansion.
+# "auto" picks NumPy from this many grid cells up (see benchmarks/benchmark_solver.py).
+BFS_BACKENDS = ("auto", "python", "numpy")
+VECTORIZED_BFS_MIN_CELLS = 250_000
+
+
+class SolveResult(NamedTuple):
+    """A solver answer: the path (excluding start, or None) and how many nodes were expanded."""
+
+    path: Optional[List[Tuple[int, int]]]
+    expanded: int
+
 
 class MazeSolver:
     """
-    Solves a maze represented by a 2D grid using Breadth-First Search (BFS).
-    Finds the shortest path in terms of number of steps from a start to a goal coordinate.
+    Solves a maze represented by a 2D grid.
+    Finds the shortest path in terms of number of steps from a start to a goal coordinate,
+    using one of SOLVER_STRATEGIES: plain BFS, A* with a Manhattan heuristic, or
+    bidirectional BFS. All three return a shortest path; they differ in how many nodes
+    they expand to find it.
     Grid representation: 0=Passage, 1=Wall. Coordinates are (x, y).
     """
 
-    def __init__(self, maze_data: List[List[int]]):
+    def __init__(
+        self,
+        maze_data: Union[List[List[int]], np.ndarray],
+        strategy: str = DEFAULT_STRATEGY,
+        backend: str = "auto",
+    ):
         """
         Initializes the MazeSolver with the maze structure.
 
         Args:
-            maze_data: A list of lists representing the maze grid.
+            maze_data: A list of lists (or a 2D NumPy array) representing the maze grid.
+            strategy: The default search strategy, one of SOLVER_STRATEGIES.
+            backend: BFS implementation, one of BFS_BACKENDS ("auto" chooses by grid size).
         """
-        if not maze_data or not isinstance(maze_data, list):
+        if isinstance(maze_data, np.ndarray):
+            if maze_data.ndim != 2 or maze_data.size == 0:
+                raise ValueError("Invalid maze data provided.")
+        elif not maze_data or not isinstance(maze_data, list):
             raise ValueError("Invalid maze data provided.")
+        if strategy not in SOLVER_STRATEGIES:
+            raise ValueError(f"Unknown solver strategy: {strategy}")
+        if backend not in BFS_BACKENDS:
+            raise ValueError(f"Unknown BFS backend: {backend}")
+        self.strategy: str = strategy
 
-        self.maze_data: List[List[int]] = maze_data
+        self.maze_data = maze_data
         self.rows: int = len(maze_data)
         self.cols: int = len(maze_data[0]) if self.rows > 0 else 0
 
-        if self.rows > 0 and not all(len(row) == self.cols for row in maze_data):
+        if isinstance(maze_data, list) and not all(len(row) == self.cols for row in maze_data):
              raise ValueError("Maze rows have inconsistent lengths.")
 
+        # Flat search template: the grid surrounded by a one-cell WALL border, so neighbour
+        # lookups never need bounds checks. Index of (x, y) is (y + 1) * stride + (x + 1).
+        self.stride: int = self.cols + 2
+        padded = np.full((self.rows + 2, self.stride), WALL, dtype=np.uint8)
+        padded[1:-1, 1:-1] = np.where(np.asarray(maze_data) == 0, FREE, WALL)
+        self._template: bytes = padded.tobytes()
+        self._passable: Optional[np.ndarray] = None  # Boolean view for the NumPy backend
+        if backend == "auto":
+            backend = "numpy" if self.rows * self.cols >= VECTORIZED_BFS_MIN_CELLS else "python"
+        self.backend: str = backend
+        # Flat index offset for each move code: R, L, D, U (code 0 is unused)
+        self._offsets: Tuple[int, ...] = (0, 1, -1, self.stride, -self.stride)
+
     def solve(
-        self, start: Tuple[int, int], goal: Tuple[int, int]
+        self, start: Tuple[int, int], goal: Tuple[int, int], strategy: Optional[str] = None
     ) -> Optional[List[Tuple[int, int]]]:
         """
         Public method to find the shortest path from start to goal.
@@ -36,68 +96,340 @@ class MazeSolver:
         Args:
             start: The starting coordinates (x, y).
             goal: The goal coordinates (x, y).
+            strategy: Overrides the solver's default strategy for this call.
 
         Returns:
             A list of (x, y) tuples representing the path (excluding start),
             or None if no path exists or start/goal are invalid.
         """
-        # Initial validation of start/goal points
-        start_x, start_y = start
-        goal_x, goal_y = goal
+        return self.search(start, goal, strategy).path
 
-        if not self._is_within_bounds(start_x, start_y) or \
-           not self._is_within_bounds(goal_x, goal_y):
-            # Start or goal is outside the defined grid
-            return None
-        if self.maze_data[start_y][start_x] == 1 or self.maze_data[goal_y][goal_x] == 1:
-            # Start or goal is on a wall
-             return None
+    def search(
+        self, start: Tuple[int, int], goal: Tuple[int, int], strategy: Optional[str] = None
+    ) -> SolveResult:
+        """
+        Like solve(), but also reports the number of nodes the search expanded.
 
+        Raises:
+            ValueError: If the strategy is not one of SOLVER_STRATEGIES.
+        """
+        strategy = strategy or self.strategy
+        if strategy not in SOLVER_STRATEGIES:
+            raise ValueError(f"Unknown solver strategy: {strategy}")
+
+        # Start or goal outside the defined grid or on a wall
+        if not self._is_endpoint(*start) or not self._is_endpoint(*goal):
+            return SolveResult(None, 0)
+
+        if strategy == "astar":
+            return self._find_path_astar(start, goal)
+        if strategy == "bidirectional":
+            return self._find_path_bidirectional(start, goal)
         return self._find_path_bfs(start, goal)
 
+    def solve_many(
+        self, queries: Sequence[Tuple[Tuple[int, int], Tuple[int, int]]]
+    ) -> List[Optional[List[Tuple[int, int]]]]:
+        """
+        Answers many (start, goal) queries with BFS, sharing work between them: queries are
+        grouped by start, and one BFS tree per distinct start (grown until all of that
+        start's goals are reached) answers every goal in the group.
+
+        Args:
+            queries: A sequence of ((x, y) start, (x, y) goal) pairs.
+
+        Returns:
+            One path per query, in query order, each with the same contract as solve().
+        """
+        results: List[Optional[List[Tuple[int, int]]]] = [None] * len(queries)
+        by_source: Dict[int, List[int]] = {}
+        for position, (start, goal) in enumerate(queries):
+            if self._is_endpoint(*start) and self._is_endpoint(*goal):
+                by_source.setdefault(self._index(*start), []).append(position)
+
+        for source, positions in by_source.items():
+            targets = {self._index(*queries[position][1]) for position in positions}
+            if self.backend == "numpy":
+                distances, _ = self._distances_from(source, sorted(targets))
+                for position in positions:
+                    target = self._index(*queries[position][1])
+                    if distances[target] >= 0:
+                        path = backtrack_path(distances, self.stride, target)
+                        results[position] = [self._coords(index) for index in path]
+            else:
+                state, _ = self._bfs_tree(source, targets)
+                for position in positions:
+                    target = self._index(*queries[position][1])
+                    if FREE < state[target] < WALL:
+                        results[position] = self._trace_back(state, source, target)
+        return results
+
+    def distance_field(self, goal: Tuple[int, int]) -> np.ndarray:
+        """
+        Computes every cell's distance (in steps) to 'goal' with one reverse BFS.
+        The field is built with the NumPy backend regardless of grid size, since
+        level-synchronous expansion yields distances directly. Any cell's path to the goal
+        can then be read off with follow_distance_field() in O(path length).
+
+        Returns:
+            A (rows, cols) uint32 array; walls and cells cut off from the goal hold UNREACHABLE.
+
+        Raises:
+            ValueError: If the goal is outside the grid or on a wall.
+        """
+        if not self._is_endpoint(*goal):
+            raise ValueError(f"Goal {goal} is outside the maze or on a wall.")
+        distances, _ = self._distances_from(self._index(*goal), None)
+        distances = distances.reshape(self.rows + 2, self.stride)[1:-1, 1:-1]
+        return np.where(distances < 0, UNREACHABLE, distances).astype(np.uint32)
+
     def _is_within_bounds(self, x: int, y: int) -> bool:
         """Checks if the given coordinates are within the maze grid dimensions."""
         return 0 <= y < self.rows and 0 <= x < self.cols
 
-    def _is_valid_passage(self, x: int, y: int) -> bool:
-        """Checks if the given coordinates are within bounds and represent a passage (0)."""
-        return self._is_within_bounds(x, y) and self.maze_data[y][x] == 0
+    def _is_endpoint(self, x: int, y: int) -> bool:
+        """Checks that (x, y) can start or end a path: inside the grid and not a wall."""
+        return self._is_within_bounds(x, y) and self.maze_data[y][x] != 1
 
-    def _find_path_bfs(
-        self, start: Tuple[int, int], goal: Tuple[int, int]
-    ) -> Optional[List[Tuple[int, int]]]:
+    def _index(self, x: int, y: int) -> int:
+        """Converts grid coordinates to an index into the padded flat search array."""
+        return (y + 1) * self.stride + (x + 1)
+
+    def _coords(self, index: int) -> Tuple[int, int]:
+        """Converts a padded flat index back to grid coordinates (x, y)."""
+        y, x = divmod(index, self.stride)
+        return x - 1, y - 1
+
+    def _trace_back(self, state: bytearray, source: int, node: int) -> List[Tuple[int, int]]:
+        """Walks the recorded moves from node back to source; returns the path source->node."""
+        offsets = self._offsets
+        path: List[Tuple[int, int]] = []
+        while node != source:
+            path.append(self._coords(node))
+            node -= offsets[state[node]]
+        path.reverse()
+        return path  # Path excludes the source node
+
+    def _bfs_tree(self, source: int, targets: Set[int]) -> Tuple[bytearray, int]:
         """
-        Performs Breadth-First Search to find the shortest path.
+        Grows a BFS tree from 'source' until every cell in 'targets' has been reached (or
+        the component is exhausted). Each reached cell records only the move that reached it
+        (one byte), so memory is O(cells) and any reached cell's path is rebuilt afterwards
+        with _trace_back.
 
         Returns:
-            The path as a list of coordinates, or None if no path is found.
+            The search state array and the number of expanded nodes.
         """
-        # Queue stores tuples: ( (current_x, current_y), [path_list_to_current] )
-        queue: deque[Tuple[Tuple[int, int], List[Tuple[int, int]]]] = deque(
-            [(start, [start])]
-        )
-        visited: Set[Tuple[int, int]] = {start}
+        offsets = self._offsets
+        right, left, down, up = offsets[1:]
+        remaining = set(targets)
 
-        # Define potential moves relative to current position (dx, dy)
-        possible_moves: List[Tuple[int, int]] = [(1, 0), (-1, 0), (0, 1), (0, -1)] # R, L, D, U
+        # Per-search copy of the template: WALL, FREE, or the move code that reached a cell
+        state = bytearray(self._template)
+        state[source] = START
+        queue = deque([source])
+        expanded = 0
 
         while queue:
-            (current_x, current_y), path = queue.popleft()
+            current = queue.popleft()
+            expanded += 1
 
             # Goal check
-            if (current_x, current_y) == goal:
-                return path[1:]  # Return path excluding the starting node
-
-            # Explore neighbors
-            for dx, dy in possible_moves:
-                next_x, next_y = current_x + dx, current_y + dy
-                next_pos = (next_x, next_y)
-
-                # Check if the neighbor is a valid passage and hasn't been visited
-                if self._is_valid_passage(next_x, next_y) and next_pos not in visited:
-                    visited.add(next_pos)
-                    # Create the new path by appending the valid neighbor
-                    new_path: List[Tuple[int, int]] = path + [next_pos]
-                    queue.append((next_pos, new_path))
-
-        return None  # Goal was not reachable
\ No newline at end of file
+            if current in remaining:
+                remaining.discard(current)
+                if not remaining:
+                    break
+
+            # Explore neighbors in R, L, D, U order; FREE (0) cells are unvisited passages
+            nxt = current + right
+            if not state[nxt]:
+                state[nxt] = 1
+                queue.append(nxt)
+            nxt = current + left
+            if not state[nxt]:
+                state[nxt] = 2
+                queue.append(nxt)
+            nxt = current + down
+            if not state[nxt]:
+                state[nxt] = 3
+                queue.append(nxt)
+            nxt = current + up
+            if not state[nxt]:
+                state[nxt] = 4
+                queue.append(nxt)
+
+        return state, expanded
+
+    def _find_path_bfs(self, start: Tuple[int, int], goal: Tuple[int, int]) -> SolveResult:
+        """
+        Performs Breadth-First Search to find the shortest path.
+
+        Returns:
+            The path (or None if no path is found) and the number of expanded nodes.
+        """
+        if self.backend == "numpy":
+            return self._find_path_bfs_vectorized(start, goal)
+        source = self._index(*start)
+        target = self._index(*goal)
+        state, expanded = self._bfs_tree(source, {target})
+        if not FREE < state[target] < WALL:
+            return SolveResult(None, expanded)  # Goal was not reachable
+        return SolveResult(self._trace_back(state, source, target), expanded)
+
+    def _distances_from(self, source: int, targets) -> Tuple[np.ndarray, int]:
+        """Runs the NumPy BFS backend from 'source' until all 'targets' are reached."""
+        if self._passable is None:
+            self._passable = np.frombuffer(self._template, dtype=np.uint8) == FREE
+        return bfs_distances(self._passable, self.stride, source, targets)
+
+    def _find_path_bfs_vectorized(
+        self, start: Tuple[int, int], goal: Tuple[int, int]
+    ) -> SolveResult:
+        """
+        BFS via whole-frontier NumPy steps (see src/vectorized_bfs.py). Builds a distance
+        field up to the goal's level and backtracks a shortest path through it; on grids
+        with loops the chosen path may differ from the Python backend's, but not its length.
+        """
+        source = self._index(*start)
+        target = self._index(*goal)
+        distances, expanded = self._distances_from(source, [target])
+        if distances[target] < 0:
+            return SolveResult(None, expanded)
+        path = backtrack_path(distances, self.stride, target)
+        return SolveResult([self._coords(index) for index in path], expanded)
+
+    def _find_path_astar(self, start: Tuple[int, int], goal: Tuple[int, int]) -> SolveResult:
+        """
+        A* search on a heapq frontier ordered by (g + h, h), where h is the Manhattan
+        distance to the goal. The heuristic is consistent on a unit-cost grid, so the first
+        time a node is popped its cost is final and it is expanded exactly once.
+        """
+        source = self._index(*start)
+        target = self._index(*goal)
+        stride = self.stride
+        goal_x, goal_y = goal[0] + 1, goal[1] + 1
+        moves = tuple(enumerate(self._offsets[1:], start=1))
+
+        state = bytearray(self._template)
+        state[source] = START
+        closed = bytearray(len(state))
+        cost = {source: 0}
+        heuristic = abs(start[0] - goal[0]) + abs(start[1] - goal[1])
+        frontier = [(heuristic, heuristic, source)]
+        expanded = 0
+
+        while frontier:
+            _, _, current = heapq.heappop(frontier)
+            if closed[current]:
+                continue  # Stale entry superseded by a cheaper one
+            closed[current] = 1
+            expanded += 1
+            if current == target:
+                return SolveResult(self._trace_back(state, source, target), expanded)
+
+            step_cost = cost[current] + 1
+            for code, offset in moves:
+                nxt = current + offset
+                if state[nxt] == WALL or closed[nxt] or step_cost >= cost.get(nxt, step_cost + 1):
+                    continue
+                cost[nxt] = step_cost
+                state[nxt] = code
+                y, x = divmod(nxt, stride)
+                heuristic = abs(x - goal_x) + abs(y - goal_y)
+                heapq.heappush(frontier, (step_cost + heuristic, heuristic, nxt))
+
+        return SolveResult(None, expanded)
+
+    def _find_path_bidirectional(
+        self, start: Tuple[int, int], goal: Tuple[int, int]
+    ) -> SolveResult:
+        """
+        Bidirectional BFS: grows one layer at a time from whichever side currently has the
+        smaller frontier, stopping as soon as a newly discovered node is already known to the
+        other side. Because both searches only ever advance by whole layers, that first
+        meeting node lies on a shortest path.
+        """
+        source = self._index(*start)
+        target = self._index(*goal)
+        if source == target:
+            return SolveResult([], 1)
+        moves = tuple(enumerate(self._offsets[1:], start=1))
+
+        forward = bytearray(self._template)
+        backward = bytearray(self._template)
+        forward[source] = START
+        backward[target] = START
+        forward_layer, backward_layer = [source], [target]
+        expanded = 0
+        meeting = None
+
+        while forward_layer and backward_layer and meeting is None:
+            if len(forward_layer) <= len(backward_layer):
+                seen, other, layer = forward, backward, forward_layer
+            else:
+                seen, other, layer = backward, forward, backward_layer
+            next_layer = []
+            for current in layer:
+                expanded += 1
+                for code, offset in moves:
+                    nxt = current + offset
+                    if seen[nxt]:
+                        continue
+                    seen[nxt] = code
+                    if other[nxt] and other[nxt] != WALL:
+                        meeting = nxt
+                        break
+                    next_layer.append(nxt)
+                if meeting is not None:
+                    break
+            if seen is forward:
+                forward_layer = next_layer
+            else:
+                backward_layer = next_layer
+
+        if meeting is None:
+            return SolveResult(None, expanded)
+
+        # Forward half: source -> meeting. Backward half: retrace the goal-side moves from the
+        # meeting node towards the goal.
+        path = self._trace_back(forward, source, meeting)
+        offsets = self._offsets
+        node = meeting
+        while node != target:
+            node -= offsets[backward[node]]
+            path.append(self._coords(node))
+        return SolveResult(path, expanded)
+
+
+def follow_distance_field(
+    field: np.ndarray, start: Tuple[int, int], max_steps: Optional[int] = None
+) -> Optional[List[Tuple[int, int]]]:
+    """
+    Reads a path to the goal off a distance field (see MazeSolver.distance_field) by
+    repeatedly stepping to the neighbour one step closer, in R, L, D, U preference order.
+
+    Args:
+        field: The (rows, cols) uint32 distance field.
+        start: The cell (x, y) to start from.
+        max_steps: Stop after this many moves (None = walk all the way to the goal).
+
+    Returns:
+        The moves as (x, y) tuples excluding start ([] at the goal), or None if start is
+        outside the field or cannot reach the goal.
+    """
+    rows, cols = field.shape
+    x, y = start
+    if not (0 <= x < cols and 0 <= y < rows) or field[y, x] == UNREACHABLE:
+        return None
+    remaining = int(field[y, x])
+    steps = remaining if max_steps is None else min(remaining, max_steps)
+    path: List[Tuple[int, int]] = []
+    for _ in range(steps):
+        remaining -= 1
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < cols and 0 <= ny < rows and field[ny, nx] == remaining:
+                x, y = nx, ny
+                break
+        path.append((x, y))
+    return path
@@ -0,0 +1,211 @@
+# src/maze_store.py
+
+import json
+import os
+import re
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.lru_cache import LRUCache
+from src.maze_generator import generate_eller_rows
+from src.maze_solver import MazeSolver
+
+# Maze ids are uuid4 hex strings; anything else is rejected before touching the filesystem.
+MAZE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+class MazeStore:
+    """
+    Persists maze grids as raw uint8 files (one byte per grid cell, row-major) with a small
+    JSON metadata sidecar, and serves them back through read-only np.memmap views.
+    Windows ('tiles') are zero-copy slices of the mapping, so reading a tile costs the same
+    regardless of how large the maze is, and the whole grid never has to fit in RAM.
+
+    With a byte cap, every write deletes the oldest mazes (with their distance fields)
+    until the directory fits again, so unauthenticated maze creation cannot fill the disk.
+    """
+
+    def __init__(self, directory: str, max_open: int = 64, max_bytes: Optional[int] = None):
+        """
+        Initializes the store rooted at 'directory' (created if missing).
+
+        Args:
+            directory: Folder holding '<id>.bin' grid files and '<id>.json' metadata.
+            max_open: Maximum number of memory maps kept open at once.
+            max_bytes: Maximum total size of the stored files (None = unlimited).
+        """
+        self.directory: str = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        # Open maps are cached LRU by count; each map is charged one unit of "size"
+        self._maps = LRUCache(max_entries=max_open, max_bytes=max_open)
+
+    def _paths(self, maze_id: str) -> Tuple[str, str]:
+        """Returns the (grid, metadata) file paths for a validated maze id."""
+        if not MAZE_ID_PATTERN.match(maze_id):
+            raise KeyError(f"Invalid maze id: {maze_id}")
+        base = os.path.join(self.directory, maze_id)
+        return base + ".bin", base + ".json"
+
+    def _write(self, rows: Iterable[np.ndarray], shape: Tuple[int, int], meta: Dict) -> str:
+        """Writes grid rows into a new memory-mapped file plus metadata; returns the new id."""
+        maze_id = uuid.uuid4().hex
+        grid_path, meta_path = self._paths(maze_id)
+        grid = np.memmap(grid_path, dtype=np.uint8, mode="w+", shape=shape)
+        try:
+            for y, row in enumerate(rows):
+                grid[y] = row
+            grid.flush()
+        finally:
+            del grid
+        meta = dict(meta, rows=shape[0], cols=shape[1])
+        # Metadata is written last (atomically) so a maze only exists once it is complete
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
+        self.prune(keep=maze_id)
+        return maze_id
+
+    def save(self, grid: np.ndarray, **meta) -> str:
+        """Stores an in-memory grid and returns its maze id."""
+        grid = np.asarray(grid, dtype=np.uint8)
+        return self._write(grid, grid.shape, meta)
+
+    def generate(self, dimension: int, rows: Optional[int] = None, seed: Optional[int] = None) -> str:
+        """
+        Generates a maze straight into the store, row by row (Eller's algorithm), so only
+        O(dimension) memory is used regardless of size. Returns the new maze id.
+        """
+        height = dimension if rows is None else rows
+        shape = (2 * height + 1, 2 * dimension + 1)
+        stream = generate_eller_rows(dimension, rows=height, seed=seed)
+        return self._write(stream, shape, {"dimension": dimension, "seed": seed})
+
+    def metadata(self, maze_id: str) -> Dict:
+        """
+        Returns the stored metadata (including 'rows' and 'cols') for a maze.
+
+        Raises:
+            KeyError: If the id is invalid or unknown.
+        """
+        _, meta_path = self._paths(maze_id)
+        try:
+            with open(meta_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise KeyError(f"Unknown maze id: {maze_id}") from None
+
+    def open(self, maze_id: str) -> np.memmap:
+        """Returns a read-only memory map of the full grid (cached while recently used)."""
+        grid = self._maps.get(maze_id)
+        if grid is None:
+            meta = self.metadata(maze_id)
+            grid_path, _ = self._paths(maze_id)
+            grid = np.memmap(grid_path, dtype=np.uint8, mode="r", shape=(meta["rows"], meta["cols"]))
+            self._maps.put(maze_id, grid, 1)
+        return grid
+
+    def tile(self, maze_id: str, x: int, y: int, width: int, height: int) -> np.ndarray:
+        """
+        Returns the window with top-left corner (x, y) as a zero-copy view, clipped to the
+        grid bounds (so windows at the edge may be smaller than requested).
+        """
+        if width <= 0 or height <= 0:
+            raise ValueError("Tile width and height must be positive.")
+        grid = self.open(maze_id)
+        x0, y0 = max(0, x), max(0, y)
+        return grid[y0:max(y0, y + height), x0:max(x0, x + width)]
+
+    def distance_field(self, maze_id: str, goal: Tuple[int, int]) -> np.ndarray:
+        """
+        Returns the uint32 distance-to-'goal' field of a stored maze as a read-only memory
+        map. It is computed once (one reverse BFS) and persisted as '<id>-<x>-<y>.dist'
+        next to the grid, so later hints for the maze only read from it.
+
+        Raises:
+            KeyError: If the id is invalid or unknown.
+            ValueError: If the goal is outside the maze or on a wall.
+        """
+        grid = self.open(maze_id)  # Validates the id before any cached field is returned
+        key = (maze_id, goal)
+        field = self._maps.get(key)
+        if field is not None:
+            return field
+        field_path = self._field_path(maze_id, goal)
+        if not os.path.exists(field_path):
+            computed = MazeSolver(grid, backend="numpy").distance_field(goal)
+            # Concurrent first hints (other tabs or workers) each write their own temp file;
+            # the fields are identical, so whichever replace lands last wins
+            temp_file = f"{field_path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+            try:
+                computed.tofile(temp_file)
+                os.replace(temp_file, field_path)
+            finally:
+                if os.path.exists(temp_file):
+                    os.remove(temp_file)
+            del computed
+            self.prune(keep=maze_id)
+        field = np.memmap(field_path, dtype=np.uint32, mode="r", shape=grid.shape)
+        self._maps.put(key, field, 1)
+        return field
+
+    def _field_path(self, maze_id: str, goal: Tuple[int, int]) -> str:
+        """Returns the distance-field file path for a validated maze id and goal cell."""
+        grid_path, _ = self._paths(maze_id)
+        return f"{grid_path[:-len('.bin')]}-{int(goal[0])}-{int(goal[1])}.dist"
+
+    def delete(self, maze_id: str) -> None:
+        """Removes a stored maze and its distance fields; unknown ids are ignored."""
+        grid_path, meta_path = self._paths(maze_id)
+        # Drop the grid map and every cached (maze_id, goal) field map so the unlinked
+        # files are unmapped (and their space freed) now rather than on LRU eviction
+        for key in self._maps.keys():
+            if key == maze_id or (isinstance(key, tuple) and key[0] == maze_id):
+                self._maps.pop(key)
+        fields = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.startswith(maze_id + "-") and name.endswith(".dist")
+        ]
+        for path in (meta_path, grid_path, *fields):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def prune(self, keep: Optional[str] = None) -> List[str]:
+        """
+        Deletes the oldest mazes until the store's files take at most 'max_bytes' (no-op
+        without a cap) and returns their ids. 'keep', the maze just written, is never
+        deleted, even if it alone exceeds the cap.
+        """
+        if self.max_bytes is None:
+            return []
+        sizes: Dict[str, int] = {}
+        created: Dict[str, int] = {}
+        with os.scandir(self.directory) as entries:
+            for item in entries:
+                maze_id = item.name[:32]
+                if item.name.endswith(".tmp") or not MAZE_ID_PATTERN.match(maze_id):
+                    continue
+                try:
+                    st = item.stat()
+                except FileNotFoundError:  # Deleted concurrently (e.g. by another worker)
+                    continue
+                sizes[maze_id] = sizes.get(maze_id, 0) + st.st_size
+                if item.name == maze_id + ".json":
+                    created[maze_id] = st.st_mtime_ns
+        total = sum(sizes.values())
+        evicted = []
+        # Only complete mazes (with metadata) are candidates; others may still be written
+        for maze_id in sorted(created, key=created.get):
+            if total <= self.max_bytes:
+                break
+            if maze_id == keep:
+                continue
+            self.delete(maze_id)
+            total -= sizes[maze_id]
+            evicted.append(maze_id)
+        return evicted
@@ -0,0 +1,174 @@
+# src/maze_tree_index.py
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.maze_solver import FREE, START, WALL
+
+
+class MazeTreeIndex:
+    """
+    Answers shortest-path queries on a perfect maze without searching.
+    A perfect maze's passages form a tree, so the path between two cells is unique and runs
+    through their lowest common ancestor (LCA). The index roots the tree once (one BFS),
+    records each cell's parent and depth, and builds a binary-lifting table
+    (up[k][v] = the 2^k-th ancestor of v). Distances then cost O(log n) and paths cost
+    O(log n + path length).
+    Grid representation: 0=Passage, anything else=Wall. Coordinates are (x, y).
+    """
+
+    def __init__(self, grid, root: Optional[Tuple[int, int]] = None):
+        """
+        Builds the index for a maze grid.
+
+        Args:
+            grid: A 2D list or NumPy array of the maze grid.
+            root: Cell (x, y) to root the tree at; defaults to the first passage cell.
+
+        Raises:
+            ValueError: If the grid is not 2D or its passages do not form a single tree.
+        """
+        grid = np.asarray(grid)
+        if grid.ndim != 2 or grid.size == 0:
+            raise ValueError("Maze grid must be a non-empty 2D array")
+        self.rows, self.cols = grid.shape
+        passable = grid == 0
+        node_count = int(np.count_nonzero(passable))
+        edge_count = int(
+            np.count_nonzero(passable[:, :-1] & passable[:, 1:])
+            + np.count_nonzero(passable[:-1, :] & passable[1:, :])
+        )
+        if node_count == 0 or edge_count != node_count - 1:
+            raise ValueError("Maze passages do not form a tree (not a perfect maze)")
+
+        # Same padded flat layout as MazeSolver: a WALL border removes bounds checks
+        self.stride: int = self.cols + 2
+        padded = np.full((self.rows + 2, self.stride), WALL, dtype=np.uint8)
+        padded[1:-1, 1:-1] = np.where(passable, FREE, WALL)
+        offsets = (0, 1, -1, self.stride, -self.stride)
+
+        if root is None:
+            source = int(np.flatnonzero(padded == FREE)[0])
+        else:
+            if not (0 <= root[0] < self.cols and 0 <= root[1] < self.rows) or \
+               not passable[root[1], root[0]]:
+                raise ValueError(f"Root {root} is not a passage cell")
+            source = (root[1] + 1) * self.stride + (root[0] + 1)
+
+        # Level-by-level BFS; each reached cell stores the move code that reached it
+        state = bytearray(padded.tobytes())
+        state[source] = START
+        order = [source]
+        level_sizes = [1]
+        frontier = [source]
+        moves = tuple(enumerate(offsets[1:], start=1))
+        while frontier:
+            next_frontier = []
+            for current in frontier:
+                for code, offset in moves:
+                    nxt = current + offset
+                    if not state[nxt]:
+                        state[nxt] = code
+                        next_frontier.append(nxt)
+            if next_frontier:
+                order.extend(next_frontier)
+                level_sizes.append(len(next_frontier))
+            frontier = next_frontier
+        if len(order) != node_count:
+            raise ValueError("Maze passages do not form a tree (not a perfect maze)")
+
+        # Nodes are numbered in BFS order; node_of maps padded cell index -> node (or -1)
+        cells = np.asarray(order, dtype=np.int64)
+        node_of = np.full(padded.size, -1, dtype=np.int32)
+        node_of[cells] = np.arange(node_count, dtype=np.int32)
+        codes = np.frombuffer(bytes(state), dtype=np.uint8)[cells]
+        step_back = np.zeros(256, dtype=np.int64)
+        step_back[1:5] = offsets[1:]  # START (the root) steps back onto itself
+        parent = node_of[cells - step_back[codes]]
+
+        self.root: Tuple[int, int] = self._coords(source)
+        self.cells: np.ndarray = cells
+        self.node_of: np.ndarray = node_of
+        self.depth: np.ndarray = np.repeat(
+            np.arange(len(level_sizes), dtype=np.int32), level_sizes
+        )
+        levels = max(1, (len(level_sizes) - 1).bit_length())
+        self.up: np.ndarray = np.empty((levels, node_count), dtype=np.int32)
+        self.up[0] = parent
+        for k in range(1, levels):
+            self.up[k] = self.up[k - 1][self.up[k - 1]]
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the index arrays."""
+        return self.cells.nbytes + self.node_of.nbytes + self.depth.nbytes + self.up.nbytes
+
+    def _coords(self, index: int) -> Tuple[int, int]:
+        """Converts a padded flat index to grid coordinates (x, y)."""
+        y, x = divmod(int(index), self.stride)
+        return x - 1, y - 1
+
+    def _node(self, cell: Tuple[int, int]) -> Optional[int]:
+        """Returns the node for a cell (x, y), or None if it is out of bounds or a wall."""
+        x, y = cell
+        if not (0 <= x < self.cols and 0 <= y < self.rows):
+            return None
+        node = int(self.node_of[(y + 1) * self.stride + (x + 1)])
+        return node if node >= 0 else None
+
+    def _lca(self, u: int, v: int) -> int:
+        """Returns the lowest common ancestor of nodes u and v."""
+        up, depth = self.up, self.depth
+        if depth[u] < depth[v]:
+            u, v = v, u
+        # Lift u to v's depth, one set bit of the depth difference at a time
+        diff = int(depth[u] - depth[v])
+        k = 0
+        while diff:
+            if diff & 1:
+                u = int(up[k, u])
+            diff >>= 1
+            k += 1
+        if u == v:
+            return u
+        # Lift both to just below their LCA
+        for k in range(len(up) - 1, -1, -1):
+            if up[k, u] != up[k, v]:
+                u, v = int(up[k, u]), int(up[k, v])
+        return int(up[0, u])
+
+    def distance(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[int]:
+        """
+        Returns the number of steps on the shortest path from start to goal, or None if
+        either cell is out of bounds or a wall.
+        """
+        u, v = self._node(start), self._node(goal)
+        if u is None or v is None:
+            return None
+        return int(self.depth[u] + self.depth[v] - 2 * self.depth[self._lca(u, v)])
+
+    def path(
+        self, start: Tuple[int, int], goal: Tuple[int, int]
+    ) -> Optional[List[Tuple[int, int]]]:
+        """
+        Returns the path from start to goal as (x, y) tuples excluding start (the same
+        contract as MazeSolver.solve), or None if either cell is out of bounds or a wall.
+        """
+        u, v = self._node(start), self._node(goal)
+        if u is None or v is None:
+            return None
+        meet = self._lca(u, v)
+        parent = self.up[0]
+
+        # start climbs to the LCA (inclusive); goal climbs to it (exclusive), reversed
+        rising = []
+        while u != meet:
+            u = int(parent[u])
+            rising.append(u)
+        falling = []
+        while v != meet:
+            falling.append(v)
+            v = int(parent[v])
+        falling.reverse()
+        return [self._coords(self.cells[node]) for node in rising + falling]
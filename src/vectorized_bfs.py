@@ -0,0 +1,73 @@
+# src/vectorized_bfs.py
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def bfs_distances(
+    passable: np.ndarray, stride: int, source: int, targets: Optional[Sequence[int]] = None
+) -> Tuple[np.ndarray, int]:
+    """
+    Level-synchronous BFS over a flat, wall-padded grid, one NumPy step per level.
+    Each level gathers the four neighbours of the whole frontier at once, drops walls and
+    visited cells with a boolean mask, and removes duplicates with a scatter/gather pass
+    (no sort), so per-level cost is proportional to the frontier, not the grid.
+
+    Args:
+        passable: Flat boolean array of the padded grid (True = passage). The border must
+            be all False so neighbour indices never leave the array.
+        stride: Row length of the padded grid.
+        source: Flat index the search starts from.
+        targets: Optional flat indices; the search stops once all of them are reached.
+
+    Returns:
+        (distances, expanded): an int32 array of steps from 'source' (-1 = unreached) and
+        the number of cells whose neighbours were examined.
+    """
+    offsets = np.array([1, -1, stride, -stride], dtype=np.int64)
+    visited = ~passable  # Walls start out "visited" so one mask covers both
+    distances = np.full(passable.size, -1, dtype=np.int32)
+    first_seen = np.zeros(passable.size, dtype=np.int64)  # Scratch for de-duplication
+
+    visited[source] = True
+    distances[source] = 0
+    frontier = np.array([source], dtype=np.int64)
+    level = 0
+    expanded = 0
+    targets = None if targets is None else np.asarray(targets, dtype=np.int64)
+    while frontier.size and (targets is None or (distances[targets] < 0).any()):
+        expanded += frontier.size
+        level += 1
+        neighbours = (frontier[:, None] + offsets).ravel()
+        neighbours = neighbours[~visited[neighbours]]
+        # Keep one copy of each cell: the last write to first_seen wins, so exactly one
+        # position per distinct cell reads back its own position
+        positions = np.arange(neighbours.size, dtype=np.int64)
+        first_seen[neighbours] = positions
+        frontier = neighbours[first_seen[neighbours] == positions]
+        visited[frontier] = True
+        distances[frontier] = level
+    return distances, expanded
+
+
+def backtrack_path(distances: np.ndarray, stride: int, target: int) -> List[int]:
+    """
+    Rebuilds a shortest path from a distance field by stepping from 'target' to any
+    neighbour one step closer to the source, until distance 0.
+
+    Returns:
+        Flat indices from the cell after the source through 'target' (source excluded).
+    """
+    path = []
+    current = target
+    remaining = int(distances[current])
+    while remaining > 0:
+        path.append(current)
+        remaining -= 1
+        for offset in (1, -1, stride, -stride):
+            if distances[current + offset] == remaining:
+                current += offset
+                break
+    path.reverse()
+    return path
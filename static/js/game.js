@@ -13,6 +13,10 @@ const MAX_LEADERBOARD_ENTRIES_DISPLAY = 10; // Max entries per leaderboard categ
 const MAX_TRAIL_LENGTH = 16; // Max length of the player's trail
 const TRAIL_MAX_ALPHA = 0.6; // Starting opacity for the trail
 const TRAIL_MIN_ALPHA = 0.05; // Ending opacity for the trail
+const TILED_MODE_MIN_DIMENSION = 500; // Dimensions at or above this are played via the tile API
+const TILE_SIZE = 64; // Grid cells per side of each fetched tile
+const VIEWPORT_CELLS = 41; // Grid cells per side drawn around the player in tiled mode
+const MAX_CACHED_TILES = 64; // Tiles kept in memory before far-away ones are dropped
 
 // =============================================================================
 // Logger Utility
@@ -74,18 +78,23 @@ let elapsedSeconds = 0; // Time elapsed in the current game
 let gameWon = false; // Flag indicating if the current game is won
 let tileSize = 10; // Size of each maze tile in pixels
 let maze = []; // 2D array representing the current maze structure
+let mazeEnvelope = null; // Compact ("packed") wire form of the current maze, sent back when solving
+let mazeId = null; // Server-side id of the current maze (X-Maze-Id), so solving needn't upload it
+let tiledMaze = null; // {id, rows, cols} when playing a stored maze fetched tile by tile
+let tileCache = new Map(); // "tx,ty" -> 2D array for tiles of the current tiled maze
+let pendingTiles = new Set(); // Tile keys currently being fetched
 let player = { x: 1, y: 1 }; // Player's current position (x, y)
 let goal = { x: 1, y: 1 }; // Goal position (x, y)
 let solutionPath = []; // Array of [x, y] tuples for the solved path
 let playerTrailHistory = []; // Array of {x, y} objects for the player trail effect
 let currentMazeDimension = 5; // Currently selected maze dimension
-let allLeaderboardScores = []; // Stores all scores fetched from the server
 let unlockedAchievements = new Set(); // Set of unlocked achievement IDs
 let achievementState = { mazeCompletions: 0 }; // Tracks stats for achievements
 let playerColor = "red"; // Current color of the player square
 let playerTrailColorRGB = "255, 0, 0"; // RGB components of the player color for trail alpha
 let popupDismissTimer = null; // Timeout ID for auto-closing the win popup
 let lastCompletedRunInfo = null; // Stores info ({time, dimension, name}) about the last win
+let leaderboardPageCache = new Map(); // Leaderboard URL -> {etag, scores} of the last copy received
 
 // =============================================================================
 // DOM Element References (assigned in initializeGame)
@@ -377,6 +386,109 @@ function preloadTrophyImage() {
   trophyImg.onerror = () => logger.error("Trophy image loading error.");
 }
 
+/**
+ * Decodes a "packed" maze envelope ({rows, cols, data}) into a 2D array of 0/1.
+ * `data` is base64 of the grid bit-packed row-major, most significant bit first.
+ * @param {{rows: number, cols: number, data: string}} envelope The packed maze.
+ * @returns {number[][]} The decoded maze grid.
+ */
+function decodePackedMaze(envelope) {
+  const { rows, cols, data } = envelope || {};
+  if (!Number.isInteger(rows) || !Number.isInteger(cols) || rows <= 0 || cols <= 0 || typeof data !== "string") {
+    throw new Error("Invalid packed maze envelope");
+  }
+  const binary = atob(data);
+  if (binary.length !== Math.ceil((rows * cols) / 8)) {
+    throw new Error("Packed maze length does not match its dimensions");
+  }
+  const grid = new Array(rows);
+  let bit = 0;
+  for (let y = 0; y < rows; y++) {
+    const row = new Array(cols);
+    for (let x = 0; x < cols; x++, bit++) {
+      row[x] = (binary.charCodeAt(bit >> 3) >> (7 - (bit & 7))) & 1;
+    }
+    grid[y] = row;
+  }
+  return grid;
+}
+
+/** Returns true if a maze (full or tiled) is loaded */
+function hasMaze() {
+  return tiledMaze !== null || (maze && maze.length > 0);
+}
+
+/** Returns the grid dimensions of the current maze as {rows, cols} */
+function mazeSize() {
+  if (tiledMaze) return { rows: tiledMaze.rows, cols: tiledMaze.cols };
+  return { rows: maze.length, cols: maze[0]?.length || 0 };
+}
+
+/**
+ * Returns the cell value at (x, y): 0 for passage, 1 for wall.
+ * In tiled mode, cells of tiles not fetched yet are treated as walls.
+ */
+function getCell(x, y) {
+  if (!tiledMaze) return maze[y]?.[x] ?? 1;
+  const tile = tileCache.get(`${Math.floor(x / TILE_SIZE)},${Math.floor(y / TILE_SIZE)}`);
+  return tile?.[y % TILE_SIZE]?.[x % TILE_SIZE] ?? 1;
+}
+
+/** Checks whether (x, y) is inside the maze and a passage */
+function isPassage(x, y) {
+  const { rows, cols } = mazeSize();
+  return y >= 0 && y < rows && x >= 0 && x < cols && getCell(x, y) === 0;
+}
+
+/** Fetches one tile of the current tiled maze (no-op if cached or already in flight) */
+async function fetchTile(tx, ty) {
+  const key = `${tx},${ty}`;
+  if (!tiledMaze || tileCache.has(key) || pendingTiles.has(key)) return;
+  const mazeId = tiledMaze.id;
+  pendingTiles.add(key);
+  try {
+    const url = `/api/maze/${mazeId}/tile?x=${tx * TILE_SIZE}&y=${ty * TILE_SIZE}&w=${TILE_SIZE}&h=${TILE_SIZE}&format=packed`;
+    const response = await fetch(url);
+    if (!response.ok) throw new Error(`Tile fetch failed: ${response.status}`);
+    const tile = decodePackedMaze(await response.json());
+    if (tiledMaze?.id === mazeId) tileCache.set(key, tile); // Ignore tiles of a replaced maze
+  } catch (error) {
+    logger.error(`Error fetching tile ${key}:`, error);
+  } finally {
+    pendingTiles.delete(key);
+  }
+}
+
+/** Fetches every tile overlapping the viewport around (x, y), then drops far-away tiles */
+async function ensureTilesAround(x, y) {
+  if (!tiledMaze) return;
+  const reach = Math.ceil(VIEWPORT_CELLS / 2) + 1;
+  const maxTx = Math.floor((tiledMaze.cols - 1) / TILE_SIZE);
+  const maxTy = Math.floor((tiledMaze.rows - 1) / TILE_SIZE);
+  const tx0 = Math.max(0, Math.floor((x - reach) / TILE_SIZE));
+  const tx1 = Math.min(maxTx, Math.floor((x + reach) / TILE_SIZE));
+  const ty0 = Math.max(0, Math.floor((y - reach) / TILE_SIZE));
+  const ty1 = Math.min(maxTy, Math.floor((y + reach) / TILE_SIZE));
+  const missing = [];
+  for (let ty = ty0; ty <= ty1; ty++) {
+    for (let tx = tx0; tx <= tx1; tx++) {
+      if (!tileCache.has(`${tx},${ty}`)) missing.push(fetchTile(tx, ty));
+    }
+  }
+  if (missing.length === 0) return;
+  await Promise.all(missing);
+  // Evict the tiles farthest from the player once the cache grows too large
+  if (tileCache.size > MAX_CACHED_TILES) {
+    const ptx = Math.floor(x / TILE_SIZE), pty = Math.floor(y / TILE_SIZE);
+    const byDistance = [...tileCache.keys()].sort((a, b) => {
+      const [ax, ay] = a.split(",").map(Number), [bx, by] = b.split(",").map(Number);
+      return Math.max(Math.abs(bx - ptx), Math.abs(by - pty)) - Math.max(Math.abs(ax - ptx), Math.abs(ay - pty));
+    });
+    byDistance.slice(0, tileCache.size - MAX_CACHED_TILES).forEach((key) => tileCache.delete(key));
+  }
+  drawMaze();
+}
+
 /** Finds the first passage (0) cell, typically top-left, as the start */
 function findStartPosition() {
   if (!maze || maze.length === 0) return { x: 1, y: 1 }; // Fallback
@@ -447,62 +559,62 @@ function displayLeaderboard(scoresToDisplay, currentFilter) {
   });
 }
 
-/** Filters the full local leaderboard based on dropdown and displays top N */
-function filterAndDisplayLeaderboard() {
-  if (!leaderboardFilterSelect || !allLeaderboardScores) {
-    logger.error("Cannot filter leaderboard: elements or data missing.");
+/** Fetches the top N scores for the size selected in the dropdown and displays them */
+async function filterAndDisplayLeaderboard() {
+  if (!leaderboardFilterSelect || !leaderboardList) {
+    logger.error("Cannot filter leaderboard: elements missing.");
     return;
   }
   const selectedDim = leaderboardFilterSelect.value;
-  logger.info(`Filtering leaderboard for dimension: ${selectedDim}`);
-
-  let filteredScores = [];
-  // Filter and sort based on selection
-  if (selectedDim === "all") {
-    filteredScores = [...allLeaderboardScores].sort(
-      (a, b) => (a.time ?? Infinity) - (b.time ?? Infinity)
-    );
-  } else {
-    filteredScores = allLeaderboardScores
-      .filter((score) => score.dimension == selectedDim) // Use == for string comparison to number if needed
-      .sort((a, b) => (a.time ?? Infinity) - (b.time ?? Infinity));
-  }
-
-  // Slice to get only the top N entries for display
-  const scoresForDisplay = filteredScores.slice(0, MAX_LEADERBOARD_ENTRIES_DISPLAY);
-  displayLeaderboard(scoresForDisplay, selectedDim);
-}
-
-/** Fetches the complete leaderboard from the API and updates the display */
-async function fetchLeaderboard() {
-  logger.info("Fetching full leaderboard...");
-  if (!leaderboardList) {
-    logger.error("Leaderboard list element not found during fetch.");
-    return;
-  }
-  leaderboardList.innerHTML = '<li class="message">Loading...</li>'; // Show loading message
+  logger.info(`Fetching leaderboard for dimension: ${selectedDim}`);
+
+  // The server keeps scores sorted per dimension and returns just the top N
+  const params = new URLSearchParams({ limit: MAX_LEADERBOARD_ENTRIES_DISPLAY });
+  if (selectedDim !== "all") params.set("dimension", selectedDim);
+  const url = `/api/leaderboard?${params}`;
+  // Send the ETag of the copy we already have: an unchanged board comes back as an empty 304
+  const cachedPage = leaderboardPageCache.get(url);
   try {
-    const response = await fetch("/api/get_leaderboard"); // API returns all scores
+    const response = await fetch(url, {
+      headers: cachedPage ? { "If-None-Match": cachedPage.etag } : {},
+    });
+    if (response.status === 304 && cachedPage) {
+      logger.debug(`Leaderboard unchanged for dimension: ${selectedDim}`);
+      if (leaderboardFilterSelect.value === selectedDim) displayLeaderboard(cachedPage.scores, selectedDim);
+      return;
+    }
     if (!response.ok) {
       let errorMsg = `HTTP error! Status: ${response.status}`;
       try { const errData = await response.json(); errorMsg = errData.error || errorMsg; } catch (e) { /* ignore if no json body */ }
       throw new Error(errorMsg);
     }
-    const scores = await response.json();
-    if (!Array.isArray(scores)) {
-      logger.error("Leaderboard data received is not an array:", scores);
+    const page = await response.json();
+    if (!Array.isArray(page.scores)) {
+      logger.error("Leaderboard page received has no scores array:", page);
       throw new Error("Invalid data format from server.");
     }
-    allLeaderboardScores = scores; // Store the full list locally
-    logger.info(`Stored ${allLeaderboardScores.length} total scores locally.`);
-    filterAndDisplayLeaderboard(); // Filter and display the top N
+    const etag = response.headers.get("ETag");
+    if (etag) leaderboardPageCache.set(url, { etag: etag, scores: page.scores });
+    // Ignore the response if the user switched to another size in the meantime
+    if (leaderboardFilterSelect.value !== selectedDim) return;
+    displayLeaderboard(page.scores, selectedDim);
   } catch (error) {
     logger.error("Error fetching/processing leaderboard:", error);
-    allLeaderboardScores = []; // Reset local scores on error
-    if (leaderboardList) leaderboardList.innerHTML = '<li class="message">Error loading scores.</li>';
+    leaderboardList.innerHTML = '<li class="message">Error loading scores.</li>';
   }
 }
 
+/** Shows a loading message and fetches the top N scores for the current filter */
+async function fetchLeaderboard() {
+  logger.info("Fetching leaderboard...");
+  if (!leaderboardList) {
+    logger.error("Leaderboard list element not found during fetch.");
+    return;
+  }
+  leaderboardList.innerHTML = '<li class="message">Loading...</li>'; // Show loading message
+  await filterAndDisplayLeaderboard();
+}
+
 // =============================================================================
 // Score Submission & Ranking Functions
 // =============================================================================
@@ -548,15 +660,15 @@ async function submitScore(name, timeInSeconds, dimension) {
       try { const errData = await response.json(); errorMsg = errData.error || errorMsg; } catch (e) { logger.warn("No JSON error body from server on failed score submission."); }
       throw new Error(errorMsg);
     }
-    logger.info("Score submitted successfully to backend.");
+    // The server reports the new entry's overall and size-specific rank
+    const result = await response.json();
+    const rankData = result.rank || null;
+    logger.info("Score submitted successfully to backend. Rank data:", rankData);
     if (statusMessage) statusMessage.textContent = "Score saved!";
 
-    // Refresh local leaderboard data *after* successful submission
-    await fetchLeaderboard();
-    // Calculate rank based on the newly refreshed full leaderboard
-    const rankData = calculateUserRank(trimmedName, timeInSeconds, dimension);
-    logger.info("Rank data after submission:", rankData);
-    return { rankData: rankData, error: null }; // Return calculated rank data
+    // Refresh the displayed top N *after* successful submission
+    fetchLeaderboard();
+    return { rankData: rankData, error: null }; // Return the server-computed rank data
   } catch (error) {
     logger.error("Error submitting score via API:", error);
     if (statusMessage) statusMessage.textContent = "Error saving score.";
@@ -565,53 +677,24 @@ async function submitScore(name, timeInSeconds, dimension) {
 }
 
 /**
- * Calculates the user's rank based on the locally stored full leaderboard data.
- * @param {string} username The player's name.
+ * Asks the server which rank a score would get, without saving it.
  * @param {number} time The player's time for this run.
  * @param {number} dimension The dimension for this run.
- * @returns {{overall: number|null, size: number|null}} Object containing overall and size-specific ranks.
+ * @returns {Promise<{overall: number|null, size: number|null}>} Overall and size-specific ranks.
  */
-function calculateUserRank(username, time, dimension) {
-  logger.info(`Calculating rank for ${username}, ${time.toFixed(3)}s, ${dimension}x${dimension}`);
-  const ranks = { overall: null, size: null };
-
-  if (!allLeaderboardScores || allLeaderboardScores.length === 0) {
-    logger.warn("Rank calc: leaderboard data unavailable.");
-    return ranks;
-  }
-
-  // Calculate overall rank
-  const overallScores = [...allLeaderboardScores].sort(
-    (a, b) => (a.time ?? Infinity) - (b.time ?? Infinity)
-  );
-  // Find the index of the submitted score in the sorted list
-  const overallIdx = overallScores.findIndex(
-    (s) =>
-      s.name === username &&
-      s.dimension === dimension &&
-      Math.abs(s.time - time) < 0.0001 // Use tolerance for float comparison
-  );
-  if (overallIdx !== -1) {
-    ranks.overall = overallIdx + 1; // Rank is 1-based
-  } else {
-    logger.warn("Rank calc: score not found in overall sorted list (possible timing mismatch?).");
-  }
-
-  // Calculate rank specific to the maze size
-  const sizeSpecificScores = allLeaderboardScores
-    .filter((score) => score.dimension === dimension)
-    .sort((a, b) => (a.time ?? Infinity) - (b.time ?? Infinity));
-  const sizeIdx = sizeSpecificScores.findIndex(
-    (s) => s.name === username && Math.abs(s.time - time) < 0.0001
-  );
-  if (sizeIdx !== -1) {
-    ranks.size = sizeIdx + 1; // Rank is 1-based
-  } else {
-    logger.warn("Rank calc: score not found in size-specific list.");
+async function calculateUserRank(time, dimension) {
+  logger.info(`Previewing rank for ${time.toFixed(3)}s, ${dimension}x${dimension}`);
+  try {
+    const params = new URLSearchParams({ time: time, dimension: dimension });
+    const response = await fetch(`/api/rank?${params}`);
+    if (!response.ok) throw new Error(`HTTP error! Status: ${response.status}`);
+    const result = await response.json();
+    logger.info("Rank preview:", result.rank);
+    return result.rank;
+  } catch (error) {
+    logger.warn("Rank preview unavailable:", error);
+    return { overall: null, size: null };
   }
-
-  logger.info("Rank calculation complete:", ranks);
-  return ranks;
 }
 
 // =============================================================================
@@ -813,11 +896,15 @@ function displayAchievementNotification(newlyUnlockedIds) {
 function drawMaze() {
   requestAnimationFrame(() => {
     // Essential checks before drawing
-    if (!maze || maze.length === 0 || !ctx) {
+    if (!hasMaze() || !ctx) {
       return;
     }
-    const rows = maze.length;
-    const cols = maze[0].length;
+    // In tiled mode only a viewport around the player is drawn; (viewX, viewY) is its top-left cell
+    const size = mazeSize();
+    const rows = tiledMaze ? Math.min(VIEWPORT_CELLS, size.rows) : size.rows;
+    const cols = tiledMaze ? Math.min(VIEWPORT_CELLS, size.cols) : size.cols;
+    const viewX = tiledMaze ? Math.max(0, Math.min(player.x - Math.floor(cols / 2), size.cols - cols)) : 0;
+    const viewY = tiledMaze ? Math.max(0, Math.min(player.y - Math.floor(rows / 2), size.rows - rows)) : 0;
 
     // --- Calculate Responsive Tile Size ---
     const mazeDisplayArea = document.querySelector(".grid-maze-display");
@@ -856,8 +943,10 @@ function drawMaze() {
       for (let c = 0; c < cols; c++) {
         const drawX = c * tileSize;
         const drawY = r * tileSize;
-        if (maze[r]?.[c] === 1) ctx.fillStyle = "black"; // Wall
-        else if (r === goal.y && c === goal.x) ctx.fillStyle = "green"; // Goal
+        const gridX = c + viewX;
+        const gridY = r + viewY;
+        if (getCell(gridX, gridY) === 1) ctx.fillStyle = "black"; // Wall
+        else if (gridY === goal.y && gridX === goal.x) ctx.fillStyle = "green"; // Goal
         else ctx.fillStyle = "white"; // Passage
         if (tileSize > 0) ctx.fillRect(drawX, drawY, tileSize, tileSize);
       }
@@ -869,7 +958,7 @@ function drawMaze() {
       solutionPath.forEach(([pC, pR]) => { // path coords C, R (x, y)
         // Avoid drawing solution over current player or goal square
         if (!((pR === player.y && pC === player.x) || (pR === goal.y && pC === goal.x))) {
-          ctx.fillRect(pC * tileSize, pR * tileSize, tileSize, tileSize);
+          ctx.fillRect((pC - viewX) * tileSize, (pR - viewY) * tileSize, tileSize, tileSize);
         }
       });
     }
@@ -882,20 +971,20 @@ function drawMaze() {
         let alpha = TRAIL_MAX_ALPHA - (TRAIL_MAX_ALPHA - TRAIL_MIN_ALPHA) * ageRatio;
         alpha = Math.max(TRAIL_MIN_ALPHA, Math.min(TRAIL_MAX_ALPHA, alpha)); // Clamp alpha
         ctx.fillStyle = `rgba(${playerTrailColorRGB}, ${alpha})`; // Use cached RGB color string
-        ctx.fillRect(pos.x * tileSize, pos.y * tileSize, tileSize, tileSize);
+        ctx.fillRect((pos.x - viewX) * tileSize, (pos.y - viewY) * tileSize, tileSize, tileSize);
       });
     }
 
     // --- Draw Player ---
     if (tileSize > 0) {
       ctx.fillStyle = playerColor;
-      ctx.fillRect(player.x * tileSize, player.y * tileSize, tileSize, tileSize);
+      ctx.fillRect((player.x - viewX) * tileSize, (player.y - viewY) * tileSize, tileSize, tileSize);
     }
 
     // --- Draw Win Trophy ---
     // Ensure image is loaded (complete & has dimensions) before drawing
     if (gameWon && statusMessage?.textContent.includes("🎉") && trophyImg?.complete && trophyImg.naturalWidth > 0 && tileSize > 0) {
-      ctx.drawImage(trophyImg, goal.x * tileSize, goal.y * tileSize, tileSize, tileSize);
+      ctx.drawImage(trophyImg, (goal.x - viewX) * tileSize, (goal.y - viewY) * tileSize, tileSize, tileSize);
     }
   });
 }
@@ -920,6 +1009,10 @@ async function loadMaze(dimension) {
 
   // Reset game state variables
   maze = [];
+  mazeEnvelope = null;
+  mazeId = null;
+  tiledMaze = null;
+  tileCache = new Map();
   currentMazeDimension = dimension;
   gameWon = false;
   resetTimer();
@@ -929,16 +1022,24 @@ async function loadMaze(dimension) {
 
   tryStartMusic(); // Attempt to start music if interaction occurred
 
+  if (dimension >= TILED_MODE_MIN_DIMENSION) {
+    await loadTiledMaze(dimension);
+    return;
+  }
+
   try {
-    // Fetch maze data from the backend API
-    const response = await fetch(`/api/generate_maze/${currentMazeDimension}`);
+    // Fetch maze data from the backend API in the compact bit-packed format
+    const response = await fetch(`/api/generate_maze/${currentMazeDimension}?format=packed`);
     if (!response.ok) throw new Error(`Network error generating maze: ${response.status}`);
-    const data = await response.json();
-    // Basic validation of received data
-    if (!Array.isArray(data) || data.length === 0 || !Array.isArray(data[0])) {
+    const envelope = await response.json();
+    const data = decodePackedMaze(envelope);
+    // Basic validation of decoded data
+    if (data.length === 0 || data[0].length === 0) {
       throw new Error("Invalid maze data received from server");
     }
     maze = data;
+    mazeEnvelope = envelope;
+    mazeId = response.headers.get("X-Maze-Id");
     player = findStartPosition(); // Determine start/goal from the new maze
     goal = findGoalPosition();
     logger.info(`Maze loaded. Start:(${player.x},${player.y}), Goal:(${goal.x},${goal.y})`);
@@ -950,10 +1051,41 @@ async function loadMaze(dimension) {
     logger.error("Load maze error:", error);
     if (statusMessage) statusMessage.textContent = `Error loading maze: ${error.message}`;
     maze = []; // Ensure maze is empty on error
+    mazeEnvelope = null;
+    mazeId = null;
     if (ctx) ctx.clearRect(0, 0, canvas?.width ?? 0, canvas?.height ?? 0); // Clear canvas
   }
 }
 
+/**
+ * Creates a stored maze on the server and loads the tiles around the start position.
+ * Used for mazes too large to download and draw in full.
+ * @param {number} dimension Maze dimension in cells.
+ */
+async function loadTiledMaze(dimension) {
+  try {
+    const response = await fetch("/api/maze", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ dimension: dimension }),
+    });
+    if (!response.ok) throw new Error(`Network error creating maze: ${response.status}`);
+    const info = await response.json();
+    tiledMaze = { id: info.maze_id, rows: info.rows, cols: info.cols };
+    player = { ...info.start };
+    goal = { ...info.goal };
+    logger.info(`Tiled maze ${info.maze_id} created (${info.cols}x${info.rows} grid).`);
+    await ensureTilesAround(player.x, player.y);
+    if (statusMessage) statusMessage.textContent = ""; // Clear "Loading..."
+    drawMaze();
+  } catch (error) {
+    logger.error("Load tiled maze error:", error);
+    if (statusMessage) statusMessage.textContent = `Error loading maze: ${error.message}`;
+    tiledMaze = null;
+    if (ctx) ctx.clearRect(0, 0, canvas?.width ?? 0, canvas?.height ?? 0);
+  }
+}
+
 /**
  * Handles player movement based on dx, dy changes.
  * Updates player position, trail, checks for win condition.
@@ -967,11 +1099,7 @@ function movePlayer(dx, dy) {
   const nextY = player.y + dy;
 
   // Check if the next position is a valid passage within the maze bounds
-  if (
-    nextY >= 0 && nextY < maze.length &&
-    nextX >= 0 && nextX < (maze[0]?.length || 0) &&
-    maze[nextY][nextX] === 0
-  ) {
+  if (isPassage(nextX, nextY)) {
     // Update trail: Add previous position to front, remove oldest if too long
     playerTrailHistory.unshift({ x: player.x, y: player.y });
     if (playerTrailHistory.length > MAX_TRAIL_LENGTH) playerTrailHistory.pop();
@@ -980,6 +1108,7 @@ function movePlayer(dx, dy) {
     player.x = nextX; // Update player position
     player.y = nextY;
     drawMaze(); // Redraw the game state
+    if (tiledMaze) ensureTilesAround(player.x, player.y); // Prefetch tiles entering the viewport
 
     // --- Check for Win Condition ---
     if (player.x === goal.x && player.y === goal.y) {
@@ -1022,7 +1151,10 @@ function movePlayer(dx, dy) {
         );
       } else {
         logger.info("No username in session storage. Showing popup; will prompt for name after close.");
-        showPopup(finalTime, null, finalDimension, true); // Show popup (prompt needed later)
+        // Show the rank this time would get (prompt needed later to actually save it)
+        calculateUserRank(finalTime, finalDimension).then((rankData) =>
+          showPopup(finalTime, rankData, finalDimension, true)
+        );
       }
     }
   }
@@ -1030,18 +1162,28 @@ function movePlayer(dx, dy) {
 
 /** Fetches and displays the maze solution path from the API */
 async function solveMaze() {
-  if (!maze || maze.length === 0 || gameWon) return; // Can't solve if no maze or game won
+  if (!hasMaze() || gameWon) return; // Can't solve if no maze or game won
   if (statusMessage) statusMessage.textContent = "Solving...";
   tryStartMusic(); // Ensure audio context is active
   solutionPath = []; // Clear any previous solution
   drawMaze(); // Redraw without old path
 
   try {
-    const response = await fetch("/api/solve_maze", {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ maze: maze, start: player, goal: goal }),
-    });
+    // Mazes kept server-side (registered or tiled) are answered from their distance-to-goal
+    // field, which the server computes once per maze; repeated hints cost a lookup.
+    const serverMazeId = tiledMaze ? tiledMaze.id : mazeId;
+    let response = serverMazeId
+      ? await fetch(`/api/maze/${serverMazeId}/hint?x=${player.x}&y=${player.y}&full=1`)
+      : null;
+    if (!tiledMaze && (!response || response.status === 404)) {
+      // No id, or the server has expired it: send the maze itself (packed form when available)
+      mazeId = null;
+      response = await fetch("/api/solve_maze", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ maze: mazeEnvelope || maze, start: player, goal: goal }),
+      });
+    }
     if (!response.ok) {
       const errData = await response.json().catch(() => null); // Try parsing error body
       const errMsg = errData?.error || `Server error ${response.status}`;
@@ -1151,7 +1293,7 @@ function initializeGame() {
     playerTrailColorRGB = convertCssColorToRgbString(playerColor);
     logger.info(`Player color changed to: ${playerColor}`);
     // Redraw immediately only if game is active
-    if (!gameWon && maze?.length > 0) {
+    if (!gameWon && hasMaze()) {
       drawMaze();
     }
   });
@@ -1179,7 +1321,7 @@ function initializeGame() {
 /** Debounced function for handling window resize events */
 const debouncedDrawMaze = debounce(() => {
   logger.debug("Debounced resize event - redrawing maze.");
-  if (maze?.length > 0) {
+  if (hasMaze()) {
     drawMaze(); // Redraw with potentially new dimensions/tile size
   }
 }, 200); // Debounce timeout
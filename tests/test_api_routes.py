@@ -1,10 +1,26 @@
 # tests/test_api_routes.py 
 
+import csv
+import gzip
+import io
 import json
+import sys
+import time
 
 import pytest
 
-from app import app
+from app import (
+    app,
+    get_batch_executor,
+    get_leaderboard_store,
+    get_maze_pool,
+    maze_cache,
+    maze_registry,
+    solve_cache,
+)
+from src.leaderboard_log import LeaderboardLog
+from src.maze_format import from_envelope, unpack_grid
+from src.maze_store import MazeStore
 
 
 @pytest.fixture
@@ -66,6 +82,259 @@ def test_api_generate_maze_non_integer_dimension(client):
     assert response.status_code == 404  # Route itself won't match
 
 
+def test_api_generate_maze_packed_format(client):
+    """Test the base64 bit-packed JSON envelope decodes to a maze grid."""
+    response = client.get("/api/generate_maze/100?format=packed")
+    assert response.status_code == 200
+
+    envelope = response.get_json()
+    grid = from_envelope(envelope)
+    assert grid.shape == (201, 201)
+    assert set(grid.ravel().tolist()) == {0, 1}
+    # The envelope is many times smaller than the plain JSON list
+    plain = client.get("/api/generate_maze/100")
+    assert len(plain.data) > 8 * len(response.data)
+
+
+def test_api_generate_maze_binary_via_accept_header(client):
+    """Test that Accept: application/octet-stream selects the raw packed bytes."""
+    response = client.get(
+        "/api/generate_maze/5", headers={"Accept": "application/octet-stream"}
+    )
+    assert response.status_code == 200
+    assert response.mimetype == "application/octet-stream"
+
+    rows = int(response.headers["X-Maze-Rows"])
+    cols = int(response.headers["X-Maze-Cols"])
+    grid = unpack_grid(response.data, rows, cols)
+    assert grid.shape == (11, 11)
+
+
+def test_api_generate_maze_unknown_format(client):
+    """Test that an unsupported format is rejected with 400."""
+    response = client.get("/api/generate_maze/5?format=xml")
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_api_generate_maze_seeded_is_cached(client):
+    """Test that seeded mazes are reproducible and served from the cache on repeat."""
+    maze_cache.clear()
+    hits_before = maze_cache.stats()["hits"]
+
+    first = client.get("/api/generate_maze/10?seed=42&format=packed")
+    second = client.get("/api/generate_maze/10?seed=42&format=packed")
+    assert first.status_code == second.status_code == 200
+    assert first.get_json() == second.get_json()
+    assert first.headers["X-Maze-Seed"] == "42"
+    assert maze_cache.stats()["hits"] == hits_before + 1
+
+    # The cache key includes the format, and the seed determines the grid
+    as_list = client.get("/api/generate_maze/10?seed=42").get_json()
+    assert from_envelope(first.get_json()).tolist() == as_list
+
+
+def test_api_generate_maze_served_from_warm_pool(client):
+    """Test that unseeded requests pop ready mazes from the background pool."""
+    pool = get_maze_pool()
+    assert pool is not None
+    deadline = time.monotonic() + 5
+    while pool.stats()["depths"][str((100, "packed"))] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    hits_before = pool.stats()["hits"]
+
+    response = client.get("/api/generate_maze/100?format=packed")
+    assert response.status_code == 200
+    assert from_envelope(response.get_json()).shape == (201, 201)
+    assert pool.stats()["hits"] == hits_before + 1
+
+    stats = client.get("/api/stats").get_json()
+    assert stats["maze_pool"]["running"] is True
+
+
+def test_api_stats_does_not_start_maze_pool(client, monkeypatch):
+    """Test that a monitoring probe on a cold worker leaves the pool unstarted."""
+    monkeypatch.setattr("app.maze_pool", None)
+    stats = client.get("/api/stats").get_json()
+    assert stats["maze_pool"] is None
+    assert sys.modules["app"].maze_pool is None
+
+
+def test_api_generate_maze_binary_bypasses_pool(client):
+    """Test that formats the pool never holds do not count as pool misses."""
+    pool = get_maze_pool()
+    misses_before = pool.stats()["misses"]
+    response = client.get("/api/generate_maze/5?format=binary")
+    assert response.status_code == 200
+    assert response.mimetype == "application/octet-stream"
+    assert pool.stats()["misses"] == misses_before
+
+
+def test_api_generate_maze_algorithm_selection(client):
+    """Test that '?algorithm=' selects the generator and unknown names are rejected."""
+    response = client.get("/api/generate_maze/7?algorithm=sidewinder&seed=3")
+    assert response.status_code == 200
+    grid = response.get_json()
+    # Sidewinder always leaves the whole top row of cells open
+    assert all(cell == 0 for cell in grid[1][1:-1])
+
+    response = client.get("/api/generate_maze/7?algorithm=bogus")
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("seed", ["abc", "-5"])
+def test_api_generate_maze_invalid_seed(client, seed):
+    """Test that non-integer or negative seeds are rejected with 400."""
+    response = client.get(f"/api/generate_maze/5?seed={seed}")
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_api_generate_mazes_batch_streams_ndjson(client, monkeypatch):
+    """Test that a batch streams one NDJSON line per spec, matching single generation."""
+    monkeypatch.setitem(app.config, "MAZE_BATCH_WORKERS", 2)
+    monkeypatch.setattr("app.batch_executor", None)  # A pool sized for this test only
+    specs = [{"dimension": 5, "seed": seed} for seed in range(4)]
+    specs.append({"dimension": 10, "seed": 1, "algorithm": "prim"})
+    response = client.post("/api/generate_mazes", json={"mazes": specs})
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    results = {line["index"]: line for line in lines}
+    assert sorted(results) == list(range(len(specs)))
+    # Seeded batch entries are identical to the single-maze endpoint
+    single = client.get("/api/generate_maze/5?seed=2").get_json()
+    assert results[2]["maze"] == single
+    assert results[4]["algorithm"] == "prim" and len(results[4]["maze"]) == 21
+    get_batch_executor().shutdown()
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"mazes": []},
+        {"mazes": [{"dimension": 4}]},  # Not in VALID_DIMENSIONS
+        {"mazes": [{"dimension": 5, "seed": -1}]},
+        {"mazes": [{"seed": 1}]},
+        {"mazes": [{"dimension": 5}], "format": "binary"},
+        {"not_mazes": []},
+    ],
+)
+def test_api_generate_mazes_batch_invalid(client, payload):
+    """Test that malformed batches are rejected with 400 before any work starts."""
+    response = client.post("/api/generate_mazes", json=payload)
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_api_stream_maze_json(client):
+    """Test that the streamed JSON maze parses as a grid of the requested shape."""
+    response = client.get("/api/generate_maze/4/stream?rows=6&seed=1")
+    assert response.status_code == 200
+    assert response.is_streamed
+
+    grid = json.loads(response.get_data())
+    assert len(grid) == 13 and all(len(row) == 9 for row in grid)
+    assert int(response.headers["X-Maze-Rows"]) == 13
+
+
+def test_api_stream_maze_binary_matches_json(client):
+    """Test that binary rows (each padded to whole bytes) match the JSON stream."""
+    as_json = json.loads(client.get("/api/generate_maze/12/stream?seed=9").get_data())
+    response = client.get("/api/generate_maze/12/stream?seed=9&format=binary")
+    row_bytes = (25 + 7) // 8
+    data = response.get_data()
+    assert len(data) == 25 * row_bytes
+    rows = [unpack_grid(data[i:i + row_bytes], 1, row_bytes * 8)[0, :25].tolist()
+            for i in range(0, len(data), row_bytes)]
+    assert rows == as_json
+
+
+@pytest.mark.parametrize("query", ["rows=0", "rows=abc", "seed=-1", "format=packed"])
+def test_api_stream_maze_invalid_params(client, query):
+    """Test that invalid stream parameters are rejected with 400."""
+    response = client.get(f"/api/generate_maze/5/stream?{query}")
+    assert response.status_code == 400
+
+
+# --- API: Stored (Tiled) Mazes ---
+
+
+@pytest.fixture
+def tmp_store(tmp_path, monkeypatch):
+    """Points the app's maze store at a temporary directory."""
+    store = MazeStore(str(tmp_path / "mazes"))
+    monkeypatch.setattr("app.maze_store", store)
+    return store
+
+
+def test_api_stored_maze_tiles(client, tmp_store):
+    """Test creating a stored maze and reading windows of it through the tile API."""
+    response = client.post("/api/maze", json={"dimension": 1000, "seed": 4})
+    assert response.status_code == 201
+    info = response.get_json()
+    assert (info["rows"], info["cols"]) == (2001, 2001)
+    assert info["goal"] == {"x": 1999, "y": 1999}
+
+    tile = client.get(f"/api/maze/{info['maze_id']}/tile?x=64&y=128&w=64&h=64").get_json()
+    full = tmp_store.open(info["maze_id"])
+    assert tile == full[128:192, 64:128].tolist()
+
+    packed = client.get(f"/api/maze/{info['maze_id']}/tile?x=1984&y=0&w=64&h=8&format=packed")
+    assert from_envelope(packed.get_json()).shape == (8, 17)  # Clipped at the right edge
+
+    meta = client.get(f"/api/maze/{info['maze_id']}").get_json()
+    assert meta["dimension"] == 1000 and meta["seed"] == 4
+
+
+@pytest.mark.parametrize(
+    "query, status",
+    [("x=-1", 400), ("w=0", 400), ("w=100000", 400), ("x=abc", 400), ("x=5000", 400)],
+)
+def test_api_stored_maze_tile_invalid(client, tmp_store, query, status):
+    """Test tile parameter validation and out-of-range windows."""
+    maze_id = tmp_store.generate(10)
+    response = client.get(f"/api/maze/{maze_id}/tile?{query}")
+    assert response.status_code == status
+
+
+def test_api_maze_hint_registered_and_stored(client, tmp_store):
+    """Test hints from the distance field for registered and stored mazes."""
+    maze_id = client.get("/api/generate_maze/10?seed=3").headers["X-Maze-Id"]
+    stored_id = tmp_store.generate(10, seed=3)
+
+    for hint_id in (maze_id, stored_id):
+        hint = client.get(f"/api/maze/{hint_id}/hint?x=1&y=1").get_json()
+        full = client.get(f"/api/maze/{hint_id}/hint?x=1&y=1&full=1").get_json()
+        assert hint["distance"] == len(full["path"]) > 0
+        assert [hint["next"]["x"], hint["next"]["y"]] == full["path"][0]
+        assert full["path"][-1] == [19, 19]
+        assert "path" not in hint
+
+    at_goal = client.get(f"/api/maze/{maze_id}/hint?x=19&y=19").get_json()
+    assert at_goal["distance"] == 0 and at_goal["next"] is None
+
+
+@pytest.mark.parametrize("query, status", [("x=1", 400), ("x=a&y=1", 400), ("x=0&y=0", 400), ("x=99&y=1", 400)])
+def test_api_maze_hint_invalid(client, query, status):
+    """Test hint parameter validation and unknown mazes."""
+    maze_id = client.get("/api/generate_maze/5").headers["X-Maze-Id"]
+    assert client.get(f"/api/maze/{maze_id}/hint?{query}").status_code == status
+
+
+def test_api_maze_hint_unknown_maze(client, tmp_store):
+    assert client.get(f"/api/maze/{'0' * 32}/hint?x=1&y=1").status_code == 404
+
+
+def test_api_stored_maze_not_found_and_invalid_create(client, tmp_store):
+    """Test unknown ids return 404 and oversized dimensions are rejected."""
+    assert client.get(f"/api/maze/{'0' * 32}/tile").status_code == 404
+    assert client.get("/api/maze/not-an-id").status_code == 404
+    assert client.post("/api/maze", json={"dimension": 10**6}).status_code == 400
+    assert client.post("/api/maze", json={}).status_code == 400
+
+
 # --- API: Maze Solving ---
 
 
@@ -84,6 +353,166 @@ def test_api_solve_maze_valid(client):
     # assert data["path"] == [(0, 1), (0, 2), (1, 2), (2, 2)] # Example expected path
 
 
+def test_api_solve_maze_packed_envelope(client):
+    """Test solving a maze sent back in the packed envelope format."""
+    envelope = client.get("/api/generate_maze/5?format=packed").get_json()
+    payload = {"maze": envelope, "start": {"x": 1, "y": 1}, "goal": {"x": 9, "y": 9}}
+    response = client.post(
+        "/api/solve_maze", data=json.dumps(payload), content_type="application/json"
+    )
+    assert response.status_code == 200
+    assert response.get_json()["path"][-1] == [9, 9]
+
+
+@pytest.mark.parametrize("strategy", ["bfs", "astar", "bidirectional"])
+def test_api_solve_maze_strategies(client, strategy):
+    """Test that every strategy returns a shortest path along with its expansion count."""
+    maze_data = [[0, 0, 0], [1, 1, 0], [0, 0, 0]]
+    payload = {
+        "maze": maze_data,
+        "start": {"x": 0, "y": 0},
+        "goal": {"x": 0, "y": 2},
+        "strategy": strategy,
+    }
+    response = client.post(
+        "/api/solve_maze", data=json.dumps(payload), content_type="application/json"
+    )
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["strategy"] == strategy
+    assert data["path"] == [[1, 0], [2, 0], [2, 1], [2, 2], [1, 2], [0, 2]]
+    assert data["expanded"] > 0
+
+
+def test_api_solve_maze_unknown_strategy(client):
+    """Test that an unknown strategy is rejected."""
+    payload = {"maze": [[0]], "start": {"x": 0, "y": 0}, "goal": {"x": 0, "y": 0}, "strategy": "dfs"}
+    response = client.post(
+        "/api/solve_maze", data=json.dumps(payload), content_type="application/json"
+    )
+    assert response.status_code == 400
+    assert "Unknown strategy" in response.get_json()["error"]
+
+
+@pytest.mark.parametrize("query", ["", "?seed=9", "?format=packed"])
+def test_api_solve_maze_by_id(client, query):
+    """Test that generated mazes are registered and can be solved by id alone."""
+    response = client.get(f"/api/generate_maze/10{query}")
+    maze_id = response.headers["X-Maze-Id"]
+    # Repeat requests (cache hits included) still carry a usable id
+    if "seed" in query:
+        assert client.get(f"/api/generate_maze/10{query}").headers["X-Maze-Id"] == maze_id
+
+    payload = {"maze_id": maze_id, "start": {"x": 1, "y": 1}, "goal": {"x": 19, "y": 19}}
+    response = client.post(
+        "/api/solve_maze", data=json.dumps(payload), content_type="application/json"
+    )
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["path"][-1] == [19, 19]
+    # Registered perfect mazes are answered from the tree index unless a search is requested
+    assert data["strategy"] == "tree"
+
+    payload["strategy"] = "bfs"
+    response = client.post(
+        "/api/solve_maze", data=json.dumps(payload), content_type="application/json"
+    )
+    assert response.get_json()["strategy"] == "bfs"
+    assert response.get_json()["path"] == data["path"]
+
+
+def test_api_solve_maze_unknown_id(client):
+    """Test that an unknown or expired maze id returns 404."""
+    maze_registry.clear()
+    payload = {"maze_id": "0" * 32, "start": {"x": 1, "y": 1}, "goal": {"x": 1, "y": 1}}
+    response = client.post(
+        "/api/solve_maze", data=json.dumps(payload), content_type="application/json"
+    )
+    assert response.status_code == 404
+    assert "maze_id" in response.get_json()["error"]
+
+
+def test_api_solve_maze_batch(client):
+    """Test that batch queries are answered in order, with or without a registered maze."""
+    response = client.get("/api/generate_maze/5?format=packed")
+    envelope, maze_id = response.get_json(), response.headers["X-Maze-Id"]
+    queries = [
+        {"start": {"x": 1, "y": 1}, "goal": {"x": 9, "y": 9}},
+        {"start": {"x": 9, "y": 9}, "goal": {"x": 1, "y": 1}},
+        {"start": {"x": 1, "y": 1}, "goal": {"x": 0, "y": 0}},  # Wall
+    ]
+    by_grid = client.post("/api/solve_maze/batch", json={"maze": envelope, "queries": queries})
+    by_id = client.post("/api/solve_maze/batch", json={"maze_id": maze_id, "queries": queries})
+    assert by_grid.status_code == by_id.status_code == 200
+
+    paths = by_grid.get_json()["paths"]
+    assert paths == by_id.get_json()["paths"]
+    assert paths[0][-1] == [9, 9] and paths[1][-1] == [1, 1]
+    assert len(paths[0]) == len(paths[1])
+    assert paths[2] is None
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"maze": [[0]]},
+        {"maze": [[0]], "queries": []},
+        {"maze": [[0]], "queries": [{"start": {"x": 0}}]},
+        {"maze": "grid", "queries": [{"start": {"x": 0, "y": 0}, "goal": {"x": 0, "y": 0}}]},
+    ],
+)
+def test_api_solve_maze_batch_invalid(client, payload):
+    """Test that malformed batch requests are rejected with 400."""
+    response = client.post("/api/solve_maze/batch", json=payload)
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_api_solve_maze_result_cache(client):
+    """Test that identical solve requests hit the content-hashed result cache."""
+    solve_cache.clear()
+    maze_data = [[0, 0, 0], [1, 1, 0], [0, 0, 0]]
+    payload = {"maze": maze_data, "start": {"x": 0, "y": 0}, "goal": {"x": 0, "y": 2}}
+    stats_before = solve_cache.stats()
+
+    first = client.post("/api/solve_maze", json=payload)
+    second = client.post("/api/solve_maze", json=payload)
+    assert first.get_json() == second.get_json()
+    assert solve_cache.stats()["hits"] == stats_before["hits"] + 1
+
+    # A different goal or a different grid is a separate entry
+    client.post("/api/solve_maze", json=dict(payload, goal={"x": 2, "y": 0}))
+    maze_data[1][0] = 0
+    changed = client.post("/api/solve_maze", json=dict(payload, maze=maze_data)).get_json()
+    assert changed["path"] == [[0, 1], [0, 2]]
+    assert solve_cache.stats()["entries"] == 3
+
+    stats = client.get("/api/stats").get_json()["solve_cache"]
+    assert stats["hits"] >= 1 and stats["entries"] == 3
+
+
+@pytest.mark.parametrize(
+    "maze, message",
+    [
+        ([[0, 0], [0]], "equal length"),
+        ([["a", "b"]], "0 (passage) or 1 (wall)"),
+        ([[0, 2], [1, 0]], "0 (passage) or 1 (wall)"),
+        ([[[0]]], "non-empty lists"),
+        ([], "non-empty list"),
+    ],
+)
+def test_api_solve_maze_malformed_grid(client, maze, message):
+    """Test that ragged, non-numeric, out-of-domain or non-2D grids get a clear 400."""
+    payload = {"maze": maze, "start": {"x": 0, "y": 0}, "goal": {"x": 0, "y": 0}}
+    for endpoint, body in (
+        ("/api/solve_maze", payload),
+        ("/api/solve_maze/batch", {"maze": maze, "queries": [payload]}),
+    ):
+        response = client.post(endpoint, json=body)
+        assert response.status_code == 400
+        assert message in response.get_json()["error"]
+
+
 def test_api_solve_maze_missing_fields(client):
     """Test error handling when required fields (start, goal) are missing."""
     payload = {"maze": [[0, 0], [0, 0]]}  # Missing start and goal
@@ -128,4 +557,220 @@ def test_api_solve_maze_out_of_bounds(client):
 
     data = response.get_json()
     assert "path" in data
-    assert data["path"] is None  # No path should be found
\ No newline at end of file
+    assert data["path"] is None  # No path should be found
+
+# --- API: Leaderboard ---
+
+
+@pytest.fixture
+def tmp_leaderboard(tmp_path, monkeypatch):
+    """Points the app's leaderboard (JSON log backend) at a temporary directory."""
+    log = LeaderboardLog(str(tmp_path / "leaderboard.json"))
+    monkeypatch.setattr("app.leaderboard_store", log)
+    yield log
+    log.close()
+
+
+def test_api_add_score_appends_to_log(client, tmp_leaderboard):
+    """Test that added scores are served sorted by time and land in the snapshot on compaction."""
+    for name, time_taken in [("slow", 12.5), ("fast", 3.25)]:
+        response = client.post(
+            "/api/add_score", json={"name": name, "time": time_taken, "dimension": 5}
+        )
+        assert response.status_code == 201
+
+    scores = client.get("/api/get_leaderboard").get_json()
+    assert [s["name"] for s in scores] == ["fast", "slow"]
+    assert tmp_leaderboard.pending() == 2
+
+    tmp_leaderboard.compact()
+    with open(tmp_leaderboard.snapshot_path) as f:
+        assert json.load(f) == scores
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [{"name": "a", "time": 1.0}, {"name": " ", "time": 1.0, "dimension": 5},
+     {"name": "a", "time": -1, "dimension": 5}, {"name": "a", "time": 1.0, "dimension": 4}],
+)
+def test_api_add_score_invalid(client, tmp_leaderboard, payload):
+    """Test that invalid scores are rejected without touching the log."""
+    response = client.post("/api/add_score", json=payload)
+    assert response.status_code == 400
+    assert tmp_leaderboard.pending() == 0
+
+
+@pytest.mark.parametrize("time_value", [float("nan"), "nan", "inf", float("inf")])
+def test_api_add_score_rejects_non_finite_time(client, tmp_leaderboard, time_value):
+    """Test that NaN and infinite times are rejected before they reach the sorted lists."""
+    response = client.post(
+        "/api/add_score", json={"name": "a", "time": time_value, "dimension": 5}
+    )
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Invalid time value"
+    assert tmp_leaderboard.scores() == []
+
+
+def test_api_get_leaderboard_serves_cached_bytes(client, tmp_leaderboard, monkeypatch):
+    """Test that repeated reads reuse the serialized leaderboard until a score is added."""
+    loads = []
+    scores = tmp_leaderboard.scores
+    monkeypatch.setattr(tmp_leaderboard, "scores", lambda: loads.append(1) or scores())
+
+    client.post("/api/add_score", json={"name": "a", "time": 5.0, "dimension": 5})
+    first = client.get("/api/get_leaderboard")
+    second = client.get("/api/get_leaderboard")
+    assert second.get_data() == first.get_data()
+    assert len(loads) == 1
+
+    client.post("/api/add_score", json={"name": "b", "time": 1.0, "dimension": 5})
+    assert [s["name"] for s in client.get("/api/get_leaderboard").get_json()] == ["b", "a"]
+    assert len(loads) == 2
+
+
+def test_api_leaderboard_sqlite_backend_migrates_json(client, tmp_path, monkeypatch):
+    """Test that the SQLite backend imports the JSON leaderboard and serves new scores."""
+    json_file = tmp_path / "leaderboard.json"
+    old = [{"name": "old", "time": 4.0, "dimension": 5, "timestamp": "2025-01-01T00:00:00Z"}]
+    json_file.write_text(json.dumps(old))
+    monkeypatch.setitem(app.config, "LEADERBOARD_BACKEND", "sqlite")
+    monkeypatch.setitem(app.config, "LEADERBOARD_FILE", str(json_file))
+    monkeypatch.setitem(app.config, "LEADERBOARD_DB_FILE", str(tmp_path / "leaderboard.sqlite3"))
+    monkeypatch.setattr("app.leaderboard_store", None)
+
+    response = client.post("/api/add_score", json={"name": "new", "time": 2.0, "dimension": 5})
+    assert response.status_code == 201
+    scores = client.get("/api/get_leaderboard").get_json()
+    assert [s["name"] for s in scores] == ["new", "old"]
+    assert client.get("/api/stats").get_json()["leaderboard"]["backend"] == "sqlite"
+    get_leaderboard_store().close()
+
+
+def test_api_leaderboard_pages(client, tmp_leaderboard):
+    """Test per-dimension pages and following 'next_cursor' through the whole list."""
+    for i, time_taken in enumerate([4.0, 2.0, 6.0, 1.0, 3.0]):
+        client.post(
+            "/api/add_score",
+            json={"name": f"p{i}", "time": time_taken, "dimension": 5 if i % 2 else 10},
+        )
+
+    page = client.get("/api/leaderboard?dimension=5").get_json()
+    assert [s["time"] for s in page["scores"]] == [1.0, 2.0]
+    assert page["next_cursor"] is None and page["dimension"] == 5
+
+    times, cursor = [], None
+    while True:
+        query = "/api/leaderboard?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        page = client.get(query).get_json()
+        times.extend(s["time"] for s in page["scores"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert times == [1.0, 2.0, 3.0, 4.0, 6.0]
+
+
+@pytest.mark.parametrize("query", ["limit=0", "limit=1000", "dimension=x", "cursor=abc"])
+def test_api_leaderboard_invalid_params(client, tmp_leaderboard, query):
+    """Test that malformed page parameters are rejected with 400."""
+    assert client.get(f"/api/leaderboard?{query}").status_code == 400
+
+
+def test_api_add_score_returns_rank_and_rank_preview(client, tmp_leaderboard):
+    """Test that add_score reports the new entry's ranks and /api/rank previews them."""
+    client.post("/api/add_score", json={"name": "a", "time": 2.0, "dimension": 10})
+    response = client.post("/api/add_score", json={"name": "b", "time": 3.0, "dimension": 5})
+    assert response.status_code == 201
+    assert response.get_json()["rank"] == {"overall": 2, "size": 1}
+
+    preview = client.get("/api/rank?dimension=5&time=2.5").get_json()
+    assert preview["rank"] == {"overall": 2, "size": 1}
+    assert client.get("/api/rank?time=10").get_json()["rank"] == {"overall": 3, "size": None}
+
+
+@pytest.mark.parametrize("query", ["", "time=abc", "time=-1", "time=nan", "time=1&dimension=x"])
+def test_api_rank_invalid_params(client, tmp_leaderboard, query):
+    """Test that /api/rank rejects missing or malformed parameters."""
+    assert client.get(f"/api/rank?{query}").status_code == 400
+
+
+# --- API: Conditional Requests & Compression ---
+
+
+def test_api_get_leaderboard_etag_and_304(client, tmp_leaderboard):
+    """Test that an unchanged leaderboard answers If-None-Match with an empty 304."""
+    client.post("/api/add_score", json={"name": "a", "time": 5.0, "dimension": 5})
+    first = client.get("/api/get_leaderboard")
+    etag = first.headers["ETag"]
+
+    again = client.get("/api/get_leaderboard", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.get_data() == b""
+    assert again.headers["ETag"] == etag
+
+    client.post("/api/add_score", json={"name": "b", "time": 1.0, "dimension": 5})
+    changed = client.get("/api/get_leaderboard", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+
+
+def test_api_leaderboard_page_etag(client, tmp_leaderboard):
+    """Test that leaderboard pages carry ETags per query and honor If-None-Match."""
+    client.post("/api/add_score", json={"name": "a", "time": 5.0, "dimension": 5})
+    etag = client.get("/api/leaderboard?dimension=5").headers["ETag"]
+    assert client.get("/api/leaderboard?dimension=10").headers["ETag"] != etag
+    cached = client.get("/api/leaderboard?dimension=5", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+
+def test_api_generate_maze_gzip_and_etag(client):
+    """Test that large maze JSON is gzip-encoded and seeded mazes revalidate with 304."""
+    response = client.get("/api/generate_maze/100?seed=9", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    body = gzip.decompress(response.get_data())
+    assert len(json.loads(body)) == 201
+    assert len(response.get_data()) < len(body) // 5
+
+    again = client.get(
+        "/api/generate_maze/100?seed=9",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["ETag"]},
+    )
+    assert again.status_code == 304
+    assert again.headers["X-Maze-Id"] == response.headers["X-Maze-Id"]
+
+    plain = client.get("/api/generate_maze/100?seed=9")
+    assert "Content-Encoding" not in plain.headers
+    assert plain.get_data() == body
+
+
+# --- API: Leaderboard Export ---
+
+
+def test_api_leaderboard_export_ndjson_and_csv(client, tmp_leaderboard, monkeypatch):
+    """Test streaming the leaderboard as NDJSON and CSV, filtered by dimension and date."""
+    monkeypatch.setitem(app.config, "LEADERBOARD_EXPORT_BATCH_SIZE", 2)
+    for i, (name, time_taken, dimension) in enumerate(
+        [("a", 3.0, 5), ("b, the second", 1.0, 10), ("c", 2.0, 5), ("d", 4.0, 5)]
+    ):
+        tmp_leaderboard.add(
+            {"name": name, "time": time_taken, "dimension": dimension,
+             "timestamp": f"2025-03-0{i + 1}T12:00:00Z"}
+        )
+
+    response = client.get("/api/leaderboard/export?dimension=5")
+    assert response.status_code == 200 and response.is_streamed
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [s["name"] for s in lines] == ["c", "a", "d"]
+
+    response = client.get("/api/leaderboard/export?format=csv&since=2025-03-02")
+    assert response.mimetype == "text/csv"
+    assert "leaderboard.csv" in response.headers["Content-Disposition"]
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert rows[0] == ["name", "time", "dimension", "timestamp"]
+    assert [row[0] for row in rows[1:]] == ["b, the second", "c", "d"]
+
+
+@pytest.mark.parametrize("query", ["format=xml", "dimension=x", "since=yesterday"])
+def test_api_leaderboard_export_invalid_params(client, tmp_leaderboard, query):
+    """Test that unsupported formats and malformed filters are rejected."""
+    assert client.get(f"/api/leaderboard/export?{query}").status_code == 400
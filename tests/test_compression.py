@@ -0,0 +1,21 @@
+# tests/test_compression.py
+
+import gzip
+
+import pytest
+
+from src.compression import CONTENT_ENCODINGS, compress
+
+
+def test_gzip_is_deterministic_and_round_trips():
+    """gzip output has no timestamp, so equal bodies compress to equal bytes."""
+    body = b"[[1, 0, 1, 0]]" * 500
+    assert "gzip" in CONTENT_ENCODINGS
+    assert compress(body, "gzip") == compress(body, "gzip")
+    assert gzip.decompress(compress(body, "gzip")) == body
+    assert len(compress(body, "gzip")) < len(body) // 10
+
+
+def test_unknown_encoding_is_rejected():
+    with pytest.raises(ValueError):
+        compress(b"{}", "deflate")
@@ -0,0 +1,273 @@
+# tests/test_leaderboard_log.py
+
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+from src.leaderboard_log import LeaderboardLog
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    """Provides the path of a leaderboard snapshot in a temporary directory."""
+    return str(tmp_path / "leaderboard.json")
+
+
+def score(name, time, dimension=5):
+    return {"name": name, "time": time, "dimension": dimension, "timestamp": "2025-01-01T00:00:00Z"}
+
+
+# ==============================================================================
+# LeaderboardLog Tests
+# ==============================================================================
+
+
+def test_add_appends_without_rewriting_snapshot(snapshot_path):
+    """Scores go to the log only and are kept in time order in memory."""
+    with open(snapshot_path, "w") as f:
+        json.dump([score("old", 5.0)], f)
+    log = LeaderboardLog(snapshot_path)
+    log.add(score("b", 9.0))
+    log.add(score("a", 1.0))
+
+    assert [s["name"] for s in log.scores()] == ["a", "old", "b"]
+    assert log.pending() == 2
+    with open(snapshot_path) as f:
+        assert json.load(f) == [score("old", 5.0)]
+    with open(log.log_path) as f:
+        assert len(f.read().splitlines()) == 3  # Header + two scores
+
+
+def test_reload_replays_log(snapshot_path):
+    """A fresh instance rebuilds the same leaderboard from the snapshot and the log."""
+    log = LeaderboardLog(snapshot_path)
+    for i, t in enumerate([3.0, 1.0, 2.0]):
+        log.add(score(f"p{i}", t))
+    log.close()
+
+    reloaded = LeaderboardLog(snapshot_path)
+    assert reloaded.scores() == log.scores()
+
+
+def test_compact_writes_archive_compatible_snapshot(snapshot_path):
+    """Compaction writes the sorted, indented JSON list and empties the log."""
+    log = LeaderboardLog(snapshot_path)
+    log.add(score("slow", 8.0))
+    log.add(score("fast", 2.0))
+    assert log.compact()
+    assert not log.compact()  # Nothing left to fold
+
+    with open(snapshot_path) as f:
+        content = f.read()
+    assert json.loads(content) == [score("fast", 2.0), score("slow", 8.0)]
+    assert '\n    {\n        "name"' in content  # indent=4, as before
+    assert log.pending() == 0
+    assert LeaderboardLog(snapshot_path).scores() == log.scores()
+
+
+def test_crash_after_snapshot_replace_does_not_duplicate(snapshot_path, monkeypatch):
+    """If the log reset never happens, the header keeps folded scores from being replayed."""
+    log = LeaderboardLog(snapshot_path)
+    log.add(score("a", 1.0))
+    log.add(score("b", 2.0))
+
+    def crash(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(log, "_write_log", crash)
+    with pytest.raises(OSError):
+        log.compact()
+
+    reloaded = LeaderboardLog(snapshot_path)
+    assert [s["name"] for s in reloaded.scores()] == ["a", "b"]
+    assert reloaded.pending() == 0
+
+
+def test_torn_last_line_is_skipped(snapshot_path):
+    """A partially written line at the end of the log is ignored on load."""
+    log = LeaderboardLog(snapshot_path)
+    log.add(score("a", 1.0))
+    log.close()
+    with open(log.log_path, "a") as f:
+        f.write('{"name": "b", "ti')
+
+    assert [s["name"] for s in LeaderboardLog(snapshot_path).scores()] == ["a"]
+
+
+def test_background_compactor(snapshot_path):
+    """The compactor thread folds logged scores into the snapshot."""
+    log = LeaderboardLog(snapshot_path)
+    log.add(score("a", 1.0))
+    log.start(interval=0.01)
+    try:
+        for _ in range(500):
+            if log.pending() == 0:
+                break
+            time.sleep(0.01)
+    finally:
+        log.close()
+    assert log.stats()["compactions"] >= 1
+    with open(snapshot_path) as f:
+        assert json.load(f) == [score("a", 1.0)]
+
+
+def test_other_instances_writes_are_picked_up(snapshot_path):
+    """A second instance on the same files (another worker) sees new scores and compactions."""
+    writer = LeaderboardLog(snapshot_path)
+    reader = LeaderboardLog(snapshot_path)
+    assert reader.scores() == []
+    version = reader.version()
+
+    writer.add(score("a", 1.0))
+    assert reader.version() != version
+    assert [s["name"] for s in reader.scores()] == ["a"]
+
+    writer.compact()
+    reader.add(score("b", 2.0))
+    writer.add(score("c", 0.5))
+    assert [s["name"] for s in reader.scores()] == ["c", "a", "b"]
+    assert [s["name"] for s in writer.scores()] == ["c", "a", "b"]
+    writer.close()
+    reader.close()
+
+
+def test_alternating_writers_read_only_new_lines(snapshot_path):
+    """Instances taking turns read each other's appends incrementally, not by full reloads."""
+    with open(snapshot_path, "w") as f:
+        json.dump([score(f"old{i}", float(i)) for i in range(2000)], f)
+    first = LeaderboardLog(snapshot_path)
+    second = LeaderboardLog(snapshot_path)
+    for i in range(50):
+        first.add(score(f"a{i}", i + 0.25))
+        second.add(score(f"b{i}", i + 0.75))
+    assert first.scores() == second.scores()
+    assert len(first.scores()) == 2100
+    assert first.stats()["reloads"] == second.stats()["reloads"] == 1
+
+    first.compact()  # A new snapshot and log: the other instance reloads once
+    second.add(score("c", 0.5))
+    assert second.stats()["reloads"] == 2
+    assert first.scores() == second.scores()
+    first.close()
+    second.close()
+
+
+def test_torn_line_does_not_swallow_next_append(snapshot_path):
+    """A crash-torn line left at the end of the log is terminated before the next append."""
+    log = LeaderboardLog(snapshot_path)
+    log.add(score("a", 1.0))
+    log.close()
+    with open(log.log_path, "a") as f:
+        f.write('{"name": "b", "ti')
+
+    log = LeaderboardLog(snapshot_path)
+    log.add(score("c", 2.0))
+    log.close()
+    assert [s["name"] for s in LeaderboardLog(snapshot_path).scores()] == ["a", "c"]
+
+
+def test_cursor_is_valid_across_instances_and_compaction(snapshot_path):
+    """A page key from one instance continues correctly on another after a compaction."""
+    writer = LeaderboardLog(snapshot_path)
+    for i in range(6):
+        writer.add(score(f"tie{i}", 2.0))
+    writer.add(score("fast", 1.0))
+    first_page, after = writer.page(None, 3)
+    writer.compact()
+
+    other = LeaderboardLog(snapshot_path)
+    other.add(score("slow", 3.0))
+    rest, after_rest = other.page(None, 10, after)
+    assert after_rest is None
+    names = [s["name"] for s in first_page + rest]
+    assert names[0] == "fast" and names[-1] == "slow"
+    assert sorted(names[1:-1]) == [f"tie{i}" for i in range(6)]
+    writer.close()
+    other.close()
+
+
+def test_exact_duplicates_are_not_split_across_pages(snapshot_path):
+    """Identical entries share a key, so a page extends over all of them."""
+    log = LeaderboardLog(snapshot_path)
+    for _ in range(3):
+        log.add(score("same", 2.0))
+    log.add(score("later", 4.0))
+    assert log.add(score("same", 2.0)) == (4, 4)  # Ranked after the existing equal times
+
+    entries, after = log.page(None, 2)
+    assert len(entries) == 4
+    assert log.page(None, 2, after) == ([score("later", 4.0)], None)
+
+
+def test_version_is_stable_without_changes(snapshot_path):
+    """Reads without writes keep the same version; an add bumps it."""
+    log = LeaderboardLog(snapshot_path)
+    log.add(score("a", 1.0))
+    version = log.version()
+    assert log.version() == version
+    log.add(score("b", 2.0))
+    assert log.version() != version
+    log.close()
+
+
+def test_group_commit_batches_concurrent_adds(snapshot_path):
+    """Concurrent adds through the writer thread share batches and all get ranks."""
+    log = LeaderboardLog(snapshot_path, fsync=True, group_commit_window=0.05)
+    log.start(interval=60)
+    results = []
+
+    def submit(i):
+        results.append(log.add(score(f"p{i}", float(i))))
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    log.close()
+
+    assert sorted(overall for overall, _ in results) == list(range(1, 21))
+    assert log.stats()["write_batches"] < 20
+    assert len(LeaderboardLog(snapshot_path).scores()) == 20
+
+
+def _stress_worker(snapshot_path, worker, count):
+    """Adds 'count' scores from several threads while compacting in the background."""
+    log = LeaderboardLog(snapshot_path, group_commit_window=0.001)
+    log.start(interval=0.01)
+    threads = [
+        threading.Thread(
+            target=lambda t=t: [log.add(score(f"w{worker}-t{t}-{i}", i * 0.5)) for i in range(count)]
+        )
+        for t in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    log.close()
+
+
+def test_multi_process_writers_lose_nothing(snapshot_path):
+    """Several processes adding and compacting concurrently keep every score exactly once."""
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_stress_worker, args=(snapshot_path, worker, 30)) for worker in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    log = LeaderboardLog(snapshot_path)
+    names = [s["name"] for s in log.scores()]
+    assert len(names) == len(set(names)) == 4 * 3 * 30
+    log.compact()
+    with open(snapshot_path) as f:
+        assert len(json.load(f)) == 4 * 3 * 30
+    assert not [name for name in os.listdir(os.path.dirname(snapshot_path)) if name.endswith(".tmp")]
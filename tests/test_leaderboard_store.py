@@ -0,0 +1,161 @@
+# tests/test_leaderboard_store.py
+
+import json
+import threading
+
+import pytest
+
+from src.leaderboard_log import LeaderboardLog
+from src.leaderboard_store import SqliteLeaderboard, iter_scores
+
+
+def score(name, time, dimension=5):
+    return {"name": name, "time": time, "dimension": dimension, "timestamp": "2025-01-01T00:00:00Z"}
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Provides an empty SQLite leaderboard in a temporary directory."""
+    store = SqliteLeaderboard(str(tmp_path / "leaderboard.sqlite3"))
+    yield store
+    store.close()
+
+
+# ==============================================================================
+# SqliteLeaderboard Tests
+# ==============================================================================
+
+
+def test_scores_and_page_are_sorted_by_time(db):
+    """All scores come back by time; page() filters by dimension and limits."""
+    for name, time, dimension in [("a", 9.0, 5), ("b", 2.0, 10), ("c", 4.0, 5), ("d", 1.0, 5)]:
+        db.add(score(name, time, dimension))
+
+    assert [s["name"] for s in db.scores()] == ["d", "b", "c", "a"]
+    assert db.page(5, 2)[0] == [score("d", 1.0), score("c", 4.0)]
+    assert db.page(100, 10) == ([], None)
+    assert db.stats() == {"backend": "sqlite", "entries": 4}
+
+
+def test_page_is_an_index_range_scan(db):
+    """The per-dimension query is answered from the (dimension, time) index without sorting."""
+    with db._connection() as connection:
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT time, id, name, dimension, timestamp FROM scores "
+            "WHERE dimension = ? AND (time, id) > (?, ?) ORDER BY time, id LIMIT ?",
+            (5, 1.0, 1, 10),
+        ).fetchall()
+    details = " ".join(row[-1] for row in plan)
+    assert "scores_dimension_time" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_migration_from_json_runs_once(tmp_path):
+    """The JSON snapshot and its log are imported on first open only."""
+    snapshot = str(tmp_path / "leaderboard.json")
+    with open(snapshot, "w") as f:
+        json.dump([score("old", 3.0), {"name": "broken"}], f)
+    log = LeaderboardLog(snapshot)
+    log.add(score("logged", 1.0))
+    log.close()
+
+    db_path = str(tmp_path / "leaderboard.sqlite3")
+    first = SqliteLeaderboard(db_path, migrate_from=snapshot)
+    assert [s["name"] for s in first.scores()] == ["logged", "old"]
+    first.close()
+
+    second = SqliteLeaderboard(db_path, migrate_from=snapshot)
+    assert len(second.scores()) == 2
+    second.close()
+
+
+def test_concurrent_adds_share_pooled_connections(db):
+    """Scores added from several threads are all stored."""
+    def worker(offset):
+        for i in range(20):
+            db.add(score(f"t{offset}", offset * 100 + i))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert db.stats()["entries"] == 80
+    assert 1 <= len(db._idle) <= db.pool_size
+
+
+def test_short_lived_threads_do_not_leak_connections(db):
+    """A thread per request (the development server) reuses pooled connections."""
+    def request():
+        db.page(5, 10)
+        db.rank(1.0)
+
+    for _ in range(50):
+        thread = threading.Thread(target=request)
+        thread.start()
+        thread.join()
+
+    assert len(db._idle) == 1
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def backend(request, tmp_path):
+    """Provides an empty leaderboard of each backend."""
+    if request.param == "json":
+        store = LeaderboardLog(str(tmp_path / "leaderboard.json"))
+    else:
+        store = SqliteLeaderboard(str(tmp_path / "leaderboard.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_keyset_pagination_walks_every_score_once(backend):
+    """Following the returned keys visits all scores in order, ties included."""
+    times = [5.0, 1.0, 3.0, 3.0, 3.0, 2.0, 8.0]
+    for i, t in enumerate(times):
+        backend.add(score(f"p{i}", t, dimension=5 if i % 2 else 10))
+
+    for dimension, expected in [(None, sorted(times)), (10, [3.0, 3.0, 5.0, 8.0])]:
+        seen, after = [], None
+        while True:
+            entries, after = backend.page(dimension, 2, after)
+            seen.extend(entries)
+            if after is None:
+                break
+        assert [s["time"] for s in seen] == expected
+        assert len({s["name"] for s in seen}) == len(expected)
+
+
+def test_page_rejects_non_positive_limit(backend):
+    with pytest.raises(ValueError):
+        backend.page(None, 0)
+
+
+def test_add_returns_ranks_and_rank_previews(backend):
+    """add() reports overall and per-dimension ranks; rank() previews them without saving."""
+    assert backend.add(score("a", 5.0, dimension=5)) == (1, 1)
+    assert backend.add(score("b", 3.0, dimension=10)) == (1, 1)
+    assert backend.add(score("c", 4.0, dimension=5)) == (2, 1)
+    assert backend.add(score("d", 4.0, dimension=5)) == (3, 2)  # Ties rank after earlier scores
+
+    assert backend.rank(4.0) == 4
+    assert backend.rank(4.0, 5) == 3
+    assert backend.rank(0.5, 5) == 1
+    assert backend.rank(9.0, 100) == 1
+    assert backend.stats()["entries"] == 4
+
+
+def test_iter_scores_pages_through_everything(backend):
+    """iter_scores walks all scores in small batches, with dimension and 'since' filters."""
+    for i in range(25):
+        entry = score(f"p{i}", float(i % 7), dimension=5 if i % 2 else 10)
+        entry["timestamp"] = f"2025-01-{i + 1:02d}T00:00:00Z"
+        backend.add(entry)
+
+    everything = list(iter_scores(backend, batch_size=4))
+    assert len(everything) == 25
+    assert [s["time"] for s in everything] == sorted(s["time"] for s in everything)
+    assert len(list(iter_scores(backend, dimension=5, batch_size=3))) == 12
+    recent = list(iter_scores(backend, since="2025-01-20T00:00:00Z", batch_size=4))
+    assert sorted(s["name"] for s in recent) == sorted(f"p{i}" for i in range(19, 25))
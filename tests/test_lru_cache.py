@@ -0,0 +1,68 @@
+# tests/test_lru_cache.py
+
+import pytest
+
+from src.lru_cache import LRUCache
+
+
+# ==============================================================================
+# LRUCache Unit Tests
+# ==============================================================================
+
+
+def test_lru_cache_hit_miss_counters():
+    """Verify get/put semantics and the hit and miss counters."""
+    cache = LRUCache(max_entries=4, max_bytes=100)
+    assert cache.get("a") is None
+    assert cache.put("a", b"value", 5) is True
+    assert cache.get("a") == b"value"
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["bytes"] == 5
+
+
+def test_lru_cache_peek_skips_counters():
+    """peek() reads without counting; with refresh it still protects the entry."""
+    cache = LRUCache(max_entries=2, max_bytes=100)
+    cache.put("a", 1, 1)
+    cache.put("b", 2, 1)
+    assert cache.peek("a", refresh=True) == 1  # 'b' becomes least recently used
+    assert cache.peek("missing") is None
+    cache.put("c", 3, 1)
+
+    assert cache.peek("b") is None
+    assert cache.stats()["hits"] == 0 and cache.stats()["misses"] == 0
+
+
+def test_lru_cache_evicts_least_recently_used_by_count():
+    """The least recently *used* entry (not the oldest inserted) is evicted first."""
+    cache = LRUCache(max_entries=2, max_bytes=100)
+    cache.put("a", 1, 1)
+    cache.put("b", 2, 1)
+    cache.get("a")  # 'b' becomes least recently used
+    cache.put("c", 3, 1)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_cache_evicts_by_bytes_and_rejects_oversized():
+    """Byte limits evict old entries, and a single oversized value is never stored."""
+    cache = LRUCache(max_entries=10, max_bytes=10)
+    cache.put("a", "x", 6)
+    cache.put("b", "y", 6)  # Pushes total to 12 > 10, evicting 'a'
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 6
+
+    assert cache.put("huge", "z", 11) is False
+    assert cache.get("huge") is None
+
+
+def test_lru_cache_rejects_negative_limits():
+    """Negative limits are a configuration error."""
+    with pytest.raises(ValueError):
+        LRUCache(max_entries=-1, max_bytes=10)
@@ -0,0 +1,83 @@
+# tests/test_maze_format.py
+
+import numpy as np
+import pytest
+
+from src import fast_json
+from src.maze_format import from_envelope, grid_from_rows, pack_grid, to_envelope, unpack_grid
+from src.maze_generator import Maze
+
+
+# ==============================================================================
+# Packed Grid Round-Trip Tests
+# ==============================================================================
+
+
+@pytest.mark.parametrize("dimension", [1, 3, 10, 100])
+def test_pack_unpack_round_trip(dimension):
+    """Packing then unpacking a generated maze returns the identical grid."""
+    maze = Maze(dimension)
+    maze.generate()
+    rows, cols = maze.grid.shape
+
+    data = pack_grid(maze.grid)
+    assert len(data) == (rows * cols + 7) // 8
+    assert np.array_equal(unpack_grid(data, rows, cols), maze.grid)
+
+
+def test_envelope_round_trip_from_list():
+    """The JSON envelope accepts list input and decodes back to the same grid."""
+    grid = [[1, 1, 1], [1, 0, 1], [1, 1, 1]]
+    envelope = to_envelope(np.asarray(grid))
+    assert envelope["rows"] == 3 and envelope["cols"] == 3
+    assert from_envelope(envelope).tolist() == grid
+
+
+@pytest.mark.parametrize(
+    "envelope",
+    [
+        {"rows": 3, "cols": 3},  # Missing data
+        {"rows": 3, "cols": 3, "data": "not base64!"},
+        {"rows": 30, "cols": 30, "data": "AAA="},  # Length mismatch
+        {"rows": 0, "cols": 3, "data": ""},
+    ],
+)
+def test_invalid_envelope_raises(envelope):
+    """Malformed envelopes raise ValueError rather than producing a bogus grid."""
+    with pytest.raises(ValueError):
+        from_envelope(envelope)
+
+
+def test_grid_from_rows_returns_contiguous_uint8():
+    """Valid 0/1 rows (ints or booleans) become a C-contiguous uint8 grid."""
+    grid = grid_from_rows([[1, 0, 1], [0, 0, 1]])
+    assert grid.dtype == np.uint8 and grid.flags.c_contiguous
+    assert grid.tolist() == [[1, 0, 1], [0, 0, 1]]
+    assert grid_from_rows([[True, False]]).tolist() == [[1, 0]]
+
+
+@pytest.mark.parametrize(
+    "rows",
+    [
+        [],  # Empty
+        [[]],  # Empty row
+        [[0, 1], [0]],  # Ragged
+        [[0, 2]],  # Outside the 0/1 domain
+        [[0, -1]],
+        [[0.5, 1]],  # Non-integer
+        [["0", "1"]],
+        [[None, 0]],
+        [[[0]]],  # 3D
+        "0101",
+    ],
+)
+def test_grid_from_rows_rejects_malformed_grids(rows):
+    with pytest.raises(ValueError):
+        grid_from_rows(rows)
+
+
+def test_fast_json_loads_bytes_and_rejects_malformed():
+    """The fast decoder parses bytes and raises ValueError on malformed input."""
+    assert fast_json.loads(b'{"maze": [[0, 1]]}') == {"maze": [[0, 1]]}
+    with pytest.raises(ValueError):
+        fast_json.loads(b"{malformed")
@@ -1,7 +1,14 @@
 # tests/test_maze_generator.py
+import numpy as np
 import pytest
 
-from src.maze_generator import DisjointSet, Maze
+from src.maze_generator import (
+    GENERATION_ALGORITHMS,
+    DisjointSet,
+    Maze,
+    generate_eller_rows,
+    register_algorithm,
+)
 
 
 # ==============================================================================
@@ -26,6 +33,17 @@ def test_disjoint_set_union_and_find():
     assert ds.union(0, 1) is False
 
 
+def test_disjoint_set_long_chain_is_iterative():
+    """Verify find works on chains far deeper than the recursion limit."""
+    count = 50_000
+    ds = DisjointSet(count)
+    # Build a worst-case chain by hand: i -> i + 1
+    ds.parent[:-1] = range(1, count)
+
+    assert ds.find(0) == count - 1
+    assert ds.find_many([0, 1, count // 2]).tolist() == [count - 1] * 3
+
+
 # ==============================================================================
 # Maze Class Tests
 # ==============================================================================
@@ -55,6 +73,94 @@ def test_maze_generation_properties(dimension):
     assert passage_count > dimension * dimension
 
 
+def assert_perfect_maze(grid):
+    """Asserts 'grid' is a perfect maze: all cells open, connected, and without loops."""
+    grid = np.asarray(grid)
+    height, width = (grid.shape[0] - 1) // 2, (grid.shape[1] - 1) // 2
+    num_cells = width * height
+    assert (grid[1::2, 1::2] == 0).all()
+
+    # A spanning tree over the cells removes exactly num_cells - 1 walls
+    assert int((grid == 0).sum()) == 2 * num_cells - 1
+
+    # Union every open passage between neighbouring cells; none may close a loop
+    ds = DisjointSet(num_cells)
+    for y in range(height):
+        for x in range(width):
+            if x + 1 < width and grid[2 * y + 1, 2 * x + 2] == 0:
+                assert ds.union(y * width + x, y * width + x + 1)
+            if y + 1 < height and grid[2 * y + 2, 2 * x + 1] == 0:
+                assert ds.union(y * width + x, (y + 1) * width + x)
+
+
+@pytest.mark.parametrize("dimension", [1, 2, 5, 100, 300])
+def test_maze_generation_is_perfect(dimension):
+    """Check that generated mazes are spanning trees over the cells."""
+    maze = Maze(dimension)
+    maze.generate()
+    assert_perfect_maze(maze.grid)
+
+
+@pytest.mark.parametrize("algorithm", sorted(GENERATION_ALGORITHMS))
+@pytest.mark.parametrize("dimension", [1, 2, 9, 40])
+def test_every_algorithm_generates_perfect_maze(algorithm, dimension):
+    """Every registered algorithm produces a perfect maze, deterministically per seed."""
+    maze = Maze(dimension, seed=11)
+    maze.generate(algorithm)
+    assert_perfect_maze(maze.grid)
+
+    again = Maze(dimension, seed=11)
+    again.generate(algorithm)
+    assert (maze.grid == again.grid).all()
+
+
+def test_unknown_algorithm_and_duplicate_registration_rejected():
+    """Unknown algorithm names and duplicate registrations raise ValueError."""
+    with pytest.raises(ValueError):
+        Maze(5).generate("does_not_exist")
+    with pytest.raises(ValueError):
+        register_algorithm("kruskal")(lambda dimension, rng: None)
+
+
+def test_maze_generation_is_deterministic_with_seed():
+    """The same dimension and seed always produce the same maze."""
+    first = Maze(20, seed=1234)
+    second = Maze(20, seed=1234)
+    other = Maze(20, seed=4321)
+    for maze in (first, second, other):
+        maze.generate()
+
+    assert (first.grid == second.grid).all()
+    assert not (first.grid == other.grid).all()
+
+
+def test_maze_negative_seed_rejected():
+    """Negative seeds are rejected up front."""
+    with pytest.raises(ValueError):
+        Maze(5, seed=-1)
+
+
+# ==============================================================================
+# Streaming (Eller's) Generator Tests
+# ==============================================================================
+
+
+@pytest.mark.parametrize("dimension, rows", [(1, 1), (1, 6), (6, 1), (5, 5), (20, 50)])
+def test_eller_rows_form_perfect_maze(dimension, rows):
+    """Streamed rows assemble into a perfect maze of the requested shape."""
+    grid = np.array(list(generate_eller_rows(dimension, rows=rows, seed=7)))
+    assert grid.shape == (2 * rows + 1, 2 * dimension + 1)
+    assert_perfect_maze(grid)
+
+
+def test_eller_rows_are_lazy_and_seeded():
+    """Rows are produced lazily, and a seed makes the stream reproducible."""
+    stream = generate_eller_rows(1000, rows=1_000_000, seed=3)
+    first_rows = [next(stream) for _ in range(4)]  # Never builds the 1M-row maze
+    again = generate_eller_rows(1000, rows=1_000_000, seed=3)
+    assert all((row == next(again)).all() for row in first_rows)
+
+
 # Parametrized test cases: (maze_dimension, grid_y_coord, grid_x_coord) for cell center
 # Cell (r, c) where 0 <= r,c < dimension corresponds to grid coords (2r+1, 2c+1)
 @pytest.mark.parametrize(
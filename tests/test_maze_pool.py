@@ -0,0 +1,76 @@
+# tests/test_maze_pool.py
+
+import threading
+import time
+
+import pytest
+
+from src.maze_pool import MazePool
+
+
+def wait_for(predicate, timeout=5.0):
+    """Polls 'predicate' until it is true or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+# ==============================================================================
+# MazePool Tests
+# ==============================================================================
+
+
+def test_pool_fills_to_depth_and_refills_after_take():
+    """The worker fills every key to the target depth and tops up after a take."""
+    counter = iter(range(1_000_000))
+    pool = MazePool(["a", "b"], lambda key: (key, next(counter)), depth=3)
+    pool.start()
+    try:
+        assert wait_for(lambda: pool.stats()["depths"] == {"a": 3, "b": 3})
+        item = pool.take("a")
+        assert item[0] == "a"
+        assert wait_for(lambda: pool.stats()["depths"]["a"] == 3)
+        assert pool.stats()["hits"] == 1
+    finally:
+        pool.stop(timeout=2)
+    assert not pool.stats()["running"]
+
+
+def test_pool_take_returns_none_when_empty():
+    """An empty key is a miss, never a blocking wait; an unknown key is not counted."""
+    pool = MazePool(["a"], lambda key: key, depth=2)
+    assert pool.take("a") is None
+    assert pool.take("unknown") is None
+    assert pool.stats()["misses"] == 1
+
+
+def test_pool_survives_factory_errors():
+    """A failing factory is counted and does not kill the worker."""
+    calls = {"n": 0}
+    lock = threading.Lock()
+
+    def flaky(key):
+        with lock:
+            calls["n"] += 1
+            if calls["n"] == 1:
+                raise RuntimeError("boom")
+        return key
+
+    pool = MazePool(["a"], flaky, depth=1, error_backoff=0.01)
+    pool.start()
+    try:
+        assert wait_for(lambda: pool.stats()["depths"]["a"] == 1)
+        assert pool.stats()["errors"] == 1
+    finally:
+        pool.stop(timeout=2)
+
+
+def test_pool_rejects_invalid_config():
+    """Negative depth or rate is a configuration error."""
+    with pytest.raises(ValueError):
+        MazePool(["a"], lambda key: key, depth=-1)
+    with pytest.raises(ValueError):
+        MazePool(["a"], lambda key: key, depth=1, refill_per_second=-1)
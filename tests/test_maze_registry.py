@@ -0,0 +1,124 @@
+# tests/test_maze_registry.py
+
+import numpy as np
+import pytest
+
+from src.maze_generator import Maze
+from src.maze_registry import MazeRegistry, content_id
+
+
+# ==============================================================================
+# MazeRegistry Unit Tests
+# ==============================================================================
+
+
+class FakeClock:
+    """A manually advanced clock for deterministic TTL tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_grid(seed):
+    maze = Maze(5, seed=seed)
+    maze.generate()
+    return maze.grid
+
+
+def test_content_id_depends_on_cells_and_shape():
+    """Equal grids share an id; different cells or shapes do not."""
+    grid = make_grid(1)
+    assert content_id(grid) == content_id(grid.copy())
+    assert content_id(grid) != content_id(make_grid(2))
+    flat = np.zeros((2, 8), dtype=np.uint8)
+    assert content_id(flat) != content_id(flat.reshape(4, 4))
+
+
+def test_registry_returns_grid_and_reuses_solver():
+    """A registered maze is retrievable by id and its solver is built only once."""
+    registry = MazeRegistry(max_entries=8, max_bytes=1 << 20, ttl_seconds=60)
+    grid = make_grid(3)
+    maze_id = registry.register(grid)
+
+    assert registry.register(grid.copy()) == maze_id
+    assert np.array_equal(registry.get(maze_id), grid)
+    solver = registry.solver(maze_id)
+    assert solver is registry.solver(maze_id)
+    assert solver.solve((1, 1), (9, 9))[-1] == (9, 9)
+    assert registry.get("missing") is None
+    assert registry.solver("missing") is None
+
+
+def test_registry_register_does_not_count_as_lookup():
+    """Only get/solver lookups feed the hit and miss counters, not registrations."""
+    registry = MazeRegistry(max_entries=8, max_bytes=1 << 20, ttl_seconds=60)
+    grid = make_grid(4)
+    for _ in range(5):
+        maze_id = registry.register(grid)
+    stats = registry.stats()
+    assert stats["hits"] == 0 and stats["misses"] == 0
+
+    registry.get(maze_id)
+    assert registry.stats()["hits"] == 1
+
+
+def test_registry_expires_entries_after_ttl():
+    """Entries vanish once their TTL passes; re-registering extends the lifetime."""
+    clock = FakeClock()
+    registry = MazeRegistry(max_entries=8, max_bytes=1 << 20, ttl_seconds=10, clock=clock)
+    grid = make_grid(4)
+    maze_id = registry.register(grid)
+
+    clock.now = 9
+    registry.register(grid)  # Refresh
+    clock.now = 15
+    assert registry.get(maze_id) is not None
+    clock.now = 19
+    assert registry.get(maze_id) is None
+    assert registry.stats()["entries"] == 0
+
+
+def test_registry_is_bounded():
+    """The least recently used maze is evicted when the entry limit is reached."""
+    registry = MazeRegistry(max_entries=2, max_bytes=1 << 20, ttl_seconds=60)
+    first, second, third = (registry.register(make_grid(seed)) for seed in (5, 6, 7))
+    assert registry.get(first) is None
+    assert registry.get(second) is not None and registry.get(third) is not None
+
+
+def test_registry_rejects_non_positive_ttl():
+    with pytest.raises(ValueError):
+        MazeRegistry(max_entries=1, max_bytes=1, ttl_seconds=0)
+
+
+def test_registry_tree_index_only_for_perfect_mazes():
+    """Perfect mazes get a cached tree index; grids with loops report None."""
+    registry = MazeRegistry(max_entries=8, max_bytes=1 << 20, ttl_seconds=60)
+    maze_id = registry.register(make_grid(8))
+    index = registry.tree_index(maze_id)
+    assert index is not None and registry.tree_index(maze_id) is index
+    assert registry.stats()["bytes"] > 2 * make_grid(8).nbytes
+
+    looped = registry.register(np.zeros((5, 5), dtype=np.uint8))
+    assert registry.tree_index(looped) is None
+    assert registry.solver(looped) is not None
+
+
+def test_registry_distance_field_is_cached():
+    """A maze's distance field is computed once per goal and kept with the entry."""
+    registry = MazeRegistry(max_entries=8, max_bytes=1 << 20, ttl_seconds=60)
+    maze_id = registry.register(make_grid(9))
+    field = registry.distance_field(maze_id, (9, 9))
+    assert field is registry.distance_field(maze_id, (9, 9))
+    assert field[9, 9] == 0 and field[1, 1] > 0
+    assert registry.distance_field("missing", (9, 9)) is None
+
+
+def test_content_id_distinguishes_dtypes():
+    """Ids hash the raw buffer, so the same values in another dtype hash differently."""
+    grid = make_grid(10)
+    assert content_id(grid) == content_id(np.asfortranarray(grid))
+    assert content_id(grid) != content_id(grid.astype(np.int64))
@@ -173,4 +173,263 @@ def test_large_maze_path():
             f"Step {i} {step} visited multiple times in path."
         )
         visited_in_path.add(step)
-        last_pos = step
\ No newline at end of file
+        last_pos = step
+
+def test_open_grid_does_not_wrap_across_rows():
+    """Tests that moves never wrap from one row's edge to the next row in the flat search."""
+    maze = [
+        [0, 0, 0],
+        [1, 1, 0],
+        [0, 0, 0],
+    ]
+    # (2,0) and (0,2) are far apart even though they are flat-index neighbours without padding
+    solver = MazeSolver(maze)
+    assert solver.solve((0, 0), (0, 2)) == [(1, 0), (2, 0), (2, 1), (2, 2), (1, 2), (0, 2)]
+    assert solver.solve((2, 2), (0, 0)) == [(2, 1), (2, 0), (1, 0), (0, 0)]
+
+
+def test_solver_is_reusable_across_queries():
+    """Tests that each solve starts from a clean search state."""
+    maze = [
+        [1, 1, 1, 1, 1],
+        [1, 0, 0, 0, 1],
+        [1, 1, 1, 0, 1],
+        [1, 0, 0, 0, 1],
+        [1, 1, 1, 1, 1],
+    ]
+    solver = MazeSolver(maze)
+    forward = solver.solve((1, 1), (1, 3))
+    backward = solver.solve((1, 3), (1, 1))
+    assert forward == [(2, 1), (3, 1), (3, 2), (3, 3), (2, 3), (1, 3)]
+    assert backward == [(2, 3), (3, 3), (3, 2), (3, 1), (2, 1), (1, 1)]
+    assert solver.solve((1, 1), (1, 3)) == forward
+
+
+def test_generated_maze_path_spans_grid():
+    """Tests the solver on a generated maze, checking the path is contiguous and minimal."""
+    from src.maze_generator import Maze
+
+    maze = Maze(40, seed=7)
+    maze.generate()
+    grid = maze.to_list()
+    goal = (len(grid) - 2, len(grid) - 2)
+
+    path = MazeSolver(grid).solve((1, 1), goal)
+    assert path is not None and path[-1] == goal
+    previous = (1, 1)
+    for step in path:
+        assert grid[step[1]][step[0]] == 0
+        assert abs(step[0] - previous[0]) + abs(step[1] - previous[1]) == 1
+        previous = step
+    # In a perfect maze the unique simple path is the shortest, so no cell repeats
+    assert len(set(path)) == len(path)
+
+
+# ==============================================================================
+# Search Strategy Tests
+# ==============================================================================
+
+
+def _open_room(size):
+    """A walled square room with no interior obstacles."""
+    maze = [[0] * size for _ in range(size)]
+    for i in range(size):
+        maze[0][i] = maze[-1][i] = maze[i][0] = maze[i][-1] = 1
+    return maze
+
+
+@pytest.mark.parametrize("strategy", ["astar", "bidirectional"])
+def test_strategies_match_bfs_path_length(strategy):
+    """Tests that A* and bidirectional BFS find paths as short as plain BFS, looped grids included."""
+    import random
+
+    rng = random.Random(5)
+    for _ in range(300):
+        rows, cols = rng.randint(1, 10), rng.randint(1, 10)
+        maze = [[int(rng.random() < 0.3) for _ in range(cols)] for _ in range(rows)]
+        start = (rng.randrange(cols), rng.randrange(rows))
+        goal = (rng.randrange(cols), rng.randrange(rows))
+
+        solver = MazeSolver(maze)
+        expected = solver.solve(start, goal)
+        actual = solver.solve(start, goal, strategy=strategy)
+        if expected is None:
+            assert actual is None
+            continue
+        assert len(actual) == len(expected)
+        previous = start
+        for step in actual:
+            assert maze[step[1]][step[0]] == 0
+            assert abs(step[0] - previous[0]) + abs(step[1] - previous[1]) == 1
+            previous = step
+
+
+def test_strategies_expand_fewer_nodes_on_open_grid():
+    """Tests the expansion counters: both alternatives beat BFS on a large open room."""
+    solver = MazeSolver(_open_room(61))
+    start, goal = (1, 1), (59, 59)
+
+    bfs = solver.search(start, goal, "bfs")
+    astar = solver.search(start, goal, "astar")
+    bidirectional = solver.search(start, goal, "bidirectional")
+
+    assert len(bfs.path) == len(astar.path) == len(bidirectional.path) == 116
+    assert astar.expanded < bfs.expanded / 10
+    assert bidirectional.expanded < bfs.expanded
+
+
+def test_constructor_strategy_is_default():
+    """Tests that the constructor strategy is used unless solve() overrides it."""
+    solver = MazeSolver(_open_room(21), strategy="astar")
+    assert solver.search((1, 1), (19, 19)).expanded == solver.search((1, 1), (19, 19), "astar").expanded
+    assert solver.search((1, 1), (19, 19)).expanded < solver.search((1, 1), (19, 19), "bfs").expanded
+
+
+def test_unknown_strategy_raises():
+    """Tests that unknown strategies are rejected by the constructor and by solve()."""
+    with pytest.raises(ValueError):
+        MazeSolver([[0]], strategy="dfs")
+    with pytest.raises(ValueError):
+        MazeSolver([[0]]).solve((0, 0), (0, 0), strategy="dfs")
+
+
+# ==============================================================================
+# BFS Backend Tests
+# ==============================================================================
+
+
+@pytest.mark.parametrize("wall_ratio", [0.0, 0.2, 0.35])
+def test_numpy_backend_matches_python_backend(wall_ratio):
+    """Tests that the vectorized BFS finds equally short, valid paths on looped grids."""
+    import numpy as np
+
+    rng = np.random.default_rng(int(wall_ratio * 100))
+    for _ in range(40):
+        rows, cols = rng.integers(1, 15, size=2)
+        grid = (rng.random((rows, cols)) < wall_ratio).astype(np.uint8)
+        start = (int(rng.integers(cols)), int(rng.integers(rows)))
+        goal = (int(rng.integers(cols)), int(rng.integers(rows)))
+
+        expected = MazeSolver(grid.tolist(), backend="python").search(start, goal)
+        actual = MazeSolver(grid, backend="numpy").search(start, goal)
+        if expected.path is None:
+            assert actual.path is None
+            continue
+        assert len(actual.path) == len(expected.path)
+        previous = start
+        for step in actual.path:
+            assert grid[step[1], step[0]] == 0
+            assert abs(step[0] - previous[0]) + abs(step[1] - previous[1]) == 1
+            previous = step
+
+
+def test_numpy_backend_auto_selected_for_large_grids():
+    """Tests that 'auto' switches backends at the size threshold and both solve a perfect maze."""
+    from src.maze_generator import Maze
+    from src.maze_solver import VECTORIZED_BFS_MIN_CELLS
+
+    assert MazeSolver(_open_room(21)).backend == "python"
+    side = int(VECTORIZED_BFS_MIN_CELLS ** 0.5) + 1
+    assert MazeSolver(_open_room(side)).backend == "numpy"
+
+    maze = Maze(30, seed=3)
+    maze.generate()
+    goal = (59, 59)
+    assert MazeSolver(maze.grid, backend="numpy").solve((1, 1), goal) == \
+        MazeSolver(maze.to_list(), backend="python").solve((1, 1), goal)
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError):
+        MazeSolver([[0]], backend="gpu")
+
+
+# ==============================================================================
+# Multi-Query Tests
+# ==============================================================================
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_solve_many_matches_individual_solves(backend):
+    """Tests that solve_many returns, in order, what separate solve() calls would."""
+    from src.maze_generator import Maze
+
+    maze = Maze(15, seed=11)
+    maze.generate()
+    solver = MazeSolver(maze.grid, backend=backend)
+    queries = [
+        ((1, 1), (29, 29)),
+        ((1, 1), (15, 15)),
+        ((29, 1), (1, 29)),
+        ((1, 1), (1, 1)),
+        ((0, 0), (1, 1)),  # Start on a wall
+        ((1, 1), (40, 40)),  # Goal out of bounds
+        ((1, 1), (29, 29)),  # Duplicate
+    ]
+    assert solver.solve_many(queries) == [solver.solve(start, goal) for start, goal in queries]
+
+
+def test_solve_many_shares_one_tree_per_source(monkeypatch):
+    """Tests that queries are grouped so each distinct start runs a single BFS."""
+    solver = MazeSolver(_open_room(9))
+    calls = []
+    original = solver._bfs_tree
+    monkeypatch.setattr(solver, "_bfs_tree", lambda source, targets: calls.append(targets) or original(source, targets))
+
+    paths = solver.solve_many([((1, 1), (7, 7)), ((7, 7), (1, 1)), ((1, 1), (1, 7)), ((1, 1), (7, 1))])
+    assert len(calls) == 2
+    assert [len(path) for path in paths] == [12, 12, 6, 6]
+
+
+def test_solve_many_unreachable_goal():
+    maze = [[0, 1, 0]]
+    assert MazeSolver(maze).solve_many([((0, 0), (2, 0)), ((0, 0), (0, 0))]) == [None, []]
+
+
+# ==============================================================================
+# Distance Field Tests
+# ==============================================================================
+
+
+def test_distance_field_values_and_hints():
+    """Tests distances to the goal and reading paths off the field."""
+    import numpy as np
+
+    from src.maze_solver import UNREACHABLE, follow_distance_field
+
+    maze = [
+        [0, 0, 0],
+        [1, 1, 0],
+        [0, 0, 0],
+        [1, 1, 1],
+        [0, 1, 1],  # (0, 4) is cut off
+    ]
+    solver = MazeSolver(maze)
+    field = solver.distance_field((0, 2))
+
+    assert field.dtype == np.uint32 and field.shape == (5, 3)
+    assert field[0].tolist() == [6, 5, 4]
+    assert field[1, 0] == UNREACHABLE and field[4, 0] == UNREACHABLE
+    assert follow_distance_field(field, (0, 0)) == solver.solve((0, 0), (0, 2))
+    assert follow_distance_field(field, (0, 0), max_steps=2) == [(1, 0), (2, 0)]
+    assert follow_distance_field(field, (0, 2)) == []
+    assert follow_distance_field(field, (0, 4)) is None
+    assert follow_distance_field(field, (9, 9)) is None
+
+
+def test_distance_field_matches_bfs_on_generated_maze():
+    """Tests that every cell's field value equals its BFS path length to the goal."""
+    from src.maze_generator import Maze
+
+    maze = Maze(8, seed=6)
+    maze.generate()
+    solver = MazeSolver(maze.grid)
+    goal = (15, 15)
+    field = solver.distance_field(goal)
+    for y, x in zip(*(maze.grid == 0).nonzero()):
+        assert field[y, x] == len(solver.solve((int(x), int(y)), goal))
+
+
+def test_distance_field_rejects_wall_goal():
+    with pytest.raises(ValueError):
+        MazeSolver([[1, 0]]).distance_field((0, 0))
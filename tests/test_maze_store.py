@@ -0,0 +1,122 @@
+# tests/test_maze_store.py
+
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from src.maze_generator import Maze, generate_eller_rows
+from src.maze_store import MazeStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Provides a maze store rooted in a temporary directory."""
+    return MazeStore(str(tmp_path / "mazes"))
+
+
+# ==============================================================================
+# MazeStore Tests
+# ==============================================================================
+
+
+def test_save_and_open_round_trip(store):
+    """A saved grid is read back identically through the memory map."""
+    maze = Maze(20, seed=5)
+    maze.generate()
+    maze_id = store.save(maze.grid, dimension=20)
+
+    assert store.metadata(maze_id)["rows"] == 41
+    assert np.array_equal(store.open(maze_id), maze.grid)
+
+
+def test_generate_streams_eller_rows_to_disk(store):
+    """Generated mazes match the streaming generator for the same seed."""
+    maze_id = store.generate(30, rows=10, seed=2)
+    expected = np.array(list(generate_eller_rows(30, rows=10, seed=2)))
+    assert np.array_equal(store.open(maze_id), expected)
+
+
+def test_tile_is_zero_copy_window_clipped_at_edges(store):
+    """Tiles are views into the map and shrink at the maze boundary."""
+    maze_id = store.generate(10, seed=1)  # 21x21 grid
+    full = store.open(maze_id)
+
+    tile = store.tile(maze_id, 4, 6, 5, 3)
+    assert tile.shape == (3, 5)
+    assert np.shares_memory(tile, full)
+    assert np.array_equal(tile, full[6:9, 4:9])
+
+    edge = store.tile(maze_id, 18, 18, 8, 8)
+    assert edge.shape == (3, 3)
+
+
+def test_unknown_and_malformed_ids(store):
+    """Unknown ids and path-like ids raise KeyError; deleting removes the maze."""
+    with pytest.raises(KeyError):
+        store.metadata("0" * 32)
+    with pytest.raises(KeyError):
+        store.open("../../etc/passwd")
+
+    maze_id = store.generate(3)
+    store.open(maze_id)
+    store.delete(maze_id)
+    with pytest.raises(KeyError):
+        store.open(maze_id)
+
+
+def test_distance_field_is_persisted_and_deleted(store):
+    """The distance field is computed once, stored next to the grid, and removed with it."""
+    maze_id = store.generate(12, seed=3)
+    field = store.distance_field(maze_id, (23, 23))
+    assert field.dtype == np.uint32 and field.shape == (25, 25)
+    assert field[1, 1] > 0 and field[23, 23] == 0
+
+    reopened = MazeStore(store.directory).distance_field(maze_id, (23, 23))
+    assert np.array_equal(reopened, field)
+
+    store.delete(maze_id)
+    assert len(store._maps) == 0  # Neither the grid nor the field stays mapped
+    assert not any(name.startswith(maze_id) for name in os.listdir(store.directory))
+    with pytest.raises(KeyError):
+        store.distance_field(maze_id, (23, 23))
+
+
+def test_concurrent_distance_fields_use_separate_temp_files(store):
+    """Several stores computing the same field at once all get a complete field."""
+    maze_id = store.generate(150, seed=4)
+    barrier = threading.Barrier(6)
+    fields = []
+
+    def hint():
+        other = MazeStore(store.directory)
+        barrier.wait()
+        fields.append(np.array(other.distance_field(maze_id, (299, 299))))
+
+    threads = [threading.Thread(target=hint) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(fields) == 6
+    assert all(np.array_equal(field, fields[0]) for field in fields)
+    assert not [name for name in os.listdir(store.directory) if name.endswith(".tmp")]
+
+
+def test_byte_cap_evicts_oldest_mazes(tmp_path):
+    """Writes beyond the byte cap delete the oldest mazes and their fields first."""
+    store = MazeStore(str(tmp_path / "mazes"), max_bytes=3000)  # ~2 mazes of 30x15 cells
+    first = store.generate(15, seed=1)
+    store.distance_field(first, (29, 29))  # 4 bytes per cell: the cap is exceeded
+    second = store.generate(15, seed=2)
+    third = store.generate(15, seed=3)
+
+    with pytest.raises(KeyError):
+        store.open(first)
+    assert store.metadata(third)["dimension"] == 15
+    assert not any(name.startswith(first) for name in os.listdir(store.directory))
+    names = os.listdir(store.directory)
+    assert sum(os.path.getsize(os.path.join(store.directory, name)) for name in names) <= 3000
+    assert second in {name[:32] for name in names}
@@ -0,0 +1,66 @@
+# tests/test_maze_tree_index.py
+
+import random
+
+import numpy as np
+import pytest
+
+from src.maze_generator import GENERATION_ALGORITHMS, Maze
+from src.maze_solver import MazeSolver
+from src.maze_tree_index import MazeTreeIndex
+
+
+# ==============================================================================
+# MazeTreeIndex Tests
+# ==============================================================================
+
+
+@pytest.mark.parametrize("algorithm", sorted(GENERATION_ALGORITHMS))
+def test_tree_index_matches_bfs(algorithm):
+    """Paths and distances from the index equal BFS results for every generator."""
+    maze = Maze(12, seed=4)
+    maze.generate(algorithm)
+    grid = maze.grid
+    index = MazeTreeIndex(grid)
+    solver = MazeSolver(grid)
+    size = grid.shape[0]
+
+    rng = random.Random(algorithm)
+    for _ in range(100):
+        start = (rng.randrange(size), rng.randrange(size))
+        goal = (rng.randrange(size), rng.randrange(size))
+        expected = solver.solve(start, goal)
+        if grid[start[1], start[0]] or grid[goal[1], goal[0]]:
+            assert index.path(start, goal) is None
+            assert index.distance(start, goal) is None
+            continue
+        assert index.path(start, goal) == expected
+        assert index.distance(start, goal) == len(expected)
+
+
+def test_tree_index_root_and_edge_cases():
+    """Custom roots give the same answers; out-of-bounds cells and self-paths are handled."""
+    maze = Maze(6, seed=2)
+    maze.generate()
+    default = MazeTreeIndex(maze.grid)
+    rooted = MazeTreeIndex(maze.grid.tolist(), root=(11, 11))
+
+    assert default.root == (1, 1) and rooted.root == (11, 11)
+    assert default.path((1, 1), (11, 11)) == rooted.path((1, 1), (11, 11))
+    assert rooted.path((3, 3), (3, 3)) == []
+    assert rooted.distance((1, 1), (99, 1)) is None
+    with pytest.raises(ValueError):
+        MazeTreeIndex(maze.grid, root=(0, 0))  # Border wall
+
+
+@pytest.mark.parametrize(
+    "grid",
+    [
+        np.zeros((3, 3), dtype=np.uint8),  # Open room: contains cycles
+        np.array([[0, 1, 0]], dtype=np.uint8),  # Two disconnected passages
+        np.ones((3, 3), dtype=np.uint8),  # No passages
+    ],
+)
+def test_tree_index_rejects_non_perfect_mazes(grid):
+    with pytest.raises(ValueError):
+        MazeTreeIndex(grid)